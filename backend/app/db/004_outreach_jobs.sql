@@ -0,0 +1,29 @@
+-- 004_outreach_jobs.sql
+-- Bulk outreach jobs and their per-creator delivery status
+
+CREATE TABLE outreach_job (
+  id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
+  campaign_id uuid REFERENCES campaign(id) ON DELETE CASCADE,
+  brief text,
+  status text NOT NULL DEFAULT 'Running',
+  total integer NOT NULL DEFAULT 0,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE outreach_message (
+  id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
+  job_id uuid REFERENCES outreach_job(id) ON DELETE CASCADE,
+  campaign_id uuid REFERENCES campaign(id) ON DELETE CASCADE,
+  influencer_id uuid REFERENCES influencer(id) ON DELETE CASCADE,
+  status text NOT NULL DEFAULT 'Pending',   -- Pending | Queued | Failed
+  subject text,
+  body text,
+  error text,
+  attempts integer NOT NULL DEFAULT 0,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now(),
+  UNIQUE (job_id, influencer_id)
+);
+
+CREATE INDEX outreach_message_job_status_idx ON outreach_message (job_id, status);
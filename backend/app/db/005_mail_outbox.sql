@@ -0,0 +1,54 @@
+-- 005_mail_outbox.sql
+-- Outbound mail outbox drained by the delivery worker (app/services/mail_delivery_service.py)
+
+CREATE TABLE outbox (
+  id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
+  job_id uuid REFERENCES outreach_job(id) ON DELETE SET NULL,
+  influencer_id uuid REFERENCES influencer(id) ON DELETE SET NULL,
+  to_email text NOT NULL,
+  subject text NOT NULL,
+  body text NOT NULL,
+  status text NOT NULL DEFAULT 'Queued',   -- Queued | Sending | Sent | Failed
+  attempts integer NOT NULL DEFAULT 0,
+  next_attempt_at timestamptz NOT NULL DEFAULT now(),
+  locked_until timestamptz,
+  last_error text,
+  sent_at timestamptz,
+  created_at timestamptz DEFAULT now()
+);
+
+CREATE INDEX outbox_due_idx ON outbox (next_attempt_at) WHERE status IN ('Queued', 'Sending');
+
+-- Atomically lease a batch of due messages to one worker.
+-- Rows stuck in 'Sending' past their lease (crashed worker) become claimable
+-- again until they have used max_attempts; then they are marked 'Failed', so
+-- a message that crashes the worker is not re-sent forever.
+DROP FUNCTION IF EXISTS claim_outbox_batch(integer, integer);
+CREATE OR REPLACE FUNCTION claim_outbox_batch(
+  batch_size integer,
+  lease_seconds integer DEFAULT 300,
+  max_attempts integer DEFAULT 5
+)
+RETURNS SETOF outbox
+LANGUAGE sql
+AS $$
+  UPDATE outbox
+  SET status = 'Failed',
+      locked_until = NULL,
+      last_error = 'Delivery did not finish within its lease after ' || attempts || ' attempts'
+  WHERE status = 'Sending' AND locked_until < now() AND attempts >= max_attempts;
+
+  UPDATE outbox
+  SET status = 'Sending',
+      attempts = attempts + 1,
+      locked_until = now() + make_interval(secs => lease_seconds)
+  WHERE id IN (
+    SELECT id FROM outbox
+    WHERE (status = 'Queued' AND next_attempt_at <= now())
+       OR (status = 'Sending' AND locked_until < now() AND attempts < max_attempts)
+    ORDER BY next_attempt_at
+    LIMIT batch_size
+    FOR UPDATE SKIP LOCKED
+  )
+  RETURNING *;
+$$;
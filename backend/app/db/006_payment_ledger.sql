@@ -0,0 +1,156 @@
+-- 006_payment_ledger.sql
+-- Materialized per-(campaign, influencer) payment balances and atomic order
+-- creation (app/services/payment_service.py). app/utils/sqlite_ledger.py
+-- mirrors this file for offline tests; keep the two in sync.
+
+CREATE TABLE IF NOT EXISTS payments (
+  id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
+  campaign_id uuid REFERENCES campaign(id) ON DELETE CASCADE,
+  influencer_id uuid REFERENCES influencer(id) ON DELETE CASCADE,
+  amount numeric NOT NULL,
+  status text NOT NULL DEFAULT 'Pending',   -- Pending | Paid | Failed | Expired
+  razorpay_order_id text UNIQUE,
+  razorpay_payment_id text,
+  razorpay_signature text,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS payments_link_idx ON payments (campaign_id, influencer_id);
+
+CREATE TABLE payment_ledger (
+  campaign_id uuid REFERENCES campaign(id) ON DELETE CASCADE,
+  influencer_id uuid REFERENCES influencer(id) ON DELETE CASCADE,
+  paid_total numeric NOT NULL DEFAULT 0,
+  pending_total numeric NOT NULL DEFAULT 0,
+  updated_at timestamptz DEFAULT now(),
+  PRIMARY KEY (campaign_id, influencer_id)
+);
+
+-- Backfill from existing payments
+INSERT INTO payment_ledger (campaign_id, influencer_id, paid_total, pending_total)
+SELECT campaign_id,
+       influencer_id,
+       COALESCE(SUM(amount) FILTER (WHERE status = 'Paid'), 0),
+       COALESCE(SUM(amount) FILTER (WHERE status = 'Pending'), 0)
+FROM payments
+GROUP BY campaign_id, influencer_id;
+
+-- Keep the ledger in step with every write to payments, whoever makes it.
+CREATE OR REPLACE FUNCTION payments_ledger_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE payment_ledger
+    SET paid_total = paid_total - CASE WHEN OLD.status = 'Paid' THEN OLD.amount ELSE 0 END,
+        pending_total = pending_total - CASE WHEN OLD.status = 'Pending' THEN OLD.amount ELSE 0 END,
+        updated_at = now()
+    WHERE campaign_id = OLD.campaign_id AND influencer_id = OLD.influencer_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO payment_ledger (campaign_id, influencer_id, paid_total, pending_total)
+    VALUES (
+      NEW.campaign_id,
+      NEW.influencer_id,
+      CASE WHEN NEW.status = 'Paid' THEN NEW.amount ELSE 0 END,
+      CASE WHEN NEW.status = 'Pending' THEN NEW.amount ELSE 0 END
+    )
+    ON CONFLICT (campaign_id, influencer_id) DO UPDATE
+    SET paid_total = payment_ledger.paid_total + EXCLUDED.paid_total,
+        pending_total = payment_ledger.pending_total + EXCLUDED.pending_total,
+        updated_at = now();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER payments_ledger_sync
+AFTER INSERT OR DELETE OR UPDATE OF status, amount, campaign_id, influencer_id ON payments
+FOR EACH ROW EXECUTE FUNCTION payments_ledger_sync();
+
+-- Pending payments reserve balance, so an abandoned checkout would block that
+-- balance for good. Pending rows older than p_ttl_hours become 'Expired'
+-- (optionally only for one campaign / influencer); the ledger trigger releases
+-- their pending amount. A late capture of an expired order is still recorded
+-- (payment_service.mark_payment_success). Returns the number of rows expired.
+CREATE OR REPLACE FUNCTION expire_pending_payments(
+  p_ttl_hours double precision DEFAULT 24,
+  p_campaign_id uuid DEFAULT NULL,
+  p_influencer_id uuid DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_count integer;
+BEGIN
+  UPDATE payments
+  SET status = 'Expired', updated_at = now()
+  WHERE status = 'Pending'
+    AND created_at < now() - p_ttl_hours * interval '1 hour'
+    AND (p_campaign_id IS NULL OR campaign_id = p_campaign_id)
+    AND (p_influencer_id IS NULL OR influencer_id = p_influencer_id);
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$;
+
+-- Create a Pending payment in one round trip. The ledger row is locked, so
+-- concurrent orders for the same link are serialized and pending amounts count
+-- against the remaining balance: the agreed total can never be exceeded.
+-- Stale Pending orders of the link are expired first (see above).
+DROP FUNCTION IF EXISTS create_payment_order(uuid, uuid, numeric, text);
+CREATE OR REPLACE FUNCTION create_payment_order(
+  p_campaign_id uuid,
+  p_influencer_id uuid,
+  p_amount numeric,
+  p_order_id text,
+  p_pending_ttl_hours double precision DEFAULT 24
+)
+RETURNS payments
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_agreed numeric;
+  v_ledger payment_ledger;
+  v_remaining numeric;
+  v_payment payments;
+BEGIN
+  SELECT rate_per_post INTO v_agreed
+  FROM campaign_influencer
+  WHERE campaign_id = p_campaign_id AND influencer_id = p_influencer_id;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'campaign_influencer link not found';
+  END IF;
+  IF v_agreed IS NULL OR v_agreed <= 0 THEN
+    RAISE EXCEPTION 'Invalid agreed total for payment';
+  END IF;
+
+  INSERT INTO payment_ledger (campaign_id, influencer_id)
+  VALUES (p_campaign_id, p_influencer_id)
+  ON CONFLICT DO NOTHING;
+
+  PERFORM 1
+  FROM payment_ledger
+  WHERE campaign_id = p_campaign_id AND influencer_id = p_influencer_id
+  FOR UPDATE;
+
+  PERFORM expire_pending_payments(p_pending_ttl_hours, p_campaign_id, p_influencer_id);
+
+  SELECT * INTO v_ledger
+  FROM payment_ledger
+  WHERE campaign_id = p_campaign_id AND influencer_id = p_influencer_id;
+
+  v_remaining := v_agreed - v_ledger.paid_total - v_ledger.pending_total;
+  IF p_amount <= 0 OR p_amount > v_remaining THEN
+    RAISE EXCEPTION 'Invalid payment amount. Remaining: %', v_remaining;
+  END IF;
+
+  INSERT INTO payments (campaign_id, influencer_id, amount, status, razorpay_order_id)
+  VALUES (p_campaign_id, p_influencer_id, p_amount, 'Pending', p_order_id)
+  RETURNING * INTO v_payment;
+  RETURN v_payment;
+END;
+$$;
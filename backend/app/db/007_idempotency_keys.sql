@@ -0,0 +1,19 @@
+-- 007_idempotency_keys.sql
+-- Stored responses for requests sent with an Idempotency-Key header
+-- (app/services/idempotency_service.py). A row with a NULL status_code is a
+-- request still in flight; its expires_at is a short lease
+-- (IDEMPOTENCY_LOCK_SECONDS) after which a retry may take the key over.
+-- Completed rows expire after IDEMPOTENCY_TTL_SECONDS.
+
+CREATE TABLE idempotency_keys (
+  scope text NOT NULL,               -- endpoint, e.g. 'payment.create_order'
+  key text NOT NULL,
+  request_hash text NOT NULL,        -- sha256 of the request body
+  status_code integer,
+  response jsonb,
+  created_at timestamptz DEFAULT now(),
+  expires_at timestamptz NOT NULL,
+  PRIMARY KEY (scope, key)
+);
+
+CREATE INDEX idempotency_keys_expires_idx ON idempotency_keys (expires_at);
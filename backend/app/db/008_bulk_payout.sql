@@ -0,0 +1,122 @@
+-- 008_bulk_payout.sql
+-- Settle many influencers of one campaign in a single call
+-- (app/services/payment_service.py: create_bulk_payout).
+
+-- p_lines: [{"influencer_id": "...", "amount": 123.45}, ...]
+-- A line whose influencer_id is not a uuid gets its own error instead of
+-- failing the whole batch with invalid_text_representation.
+-- Locks the ledger rows of every influencer in the batch, validates all lines
+-- against rate_per_post - paid_total - pending_total in one query, inserts the
+-- valid ones as 'Paid' payments with one INSERT (the payments_ledger_sync
+-- trigger updates the ledger) and returns one result row per input line.
+-- Links that are now fully paid get campaign_influencer.payment_status = true.
+-- Pending orders older than p_pending_ttl_hours are expired first
+-- (expire_pending_payments() in 006_payment_ledger.sql).
+DROP FUNCTION IF EXISTS create_payout_batch(uuid, jsonb);
+CREATE OR REPLACE FUNCTION create_payout_batch(
+  p_campaign_id uuid,
+  p_lines jsonb,
+  p_pending_ttl_hours double precision DEFAULT 24
+)
+RETURNS TABLE (
+  line integer,
+  influencer_id uuid,
+  amount numeric,
+  ok boolean,
+  error text,
+  payment_id uuid,
+  razorpay_order_id text
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_ids uuid[];
+BEGIN
+  -- Only well-formed ids are cast; the others are reported per line below
+  v_ids := ARRAY(
+    SELECT DISTINCT (l->>'influencer_id')::uuid
+    FROM jsonb_array_elements(p_lines) AS l
+    WHERE l->>'influencer_id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+  );
+
+  INSERT INTO payment_ledger (campaign_id, influencer_id)
+  SELECT ci.campaign_id, ci.influencer_id
+  FROM campaign_influencer ci
+  WHERE ci.campaign_id = p_campaign_id
+    AND ci.influencer_id = ANY (v_ids)
+  ON CONFLICT DO NOTHING;
+
+  -- Fixed lock order so concurrent batches cannot deadlock
+  PERFORM 1
+  FROM payment_ledger pl
+  WHERE pl.campaign_id = p_campaign_id
+    AND pl.influencer_id = ANY (v_ids)
+  ORDER BY pl.influencer_id
+  FOR UPDATE;
+
+  UPDATE payments p
+  SET status = 'Expired', updated_at = now()
+  WHERE p.campaign_id = p_campaign_id
+    AND p.influencer_id = ANY (v_ids)
+    AND p.status = 'Pending'
+    AND p.created_at < now() - p_pending_ttl_hours * interval '1 hour';
+
+  RETURN QUERY
+  WITH parsed AS (
+    SELECT (t.ord - 1)::integer AS line,
+           CASE
+             WHEN t.l->>'influencer_id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+               THEN (t.l->>'influencer_id')::uuid
+           END AS influencer_id,
+           (t.l->>'amount')::numeric AS amount
+    FROM jsonb_array_elements(p_lines) WITH ORDINALITY AS t(l, ord)
+  ),
+  lines AS (
+    -- Duplicates by uuid, not by text: "ABC..." and "abc..." are one influencer
+    SELECT p.line, p.influencer_id, p.amount,
+           row_number() OVER (PARTITION BY p.influencer_id ORDER BY p.line) AS occurrence
+    FROM parsed p
+  ),
+  checked AS (
+    SELECT l.line, l.influencer_id, l.amount,
+           CASE
+             WHEN l.influencer_id IS NULL THEN 'Invalid influencer_id'
+             WHEN l.occurrence > 1 THEN 'Duplicate influencer in payout batch'
+             WHEN ci.influencer_id IS NULL THEN 'campaign_influencer link not found'
+             WHEN ci.rate_per_post IS NULL OR ci.rate_per_post <= 0 THEN 'Invalid agreed total for payment'
+             WHEN l.amount IS NULL OR l.amount <= 0
+               OR l.amount > ci.rate_per_post - pl.paid_total - pl.pending_total
+               THEN 'Invalid payment amount. Remaining: ' || (ci.rate_per_post - pl.paid_total - pl.pending_total)
+           END AS error
+    FROM lines l
+    LEFT JOIN campaign_influencer ci
+      ON ci.campaign_id = p_campaign_id AND ci.influencer_id = l.influencer_id
+    LEFT JOIN payment_ledger pl
+      ON pl.campaign_id = p_campaign_id AND pl.influencer_id = l.influencer_id
+  ),
+  inserted AS (
+    INSERT INTO payments (campaign_id, influencer_id, amount, status, razorpay_order_id, updated_at)
+    SELECT p_campaign_id, c.influencer_id, c.amount, 'Paid',
+           'payout_mock_' || replace(uuid_generate_v4()::text, '-', ''), now()
+    FROM checked c
+    WHERE c.error IS NULL
+    RETURNING payments.id, payments.influencer_id, payments.razorpay_order_id
+  )
+  SELECT c.line, c.influencer_id, c.amount, c.error IS NULL, c.error, i.id, i.razorpay_order_id
+  FROM checked c
+  -- At most one valid line per influencer, so this join cannot repeat rows
+  LEFT JOIN inserted i ON c.error IS NULL AND i.influencer_id = c.influencer_id
+  ORDER BY c.line;
+
+  UPDATE campaign_influencer ci
+  SET payment_status = true
+  FROM payment_ledger pl
+  WHERE ci.campaign_id = p_campaign_id
+    AND pl.campaign_id = ci.campaign_id
+    AND pl.influencer_id = ci.influencer_id
+    AND pl.influencer_id = ANY (v_ids)
+    AND pl.paid_total >= ci.rate_per_post
+    AND ci.payment_status IS DISTINCT FROM true;
+END;
+$$;
@@ -0,0 +1,156 @@
+-- 009_campaign_summary.sql
+-- Per-campaign dashboard rollup (app/services/campaign_summary_service.py).
+-- Triggers on campaign_influencer and payments apply each row change as a
+-- delta, so reading a campaign's summary never rescans its roster.
+-- app/utils/postgrest_stub.py mirrors the triggers; keep the two in sync.
+
+CREATE TABLE campaign_summary (
+  campaign_id uuid PRIMARY KEY REFERENCES campaign(id) ON DELETE CASCADE,
+  influencer_count integer NOT NULL DEFAULT 0,
+  status_counts jsonb NOT NULL DEFAULT '{}',    -- {"Pending": 3, "Accepted": 2, ...}
+  agreed_total numeric NOT NULL DEFAULT 0,      -- SUM(campaign_influencer.rate_per_post)
+  paid_total numeric NOT NULL DEFAULT 0,
+  pending_total numeric NOT NULL DEFAULT 0,
+  performance jsonb NOT NULL DEFAULT '{}',      -- numeric keys of performance, summed
+  updated_at timestamptz DEFAULT now()
+);
+
+-- acc + sign * delta for every numeric key of delta
+CREATE OR REPLACE FUNCTION jsonb_sum_numbers(acc jsonb, delta jsonb, sign numeric)
+RETURNS jsonb
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT COALESCE(acc, '{}'::jsonb) || COALESCE(
+    (
+      SELECT jsonb_object_agg(d.key, COALESCE((acc->>d.key)::numeric, 0) + sign * (d.value #>> '{}')::numeric)
+      FROM jsonb_each(CASE WHEN jsonb_typeof(delta) = 'object' THEN delta ELSE '{}'::jsonb END) AS d
+      WHERE jsonb_typeof(d.value) = 'number'
+    ),
+    '{}'::jsonb
+  );
+$$;
+
+-- Rebuilds one campaign's summary from scratch (backfill / repair)
+CREATE OR REPLACE FUNCTION refresh_campaign_summary(p_campaign_id uuid)
+RETURNS campaign_summary
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_summary campaign_summary;
+BEGIN
+  INSERT INTO campaign_summary AS s (
+    campaign_id, influencer_count, status_counts, agreed_total,
+    paid_total, pending_total, performance, updated_at
+  )
+  SELECT
+    p_campaign_id,
+    (SELECT count(*) FROM campaign_influencer WHERE campaign_id = p_campaign_id),
+    COALESCE((
+      SELECT jsonb_object_agg(st, n)
+      FROM (
+        SELECT COALESCE(status, 'Pending') AS st, count(*) AS n
+        FROM campaign_influencer
+        WHERE campaign_id = p_campaign_id
+        GROUP BY 1
+      ) c
+    ), '{}'::jsonb),
+    (SELECT COALESCE(SUM(rate_per_post), 0) FROM campaign_influencer WHERE campaign_id = p_campaign_id),
+    (SELECT COALESCE(SUM(amount), 0) FROM payments WHERE campaign_id = p_campaign_id AND status = 'Paid'),
+    (SELECT COALESCE(SUM(amount), 0) FROM payments WHERE campaign_id = p_campaign_id AND status = 'Pending'),
+    COALESCE((
+      SELECT jsonb_object_agg(key, total)
+      FROM (
+        SELECT p.key, SUM((p.value #>> '{}')::numeric) AS total
+        FROM campaign_influencer ci,
+             jsonb_each(CASE WHEN jsonb_typeof(ci.performance) = 'object' THEN ci.performance ELSE '{}'::jsonb END) AS p
+        WHERE ci.campaign_id = p_campaign_id AND jsonb_typeof(p.value) = 'number'
+        GROUP BY p.key
+      ) m
+    ), '{}'::jsonb),
+    now()
+  ON CONFLICT (campaign_id) DO UPDATE
+  SET influencer_count = EXCLUDED.influencer_count,
+      status_counts = EXCLUDED.status_counts,
+      agreed_total = EXCLUDED.agreed_total,
+      paid_total = EXCLUDED.paid_total,
+      pending_total = EXCLUDED.pending_total,
+      performance = EXCLUDED.performance,
+      updated_at = now()
+  RETURNING * INTO v_summary;
+  RETURN v_summary;
+END;
+$$;
+
+-- Backfill existing campaigns
+SELECT refresh_campaign_summary(id) FROM campaign;
+
+CREATE OR REPLACE FUNCTION campaign_summary_link_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE campaign_summary
+    SET influencer_count = influencer_count - 1,
+        status_counts = jsonb_sum_numbers(status_counts, jsonb_build_object(COALESCE(OLD.status, 'Pending'), 1), -1),
+        agreed_total = agreed_total - COALESCE(OLD.rate_per_post, 0),
+        performance = jsonb_sum_numbers(performance, OLD.performance, -1),
+        updated_at = now()
+    WHERE campaign_id = OLD.campaign_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO campaign_summary (campaign_id, influencer_count, status_counts, agreed_total, performance)
+    VALUES (
+      NEW.campaign_id,
+      1,
+      jsonb_build_object(COALESCE(NEW.status, 'Pending'), 1),
+      COALESCE(NEW.rate_per_post, 0),
+      jsonb_sum_numbers('{}'::jsonb, NEW.performance, 1)
+    )
+    ON CONFLICT (campaign_id) DO UPDATE
+    SET influencer_count = campaign_summary.influencer_count + 1,
+        status_counts = jsonb_sum_numbers(campaign_summary.status_counts, EXCLUDED.status_counts, 1),
+        agreed_total = campaign_summary.agreed_total + EXCLUDED.agreed_total,
+        performance = jsonb_sum_numbers(campaign_summary.performance, EXCLUDED.performance, 1),
+        updated_at = now();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER campaign_summary_link_sync
+AFTER INSERT OR DELETE OR UPDATE OF status, rate_per_post, performance, campaign_id ON campaign_influencer
+FOR EACH ROW EXECUTE FUNCTION campaign_summary_link_sync();
+
+CREATE OR REPLACE FUNCTION campaign_summary_payments_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.campaign_id IS NOT NULL THEN
+    UPDATE campaign_summary
+    SET paid_total = paid_total - CASE WHEN OLD.status = 'Paid' THEN OLD.amount ELSE 0 END,
+        pending_total = pending_total - CASE WHEN OLD.status = 'Pending' THEN OLD.amount ELSE 0 END,
+        updated_at = now()
+    WHERE campaign_id = OLD.campaign_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.campaign_id IS NOT NULL THEN
+    INSERT INTO campaign_summary (campaign_id, paid_total, pending_total)
+    VALUES (
+      NEW.campaign_id,
+      CASE WHEN NEW.status = 'Paid' THEN NEW.amount ELSE 0 END,
+      CASE WHEN NEW.status = 'Pending' THEN NEW.amount ELSE 0 END
+    )
+    ON CONFLICT (campaign_id) DO UPDATE
+    SET paid_total = campaign_summary.paid_total + EXCLUDED.paid_total,
+        pending_total = campaign_summary.pending_total + EXCLUDED.pending_total,
+        updated_at = now();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER campaign_summary_payments_sync
+AFTER INSERT OR DELETE OR UPDATE OF status, amount, campaign_id ON payments
+FOR EACH ROW EXECUTE FUNCTION campaign_summary_payments_sync();
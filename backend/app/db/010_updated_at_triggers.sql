@@ -0,0 +1,27 @@
+-- 010_updated_at_triggers.sql
+-- Keep updated_at current on business, influencer and campaign rows: it is
+-- the version the API derives ETag / Last-Modified from, and probes with a
+-- narrow `select id, updated_at` to answer conditional GETs with 304.
+-- app/utils/postgrest_stub.py mirrors the triggers; keep the two in sync.
+
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.updated_at := now();
+  RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER business_set_updated_at
+BEFORE UPDATE ON business
+FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+CREATE TRIGGER influencer_set_updated_at
+BEFORE UPDATE ON influencer
+FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+CREATE TRIGGER campaign_set_updated_at
+BEFORE UPDATE ON campaign
+FOR EACH ROW EXECUTE FUNCTION set_updated_at();
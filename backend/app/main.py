@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -11,11 +12,31 @@ from app.routes.influencer import router as influencer_router
 from app.routes.influencers_search import router as influencers_search_router
 from app.routes.campaign import router as campaign_router
 from app.routes.payments import router as payments_router
+from app.routes.metrics import router as metrics_router
 from app.routes.influencer_recommedations import router as influencer_recommedations_router
+from app.services.dataloader import RequestLoaderMiddleware
+from app.services.db import close_db, open_db
+from app.services.repository import close_repository, open_repository
+from app.utils.compression import CompressionMiddleware
+from app.utils.responses import ORJSONResponse
 # Load environment variables from .env file
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled async PostgREST client per worker (app/services/db.py)
+    await open_db()
+    # Backend for key lookups and state transitions (DB_BACKEND, app/services/repository.py)
+    await open_repository()
+    try:
+        yield
+    finally:
+        await close_repository()
+        await close_db()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -26,6 +47,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# One batching/memoizing DataLoader per request (app/services/dataloader.py)
+app.add_middleware(RequestLoaderMiddleware)
+
+# gzip/brotli for JSON and NDJSON bodies above COMPRESSION_MIN_SIZE (app/utils/compression.py)
+app.add_middleware(CompressionMiddleware)
+
 # Import and include routers here
 # from backend.routes import example_router
 # app.include_router(example_router)
@@ -39,5 +66,6 @@ app.include_router(influencer_router)
 app.include_router(influencers_search_router, prefix="/api")
 app.include_router(campaign_router)
 app.include_router(payments_router)
+app.include_router(metrics_router)
 app.include_router(influencer_recommedations_router)
 # Remove the @app.get("/health") endpoint 
\ No newline at end of file
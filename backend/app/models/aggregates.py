@@ -0,0 +1,53 @@
+from typing import Any, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class BusinessRecord(BaseModel):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    website_url: Optional[str] = None
+
+
+class InfluencerRecord(BaseModel):
+    id: str
+    name: Optional[str] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    profile_picture_url: Optional[str] = None
+
+
+class CampaignInfluencerRecord(BaseModel):
+    influencer_id: str
+    status: str = "Pending"
+    rate_per_post: Optional[float] = None
+    agreed_rate_per_post: Optional[float] = None
+    final_deliverable_details: Optional[str] = None
+    influencer: Optional[InfluencerRecord] = None
+
+
+class CampaignRecord(BaseModel):
+    id: str
+    title: Optional[str] = None
+    budget: Optional[float] = None
+    deliverables: Optional[List[Any]] = None
+    proposed_dates: Optional[str] = None
+    business_id: Optional[str] = None
+    business: Optional[BusinessRecord] = None
+    campaign_influencer: List[CampaignInfluencerRecord] = []
+
+    def dates(self) -> Tuple[str, str]:
+        # proposed_dates is a string like "[2025-06-01,2025-06-15)"
+        pd = self.proposed_dates
+        if isinstance(pd, str) and "," in pd:
+            start_date, end_date = pd.strip("[]()").split(",")[:2]
+            return start_date, end_date
+        return "TBD", "TBD"
+
+
+class RosterEntry(BaseModel):
+    id: str
+    name: Optional[str] = None
+    profile_picture_url: Optional[str] = None
+    invite_status: str = "Pending"
@@ -1,18 +1,23 @@
 # backend/app/routes/business.py
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from pydantic import BaseModel, HttpUrl
 from typing import List, Optional
 from app.services.business_service import (
     get_business_by_id,
+    get_business_version,
     list_businesses,
     create_business,
     update_business,
     delete_business,
     list_campaigns_for_business,
+    list_campaign_versions_for_business,
 )
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.utils.conditional import conditional_page, conditional_row
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter(prefix="/api/business", tags=["business"])
+router = APIRouter(prefix="/api/business", tags=["business"], route_class=ORJSONRoute)
 
 
 class BusinessPayload(BaseModel):
@@ -28,25 +33,39 @@ class BusinessPayload(BaseModel):
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_businesses():
+async def get_all_businesses(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,name"),
+):
     """
-    GET /api/business/
-    Returns a list of all businesses.
+    GET /api/business/?limit=50&cursor=...&fields=id,name
+    Returns one page of businesses; pass next_cursor back as `cursor` for the next page.
     """
-    businesses = list_businesses()
-    return {"businesses": businesses}
+    try:
+        page = await list_businesses(limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"businesses": page["items"], "next_cursor": page["next_cursor"]}
 
 
 @router.get("/{business_id}", status_code=status.HTTP_200_OK)
-async def get_business(business_id: str):
+async def get_business(business_id: str, request: Request):
     """
     GET /api/business/{business_id}
-    Returns the business row with the given UUID.
+    Returns the business row with the given UUID, with ETag and Last-Modified
+    (304 when the client's copy is current).
     """
-    business = get_business_by_id(business_id)
-    if business is None:
+    response = await conditional_row(
+        request.headers,
+        "business",
+        lambda: get_business_version(business_id),
+        lambda updated_at: get_business_by_id(business_id, updated_at),
+        "business",
+    )
+    if response is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business not found")
-    return {"business": business}
+    return response
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -55,7 +74,7 @@ async def create_new_business(payload: BusinessPayload):
     POST /api/business/
     Creates a new business row.
     """
-    created = create_business(payload.dict())
+    created = await create_business(payload.dict())
     if created is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error creating business")
     return {"business": created}
@@ -67,7 +86,7 @@ async def update_existing_business(business_id: str, payload: BusinessPayload):
     PUT /api/business/{business_id}
     Updates the business with the given UUID.
     """
-    updated = update_business(business_id, payload.dict())
+    updated = await update_business(business_id, payload.dict())
     if updated is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business not found or update failed")
     return {"business": updated}
@@ -79,21 +98,37 @@ async def delete_existing_business(business_id: str):
     DELETE /api/business/{business_id}
     Deletes the business with the given UUID.
     """
-    deleted = delete_business(business_id)
+    deleted = await delete_business(business_id)
     if deleted is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business not found or delete failed")
     return {"deleted": True}
 
 
 @router.get("/{business_id}/campaigns", status_code=status.HTTP_200_OK)
-async def get_business_campaigns(business_id: str):
+async def get_business_campaigns(
+    business_id: str,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,name"),
+):
     """
-    GET /api/business/{business_id}/campaigns
-    Returns all campaigns whose `business_id` matches this id.
+    GET /api/business/{business_id}/campaigns?limit=50&cursor=...&fields=id,title
+    Returns one page of campaigns whose `business_id` matches this id, with a
+    weak ETag (304 when no campaign on the page changed).
     """
     # Verify business exists
-    if get_business_by_id(business_id) is None:
+    if await get_business_by_id(business_id) is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business not found")
 
-    campaigns = list_campaigns_for_business(business_id)
-    return {"campaigns": campaigns}
+    try:
+        return await conditional_page(
+            request.headers,
+            f"business:{business_id}:campaigns",
+            fields,
+            lambda: list_campaign_versions_for_business(business_id, limit, cursor),
+            lambda: list_campaigns_for_business(business_id, limit, cursor, fields),
+            lambda page: {"campaigns": page["items"], "next_cursor": page["next_cursor"]},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,17 +1,21 @@
 # backend/app/routes/campaign.py
 
-from fastapi import APIRouter, HTTPException, status, Request
+from fastapi import APIRouter, HTTPException, Query, status, Request
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from app.services.campaign_service import (
     create_campaign,
     get_campaign_by_id,
+    get_campaign_version,
     list_campaigns,
+    list_campaign_versions,
     update_campaign,
+    sync_campaign_influencers,
     delete_campaign,
     get_campaigns_for_influencer,
     list_influencers_for_campaign,
     invite_influencer_to_campaign,
+    bulk_invite_influencers,
     get_join_row,
     get_influencer_performance,
     accept_influencer_invitation,
@@ -20,13 +24,18 @@ from app.services.campaign_service import (
     get_finalized_terms,
     sign_contract_for_influencer,
 )
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.services.campaign_state_service import TRANSITIONS, transition_many
+from app.services.campaign_summary_service import get_campaign_summary
 from app.services.negotiation_service import (
     handle_influencer_message_and_counter,
     list_negotiation_messages,
     add_negotiation_message,
 )
+from app.utils.conditional import conditional_page, conditional_row
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter(prefix="/api/campaign", tags=["campaign"])
+router = APIRouter(prefix="/api/campaign", tags=["campaign"], route_class=ORJSONRoute)
 
 
 # ----- Pydantic Models -----
@@ -44,6 +53,15 @@ class InvitePayload(BaseModel):
     influencer_id: str
 
 
+class BulkInvitePayload(BaseModel):
+    influencer_ids: List[str]
+
+
+class BatchTransitionPayload(BaseModel):
+    transition: str                              # e.g. "accept", "complete"
+    influencer_ids: Optional[List[str]] = None   # None = every influencer of the campaign
+
+
 class ProposedDates(BaseModel):
     start_date: str = Field(..., description="YYYY-MM-DD")
     end_date:   str = Field(..., description="YYYY-MM-DD")
@@ -67,25 +85,47 @@ class CampaignPayload(BaseModel):
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_campaigns():
+async def get_all_campaigns(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,name"),
+):
     """
-    GET /api/campaign/
-    Returns a list of all campaigns.
+    GET /api/campaign/?limit=50&cursor=...&fields=id,title
+    Returns one page of campaigns; pass next_cursor back as `cursor` for the next page.
+    The page carries a weak ETag; If-None-Match gets 304 when no row on it changed.
     """
-    campaigns = list_campaigns()
-    return {"campaigns": campaigns}
+    try:
+        return await conditional_page(
+            request.headers,
+            "campaigns",
+            fields,
+            lambda: list_campaign_versions(limit, cursor),
+            lambda: list_campaigns(limit, cursor, fields),
+            lambda page: {"campaigns": page["items"], "next_cursor": page["next_cursor"]},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{campaign_id}", status_code=status.HTTP_200_OK)
-async def get_campaign(campaign_id: str):
+async def get_campaign(campaign_id: str, request: Request):
     """
     GET /api/campaign/{campaign_id}
-    Returns a single campaign by ID.
-    """
-    campaign = get_campaign_by_id(campaign_id)
-    if campaign is None:
+    Returns a single campaign by ID, with ETag and Last-Modified; a matching
+    If-None-Match / If-Modified-Since gets 304 after a probe of updated_at only.
+    """
+    response = await conditional_row(
+        request.headers,
+        "campaign",
+        lambda: get_campaign_version(campaign_id),
+        lambda updated_at: get_campaign_by_id(campaign_id, updated_at),
+        "campaign",
+    )
+    if response is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-    return {"campaign": campaign}
+    return response
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -110,7 +150,7 @@ async def create_new_campaign(payload: CampaignPayload):
         "status": payload.status,
     }
 
-    created = create_campaign(to_insert, payload.influencer_ids)
+    created = await create_campaign(to_insert, payload.influencer_ids)
     if created is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error creating campaign")
     return {"campaign": created}
@@ -121,6 +161,9 @@ async def update_existing_campaign(campaign_id: str, payload: CampaignPayload):
     """
     PUT /api/campaign/{campaign_id}
     Updates a campaign row and re‐syncs its campaign_influencer invite list.
+    Only added/removed influencers are written; existing invites keep their
+    status and terms. Returns { campaign, invite_changes: { added, removed, unchanged } }
+    when influencer_ids is sent.
     """
     to_update = {
         "business_id": payload.business_id,
@@ -138,10 +181,14 @@ async def update_existing_campaign(campaign_id: str, payload: CampaignPayload):
         "status": payload.status,
     }
 
-    updated = update_campaign(campaign_id, to_update, payload.influencer_ids)
+    updated = await update_campaign(campaign_id, to_update)
     if updated is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found or update failed")
-    return {"campaign": updated}
+
+    if payload.influencer_ids is None:
+        return {"campaign": updated}
+    invite_changes = await sync_campaign_influencers(campaign_id, payload.influencer_ids)
+    return {"campaign": updated, "invite_changes": invite_changes}
 
 
 @router.delete("/{campaign_id}", status_code=status.HTTP_200_OK)
@@ -150,7 +197,7 @@ async def delete_existing_campaign(campaign_id: str):
     DELETE /api/campaign/{campaign_id}
     Deletes the campaign and any campaign_influencer rows.
     """
-    deleted = delete_campaign(campaign_id)
+    deleted = await delete_campaign(campaign_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found or delete failed")
     return {"deleted": True}
@@ -160,13 +207,37 @@ async def delete_existing_campaign(campaign_id: str):
 
 
 @router.get("/influencer/{influencer_id}", status_code=status.HTTP_200_OK)
-async def get_campaigns_for_one_influencer(influencer_id: str):
+async def get_campaigns_for_one_influencer(
+    influencer_id: str,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,name"),
+):
     """
-    GET /api/campaign/influencer/{influencer_id}
-    Returns all campaigns (with invite_status) to which this influencer belongs.
+    GET /api/campaign/influencer/{influencer_id}?limit=50&cursor=...&fields=id,title
+    Returns one page of campaigns (with invite_status) to which this influencer belongs.
     """
-    campaigns = get_campaigns_for_influencer(influencer_id)
-    return {"campaigns": campaigns}
+    try:
+        page = await get_campaigns_for_influencer(influencer_id, limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"campaigns": page["items"], "next_cursor": page["next_cursor"]}
+
+
+@router.get("/{campaign_id}/summary", status_code=status.HTTP_200_OK)
+async def get_campaign_dashboard_summary(campaign_id: str):
+    """
+    GET /api/campaign/{campaign_id}/summary
+    Returns invite status counts, agreed vs paid spend, budget utilization and
+    summed performance metrics for the campaign dashboard.
+    """
+    try:
+        summary = await get_campaign_summary(campaign_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return {"summary": summary}
 
 
 @router.get("/{campaign_id}/influencers", status_code=status.HTTP_200_OK)
@@ -175,7 +246,7 @@ async def get_campaign_influencers(campaign_id: str):
     GET /api/campaign/{campaign_id}/influencers
     Returns a list of invited influencers for this campaign.
     """
-    influencers = list_influencers_for_campaign(campaign_id)
+    influencers = await list_influencers_for_campaign(campaign_id)
     return {"influencers": influencers}
 
 
@@ -185,19 +256,41 @@ async def invite_influencer(campaign_id: str, payload: InvitePayload):
     POST /api/campaign/{campaign_id}/invite
     Invite a new influencer (status = 'Pending').
     """
-    success = invite_influencer_to_campaign(campaign_id, payload.influencer_id)
+    success = await invite_influencer_to_campaign(campaign_id, payload.influencer_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to send invite")
     return {"success": True}
 
 
+@router.post("/{campaign_id}/invite/bulk", status_code=status.HTTP_200_OK)
+async def invite_influencers_bulk(campaign_id: str, payload: BulkInvitePayload):
+    """
+    POST /api/campaign/{campaign_id}/invite/bulk
+    Invite many influencers at once (status = 'Pending') in a single upsert.
+    Existing invites are left as they are and reported under already_invited.
+    """
+    try:
+        result = await bulk_invite_influencers(campaign_id, payload.influencer_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    return {
+        "campaign_id": campaign_id,
+        "invited": result["invited"],
+        "already_invited": result["already_invited"],
+        "invited_count": len(result["invited"]),
+        "already_invited_count": len(result["already_invited"]),
+    }
+
+
 @router.post("/{campaign_id}/influencers/{influencer_id}/accept", status_code=status.HTTP_200_OK)
 async def accept_invitation(campaign_id: str, influencer_id: str):
     """
     POST /api/campaign/{campaign_id}/influencers/{influencer_id}/accept
     Change status='Pending' → 'Accepted'.
     """
-    success = accept_influencer_invitation(campaign_id, influencer_id)
+    success = await accept_influencer_invitation(campaign_id, influencer_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -212,7 +305,7 @@ async def reject_invitation(campaign_id: str, influencer_id: str):
     POST /api/campaign/{campaign_id}/influencers/{influencer_id}/reject
     Change status='Pending' → 'Rejected'.
     """
-    success = reject_influencer_invitation(campaign_id, influencer_id)
+    success = await reject_influencer_invitation(campaign_id, influencer_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -221,6 +314,29 @@ async def reject_invitation(campaign_id: str, influencer_id: str):
     return {"message": "Invitation rejected."}
 
 
+@router.post("/{campaign_id}/influencers/transition", status_code=status.HTTP_200_OK)
+async def transition_influencers(campaign_id: str, payload: BatchTransitionPayload):
+    """
+    POST /api/campaign/{campaign_id}/influencers/transition
+    Body: { "transition": "complete", "influencer_ids": [...] }  (omit ids for the whole campaign)
+    Moves every listed influencer that is in a valid source status in one update;
+    the others are reported under skipped.
+    """
+    try:
+        result = await transition_many(campaign_id, payload.transition, payload.influencer_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    return {
+        "campaign_id": campaign_id,
+        "transition": payload.transition,
+        "status": TRANSITIONS[payload.transition][1],
+        "moved": result["moved"],
+        "skipped": result["skipped"],
+    }
+
+
 @router.get("/{campaign_id}/influencers/{influencer_id}", status_code=status.HTTP_200_OK)
 async def get_join_for_influencer(campaign_id: str, influencer_id: str):
     """
@@ -228,7 +344,7 @@ async def get_join_for_influencer(campaign_id: str, influencer_id: str):
     Returns the join‐table row:
       { status, deliverables_submitted, payment_status, performance }
     """
-    join_row = get_join_row(campaign_id, influencer_id)
+    join_row = await get_join_row(campaign_id, influencer_id)
     if join_row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Join row not found")
     return {"join": join_row}
@@ -240,7 +356,7 @@ async def get_performance(campaign_id: str, influencer_id: str):
     GET /api/campaign/{campaign_id}/influencers/{influencer_id}/performance
     Returns the JSON stored in `performance` (e.g. { "views": 123, "likes": 45 }).
     """
-    perf = get_influencer_performance(campaign_id, influencer_id)
+    perf = await get_influencer_performance(campaign_id, influencer_id)
     if perf is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Performance data not found")
     return {"performance": perf}
@@ -256,7 +372,7 @@ async def get_negotiations(campaign_id: str, influencer_id: str):
     GET /api/campaign/{campaign_id}/negotiation/{influencer_id}
     Returns a list of negotiation messages in chronological order.
     """
-    rows = list_negotiation_messages(campaign_id, influencer_id)
+    rows = await list_negotiation_messages(campaign_id, influencer_id)
     return rows
 
 
@@ -286,7 +402,7 @@ async def post_negotiation_message(
             detail="Payload sender_type must be 'influencer'.",
         )
 
-    ai_response = handle_influencer_message_and_counter(
+    ai_response = await handle_influencer_message_and_counter(
         campaign_id=campaign_id,
         influencer_id=influencer_id,
         influencer_message=payload.message,
@@ -319,7 +435,7 @@ async def finalize_terms(
       - final_deliverables = payload.final_deliverable_details (could be stored in JSONB or a text column)
     """
     try:
-        success = finalize_influencer_terms(
+        success = await finalize_influencer_terms(
             campaign_id=campaign_id,
             influencer_id=influencer_id,
             agreed_rate=payload.agreed_rate_per_post,
@@ -345,7 +461,7 @@ async def get_terms(campaign_id: str, influencer_id: str):
     GET /api/campaign/{campaign_id}/influencers/{influencer_id}/terms
     Returns { agreed_rate_per_post, final_deliverable_details } from campaign_influencer.
     """
-    terms = get_finalized_terms(campaign_id, influencer_id)
+    terms = await get_finalized_terms(campaign_id, influencer_id)
     if terms is None:
         raise HTTPException(status_code=404, detail="Finalized terms not found")
     return terms
@@ -360,7 +476,7 @@ async def post_sign_contract(campaign_id: str, influencer_id: str):
     Sets campaign_influencer.status = "Signed"
     """
     try:
-        success = sign_contract_for_influencer(campaign_id, influencer_id)
+        success = await sign_contract_for_influencer(campaign_id, influencer_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,16 +1,30 @@
 # backend/app/routes/contract.py
 
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import Optional
-from io import BytesIO
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from fastapi.responses import StreamingResponse
-from app.services.contract_service import generate_contract_with_terms
+from pydantic import BaseModel
+from typing import List, Optional
+from app.services.contract_service import get_cached_contract, get_contract_etag
+from app.services.contract_batch_service import (
+    get_contract_batch,
+    start_contract_batch,
+    stream_contract_batch,
+)
+from app.utils.conditional import etag_matches
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter(prefix="/api/contract", tags=["contract"])
+router = APIRouter(prefix="/api/contract", tags=["contract"], route_class=ORJSONRoute)
+
+
+class ContractBatchRequest(BaseModel):
+    campaign_id: str
+    influencer_ids: Optional[List[str]] = None
 
 
 @router.get("/generate", summary="Generate a PDF contract")
 async def generate_contract_endpoint(
+    request: Request,
     campaign_id: str = Query(...),
     influencer_id: Optional[str] = Query(None)
 ):
@@ -19,19 +33,59 @@ async def generate_contract_endpoint(
     If influencer_id is provided, the service will pull in the finalized terms
     for that influencer/campaign—and produce a PDF. Otherwise, it may
     return a generic contract or an error.
+
+    The ETag is a hash of the contract inputs, so a client holding the current
+    PDF gets 304 Not Modified without the PDF being rendered or read.
     """
     try:
-        pdf_bytes = generate_contract_with_terms(campaign_id, influencer_id)
+        key, terms = await get_contract_etag(campaign_id, influencer_id)
+        etag = f'"{key}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        pdf_bytes = await asyncio.to_thread(get_cached_contract, key, terms)
         if not pdf_bytes:
             raise HTTPException(status_code=500, detail="Contract generation failed")
 
-        buffer = BytesIO(pdf_bytes)
-        return StreamingResponse(
-            buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="contract_{campaign_id}_{influencer_id}.pdf"'
-            },
-        )
+        headers["Content-Disposition"] = f'attachment; filename="contract_{campaign_id}_{influencer_id}.pdf"'
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch", summary="Generate every contract for a campaign as a streamed ZIP")
+async def generate_contract_batch_endpoint(payload: ContractBatchRequest):
+    """
+    POST /api/contract/batch
+    Body: { campaign_id, influencer_ids? }
+    Streams a ZIP with one PDF per eligible influencer (status Ready to Sign
+    Contract / Signed / Completed, or the given influencer_ids) plus a
+    manifest.json listing any contracts that failed. Poll
+    GET /api/contract/batch/{X-Contract-Batch-Id} for progress.
+    """
+    try:
+        batch = await start_contract_batch(payload.campaign_id, payload.influencer_ids)
+    except RuntimeError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        stream_contract_batch(batch),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="contracts_{payload.campaign_id}.zip"',
+            "X-Contract-Batch-Id": batch.batch_id,
+        },
+    )
+
+
+@router.get("/batch/{batch_id}", summary="Progress of a batch contract download")
+def get_contract_batch_endpoint(batch_id: str):
+    summary = get_contract_batch(batch_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return summary
@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Query
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 from app.services.openai_service import get_creator_recommendations
 from app.services.influencer_service import list_influencers
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 @router.get("/creator/search")
-def search_creators(prompt: str = Query(..., description="Marketing brief prompt")):
-    summary = get_creator_recommendations(prompt)
-    creators = list_influencers() or []
+async def search_creators(
+    prompt: str = Query(..., description="Marketing brief prompt"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+):
+    try:
+        page = await list_influencers(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    summary = await asyncio.to_thread(get_creator_recommendations, prompt)
     return {
-        "creators": creators,
+        "creators": page["items"],
+        "next_cursor": page["next_cursor"],
         "gpt_summary": summary
     } 
\ No newline at end of file
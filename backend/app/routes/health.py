@@ -1,7 +1,17 @@
 from fastapi import APIRouter
 
-router = APIRouter()
+from app.utils.entity_cache import entity_cache_stats
+from app.utils.responses import ORJSONRoute
+
+router = APIRouter(route_class=ORJSONRoute)
 
 @router.get("/health")
 def health_check():
-    return {"status": "ok"} 
\ No newline at end of file
+    return {"status": "ok"}
+
+@router.get("/health/cache")
+def cache_stats():
+    """
+    Per-worker entity cache counters: { influencer: { size, hits, misses, hit_rate, ... }, ... }
+    """
+    return {"entity_cache": entity_cache_stats()}
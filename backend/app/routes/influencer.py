@@ -1,8 +1,11 @@
 # backend/app/routes/influencer.py
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from app.services.influencer_service import (
     get_influencer_by_id,
+    get_influencer_version,
     list_influencers,
     get_payment_status,
     mark_campaign_complete,
@@ -12,44 +15,69 @@ from app.services.campaign_service import (
     accept_influencer_invitation,
     reject_influencer_invitation,
 )
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.utils.conditional import conditional_row
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter(prefix="/api/influencer", tags=["influencer"])
+router = APIRouter(prefix="/api/influencer", tags=["influencer"], route_class=ORJSONRoute)
 
 
 @router.get("/")
-async def get_all_influencers():
+async def get_all_influencers(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,name"),
+):
     """
-    GET /api/influencer/
-    Returns a list of all influencers.
+    GET /api/influencer/?limit=50&cursor=...&fields=id,name
+    Returns one page of influencers; pass next_cursor back as `cursor` for the next page.
     """
-    data = list_influencers()
-    return {"influencers": data}
+    try:
+        page = await list_influencers(limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"influencers": page["items"], "next_cursor": page["next_cursor"]}
 
 
 @router.get("/{id}")
-async def get_influencer(id: str):
+async def get_influencer(id: str, request: Request):
     """
     GET /api/influencer/{id}
-    Returns the influencer row with the given UUID.
+    Returns the influencer row with the given UUID, with ETag and Last-Modified
+    (304 when the client's copy is current).
     """
-    influencer = get_influencer_by_id(id)
-    if influencer is None:
+    response = await conditional_row(
+        request.headers,
+        "influencer",
+        lambda: get_influencer_version(id),
+        lambda updated_at: get_influencer_by_id(id, updated_at),
+        "influencer",
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Influencer not found")
-    return {"influencer": influencer}
+    return response
 
 
 @router.get("/{id}/campaigns")
-async def get_influencer_campaigns(id: str):
+async def get_influencer_campaigns(
+    id: str,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,name"),
+):
     """
-    GET /api/influencer/{id}/campaigns
-    Returns all campaigns that this influencer has been invited to,
+    GET /api/influencer/{id}/campaigns?limit=50&cursor=...&fields=id,title
+    Returns one page of campaigns that this influencer has been invited to,
     including invite_status.
     """
-    if get_influencer_by_id(id) is None:
+    if await get_influencer_by_id(id) is None:
         raise HTTPException(status_code=404, detail="Influencer not found")
 
-    campaigns = get_campaigns_for_influencer(id)
-    return {"campaigns": campaigns}
+    try:
+        page = await get_campaigns_for_influencer(id, limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"campaigns": page["items"], "next_cursor": page["next_cursor"]}
 
 
 @router.post("/{id}/campaigns/{campaign_id}/accept", status_code=status.HTTP_200_OK)
@@ -58,11 +86,11 @@ async def accept_campaign_invitation(id: str, campaign_id: str):
     POST /api/influencer/{id}/campaigns/{campaign_id}/accept
     Marks this influencer's invitation to the campaign as "Accepted".
     """
-    if get_influencer_by_id(id) is None:
+    if await get_influencer_by_id(id) is None:
         raise HTTPException(status_code=404, detail="Influencer not found")
 
     try:
-        success = accept_influencer_invitation(campaign_id, id)
+        success = await accept_influencer_invitation(campaign_id, id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -81,11 +109,11 @@ async def reject_campaign_invitation(id: str, campaign_id: str):
     POST /api/influencer/{id}/campaigns/{campaign_id}/reject
     Marks this influencer's invitation to the campaign as "Rejected".
     """
-    if get_influencer_by_id(id) is None:
+    if await get_influencer_by_id(id) is None:
         raise HTTPException(status_code=404, detail="Influencer not found")
 
     try:
-        success = reject_influencer_invitation(campaign_id, id)
+        success = await reject_influencer_invitation(campaign_id, id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -104,11 +132,11 @@ async def payment_status(influencer_id: str, campaign_id: str):
     GET /api/influencer/{influencer_id}/campaign/{campaign_id}/payment-status
     Returns { paid: boolean } for this influencer+campaign.
     """
-    if get_influencer_by_id(influencer_id) is None:
+    if await get_influencer_by_id(influencer_id) is None:
         raise HTTPException(status_code=404, detail="Influencer not found")
 
     try:
-        paid = get_payment_status(influencer_id, campaign_id)
+        paid = await get_payment_status(influencer_id, campaign_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -121,11 +149,11 @@ async def complete_campaign(influencer_id: str, campaign_id: str):
     POST /api/influencer/{influencer_id}/campaign/{campaign_id}/complete
     Marks the join‐table row status="Completed" for this influencer+campaign.
     """
-    if get_influencer_by_id(influencer_id) is None:
+    if await get_influencer_by_id(influencer_id) is None:
         raise HTTPException(status_code=404, detail="Influencer not found")
 
     try:
-        success = mark_campaign_complete(campaign_id, influencer_id)
+        success = await mark_campaign_complete(campaign_id, influencer_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -3,8 +3,10 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any
 from app.services.openai_service import get_creator_recommendations
+from app.services.profile_service import resolve_profiles
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter(prefix="/api/influencers-recommend", tags=["influencers-recommend"])
+router = APIRouter(prefix="/api/influencers-recommend", tags=["influencers-recommend"], route_class=ORJSONRoute)
 
 class Influencer(BaseModel):
     id: str
@@ -19,7 +21,9 @@ class Influencer(BaseModel):
 
 class RecommendRequest(BaseModel):
     campaignId: str
-    influencers: List[Influencer]
+    influencers: List[Influencer] = []
+    # Alternatively send just ids; profiles are resolved server-side (batched + cached)
+    influencerIds: List[str] = []
 
 @router.post("/")
 async def recommend_creators(req: RecommendRequest):
@@ -27,7 +31,8 @@ async def recommend_creators(req: RecommendRequest):
     Accepts:
       {
         "campaignId": "1234-abcd-...",
-        "influencers": [ { id, name, username, bio, categories, rate_per_post, social_media, location }, … ]
+        "influencers": [ { id, name, username, bio, categories, rate_per_post, social_media, location }, … ],
+        "influencerIds": [ "uuid", … ]   (optional, instead of or in addition to "influencers")
       }
     Returns:
       { "recommendation": "…GPT’s summary text…" }
@@ -48,6 +53,21 @@ async def recommend_creators(req: RecommendRequest):
                 "location": inf.location,
                 "social_media": inf.social_media
             })
+        sent_ids = {inf.id for inf in req.influencers}
+        profiles = await resolve_profiles(i for i in req.influencerIds if i not in sent_ids)
+        for inf_id in req.influencerIds:
+            inf = profiles.get(inf_id)
+            if inf is None:
+                continue
+            influencers_json.append({
+                "id": inf["id"],
+                "name": inf.get("name"),
+                "bio": inf.get("bio"),
+                "categories": inf.get("categories") or [],
+                "rate_per_post": inf.get("rate_per_post") or 0.0,
+                "location": inf.get("location") or {},
+                "social_media": inf.get("social_media") or {}
+            })
         prompt = (
             f"Here is a list of {len(influencers_json)} influencers (id, name, bio, categories, rate_per_post, "
             f"location, social_media) for campaign {req.campaignId}:\n\n"
@@ -6,10 +6,12 @@ from typing import List, Optional
 
 from app.services.influencer_service import list_influencers, search_influencers
 from app.utils.es_client import es
+from app.utils.responses import ORJSONRoute
 
 router = APIRouter(
     prefix="/influencers-search",
     tags=["influencers-search"],
+    route_class=ORJSONRoute,
 )
 
 class SearchFilters(BaseModel):
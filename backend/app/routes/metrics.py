@@ -0,0 +1,81 @@
+# backend/app/routes/metrics.py
+
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel
+
+from app.services.metrics_service import (
+    get_metric_series,
+    ingest_metric_points,
+    list_campaign_metrics,
+)
+from app.utils.responses import ORJSONRoute
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"], route_class=ORJSONRoute)
+
+
+class MetricPoint(BaseModel):
+    campaign_id: str
+    influencer_id: str
+    metric: str          # e.g. "views", "likes", "impressions", "link_clicks"
+    ts: str              # ISO-8601 timestamp (or epoch seconds as a string)
+    value: float
+
+
+class MetricIngestPayload(BaseModel):
+    points: List[MetricPoint]
+
+
+@router.post("/ingest", status_code=status.HTTP_200_OK)
+async def ingest_metrics(payload: MetricIngestPayload):
+    """
+    POST /api/metrics/ingest
+    Body: { "points": [ { campaign_id, influencer_id, metric, ts, value }, ... ] }
+    Appends a batch of data points to the metrics store.
+    """
+    points = []
+    for p in payload.points:
+        point = p.dict()
+        if point["ts"].isdigit():
+            point["ts"] = int(point["ts"])
+        points.append(point)
+    try:
+        stored = await asyncio.to_thread(ingest_metric_points, points)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"stored": stored}
+
+
+@router.get("/campaign/{campaign_id}", status_code=status.HTTP_200_OK)
+async def get_campaign_metrics(campaign_id: str):
+    """
+    GET /api/metrics/campaign/{campaign_id}
+    Returns the metric names that have data for this campaign.
+    """
+    # refresh() reads new segments from disk: keep it off the event loop
+    metrics = await asyncio.to_thread(list_campaign_metrics, campaign_id)
+    return {"campaign_id": campaign_id, "metrics": metrics}
+
+
+@router.get("/campaign/{campaign_id}/{metric}", status_code=status.HTTP_200_OK)
+async def get_campaign_metric_series(
+    campaign_id: str,
+    metric: str,
+    start: str = Query(..., description="ISO-8601 start (inclusive)"),
+    end: Optional[str] = Query(None, description="ISO-8601 end (exclusive), default now"),
+    resolution: str = Query("auto", description="minute | hour | day | auto"),
+    influencer_id: Optional[List[str]] = Query(None),
+):
+    """
+    GET /api/metrics/campaign/{campaign_id}/{metric}?start=...&end=...&resolution=auto
+    Returns chart buckets for one metric, summed across the campaign's
+    influencers (or only the given influencer_id values).
+    """
+    try:
+        return await asyncio.to_thread(
+            get_metric_series, campaign_id, metric, start, end, resolution, influencer_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,12 +1,22 @@
-from fastapi import APIRouter
+import json
+from typing import List, Optional, Union
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.services.outreach_service import send_outreach_email
+from app.services.outreach_job_service import (
+    start_bulk_outreach,
+    retry_failed_outreach,
+    get_outreach_job,
+    get_outreach_job_summary,
+)
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 class OutreachSendRequest(BaseModel):
-    campaign_id: int
-    creator_id: int
+    campaign_id: Union[int, str]
+    creator_id: Union[int, str]   # influencer UUID, or an integer id from the demo MOCK_CREATORS
     brief: str
 
 class OutreachSendResponse(BaseModel):
@@ -14,7 +24,76 @@ class OutreachSendResponse(BaseModel):
     subject: str
     body: str
 
+class BulkOutreachRequest(BaseModel):
+    campaign_id: str
+    brief: str
+    creator_ids: Optional[List[str]] = None   # omit to contact every influencer linked to the campaign
+    concurrency: Optional[int] = None         # max emails generated at once
+    mode: str = "template"                    # "template" (one LLM call per brief) or "per_creator"
+
+class BulkOutreachRetryRequest(BaseModel):
+    concurrency: Optional[int] = None
+    mode: str = "template"
+
 @router.post("/outreach/send", response_model=OutreachSendResponse)
-def send_outreach(req: OutreachSendRequest):
-    result = send_outreach_email(req.campaign_id, req.creator_id, req.brief)
-    return OutreachSendResponse(**result) 
\ No newline at end of file
+async def send_outreach(req: OutreachSendRequest):
+    result = await send_outreach_email(req.campaign_id, req.creator_id, req.brief)
+    return OutreachSendResponse(**result)
+
+@router.post("/outreach/bulk", status_code=202)
+async def send_bulk_outreach(req: BulkOutreachRequest):
+    """
+    POST /api/outreach/bulk
+    Starts a background job that generates and delivers one email per creator.
+    Returns the job summary; follow progress at /api/outreach/bulk/{job_id}/events.
+    """
+    try:
+        job = await start_bulk_outreach(req.campaign_id, req.brief, req.creator_ids, req.concurrency, req.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return job.summary()
+
+@router.get("/outreach/bulk/{job_id}")
+async def get_bulk_outreach(job_id: str):
+    """
+    GET /api/outreach/bulk/{job_id}
+    Returns { job_id, status, mode, total, queued, failed, pending }.
+    """
+    summary = await get_outreach_job_summary(job_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Outreach job not found")
+    return summary
+
+@router.get("/outreach/bulk/{job_id}/events")
+async def stream_bulk_outreach(job_id: str):
+    """
+    GET /api/outreach/bulk/{job_id}/events
+    Streams per-creator progress as newline-delimited JSON, ending with a {"type": "done"} line.
+    Only available on the worker that is running the job.
+    """
+    job = get_outreach_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Outreach job not running on this worker")
+
+    async def events():
+        async for event in job.stream():
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@router.post("/outreach/bulk/{job_id}/retry", status_code=202)
+async def retry_bulk_outreach(job_id: str, req: Optional[BulkOutreachRetryRequest] = None):
+    """
+    POST /api/outreach/bulk/{job_id}/retry
+    Re-sends to every creator of the job whose status is still Failed or Pending.
+    """
+    try:
+        req = req or BulkOutreachRetryRequest()
+        job = await retry_failed_outreach(job_id, req.concurrency, req.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Outreach job not found")
+    return job.summary()
@@ -1,16 +1,27 @@
 # backend/app/routes/payments.py
 
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from app.services.payment_service import (
     create_mock_order,
     mark_payment_success,
     get_payment_history,
+    get_payment_balance,
+    create_bulk_payout,
+)
+from app.services.idempotency_service import IdempotencyError, run_idempotent
+from app.services.reconciliation_service import (
+    reconcile_payments,
+    reconciliation_report_path,
 )
+from app.utils.responses import ORJSONRoute
 
-router = APIRouter(prefix="/api/payment", tags=["payment"])
+router = APIRouter(prefix="/api/payment", tags=["payment"], route_class=ORJSONRoute)
 
 
 class CreateOrderPayload(BaseModel):
@@ -19,21 +30,40 @@ class CreateOrderPayload(BaseModel):
     payment_amount: float   # amount in rupees
 
 
+async def _idempotent_response(scope: str, key: Optional[str], body: Dict, handler) -> JSONResponse:
+    try:
+        status_code, content, replayed = await run_idempotent(scope, key, body, handler)
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(content=content, status_code=status_code, headers=headers)
+
+
 @router.post("/create_order", status_code=200)
-async def create_order(payload: CreateOrderPayload):
+async def create_order(
+    payload: CreateOrderPayload,
+    idempotency_key: Optional[str] = Header(None),
+):
     """
     POST /api/payment/create_order
     Body: { campaign_id, influencer_id, payment_amount }
+    Retries carrying the same Idempotency-Key header get the original response
+    back instead of creating another Pending payment.
     """
-    try:
-        data = create_mock_order(
-            payload.campaign_id,
-            payload.influencer_id,
-            payload.payment_amount,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    return data
+    async def handler():
+        try:
+            return 200, await create_mock_order(
+                payload.campaign_id,
+                payload.influencer_id,
+                payload.payment_amount,
+            )
+        except ValueError as e:
+            return 400, {"detail": str(e)}
+        except Exception as e:
+            # 5xx is not stored, so a retry with the same key runs again
+            return 500, {"detail": str(e)}
+
+    return await _idempotent_response("payment.create_order", idempotency_key, payload.model_dump(), handler)
 
 
 class VerifyPayload(BaseModel):
@@ -43,19 +73,26 @@ class VerifyPayload(BaseModel):
 
 
 @router.post("/verify", status_code=200)
-async def verify_payment(payload: VerifyPayload):
+async def verify_payment(
+    payload: VerifyPayload,
+    idempotency_key: Optional[str] = Header(None),
+):
     """
     POST /api/payment/verify
     Body: { razorpay_order_id, razorpay_payment_id, razorpay_signature }
+    Supports the Idempotency-Key header like create_order.
     """
-    success = mark_payment_success(
-        payload.razorpay_order_id,
-        payload.razorpay_payment_id,
-        payload.razorpay_signature,
-    )
-    if not success:
-        raise HTTPException(status_code=400, detail="Payment verification failed")
-    return {"success": True}
+    async def handler():
+        payment = await mark_payment_success(
+            payload.razorpay_order_id,
+            payload.razorpay_payment_id,
+            payload.razorpay_signature,
+        )
+        if not payment:
+            return 400, {"detail": "Payment verification failed"}
+        return 200, {"success": True, "payment": payment}
+
+    return await _idempotent_response("payment.verify", idempotency_key, payload.model_dump(), handler)
 
 
 @router.get("/history", status_code=200)
@@ -67,5 +104,81 @@ async def payment_history(
     GET /api/payment/history?campaign_id=...&influencer_id=...
     Returns: [ { id, amount, status, razorpay_order_id, razorpay_payment_id, created_at }, … ]
     """
-    rows = get_payment_history(campaign_id, influencer_id)
+    rows = await get_payment_history(campaign_id, influencer_id)
     return {"payments": rows}
+
+
+
+@router.get("/balance", status_code=200)
+async def payment_balance(
+    campaign_id: str = Query(...),
+    influencer_id: str = Query(...),
+):
+    """
+    GET /api/payment/balance?campaign_id=...&influencer_id=...
+    Returns: { paid_total, pending_total }
+    """
+    return await get_payment_balance(campaign_id, influencer_id)
+
+
+class PayoutLine(BaseModel):
+    influencer_id: str
+    amount: float   # amount in rupees
+
+
+class BulkPayoutPayload(BaseModel):
+    campaign_id: str
+    payouts: List[PayoutLine]
+
+
+@router.post("/payout/bulk", status_code=200)
+async def bulk_payout(
+    payload: BulkPayoutPayload,
+    idempotency_key: Optional[str] = Header(None),
+):
+    """
+    POST /api/payment/payout/bulk
+    Body: { campaign_id, payouts: [ { influencer_id, amount }, … ] }
+    Returns: { campaign_id, paid, failed, total_paid, results: [ … one per line … ] }
+    Lines that fail validation are reported individually; the rest are paid.
+    """
+    async def handler():
+        try:
+            return 200, await create_bulk_payout(
+                payload.campaign_id,
+                [line.model_dump() for line in payload.payouts],
+            )
+        except ValueError as e:
+            return 400, {"detail": str(e)}
+        except Exception as e:
+            return 500, {"detail": str(e)}
+
+    return await _idempotent_response("payment.payout_bulk", idempotency_key, payload.model_dump(), handler)
+
+
+@router.post("/reconcile", status_code=200)
+async def reconcile(stale_pending_hours: float = Query(24, gt=0)):
+    """
+    POST /api/payment/reconcile?stale_pending_hours=24
+    Expires abandoned Pending payments (PENDING_PAYMENT_TTL_HOURS), then
+    streams payments, campaign_influencer and payment_ledger in keyset pages and
+    writes a JSON Lines report of overpaid / paid-but-flag-false /
+    flag-true-but-unpaid / stale Pending / ledger mismatch / orphan payments.
+    Returns: { report_id, pairs_checked, payments_scanned, issues: {type: count}, … }
+    """
+    try:
+        return await asyncio.to_thread(reconcile_payments, stale_pending_hours=stale_pending_hours)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/reconcile/{report_id}", status_code=200)
+async def reconciliation_report(report_id: str):
+    """
+    GET /api/payment/reconcile/{report_id}
+    Returns the report as application/x-ndjson, one issue per line.
+    """
+    path = reconciliation_report_path(report_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return FileResponse(path, media_type="application/x-ndjson", filename=f"{report_id}.jsonl")
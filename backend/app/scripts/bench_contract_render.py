@@ -0,0 +1,176 @@
+# backend/app/scripts/bench_contract_render.py
+#
+# Micro-benchmark for contract rendering: per-contract render time with a
+# fresh Jinja Environment / 80-char split per document (the previous code path)
+# versus the cached templates, fonts and width-measured wrapping in
+# app.utils.contract_renderer. No database or network access.
+#
+# Usage (from backend/):
+#   python -m app.scripts.bench_contract_render --contracts 500
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from jinja2 import Environment, FileSystemLoader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.utils import contract_renderer
+
+TEMPLATE_CONTEXT = {
+    "campaign_title": "Summer Launch",
+    "brand_name": "Acme Beverages",
+    "brand_email": "partners@acme.example",
+    "brand_phone": "+91 98765 43210",
+    "brand_website": "https://acme.example",
+    "creator_name": "Ana Sharma",
+    "creator_username": "ana.creates",
+    "creator_email": "ana@example.com",
+    "start_date": "2025-06-01",
+    "end_date": "2025-06-15",
+    "budget": 50000,
+    "rate_per_post": 10000,
+    "bullet_deliverables": "\n".join(f"- Instagram reel #{i} with product placement" for i in range(5)),
+}
+
+
+def sample_terms(i: int) -> dict:
+    return {
+        "campaign_title": "Summer Launch",
+        "start_date": "2025-06-01",
+        "end_date": "2025-06-15",
+        "influencer_name": f"Creator {i}",
+        "agreed_rate_per_post": 1000 + i,
+        "final_deliverable_details": (
+            "Two Instagram reels and three stories featuring the product, "
+            "posted between the campaign dates, with brand tag and link in bio. "
+        ) * 3,
+        "brand_name": "Acme Beverages",
+    }
+
+
+# ——— Previous implementation, kept here as the baseline ———
+
+def legacy_markdown_pdf() -> bytes:
+    templates_path = os.path.join(project_root, "app", "utils", "templates")
+    env = Environment(loader=FileSystemLoader(templates_path))
+    rendered_md = env.get_template("contract_template.md.j2").render(**TEMPLATE_CONTEXT)
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    pdf.setFont("Times-Roman", 12)
+    y_position = height - 50
+    for line in rendered_md.splitlines():
+        pdf.drawString(40, y_position, line)
+        y_position -= 16
+        if y_position < 50:
+            pdf.showPage()
+            pdf.setFont("Times-Roman", 12)
+            y_position = height - 50
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def legacy_terms_pdf(terms: dict) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    pdf.setFont("Times-Bold", 16)
+    y = height - 50
+    pdf.drawString(40, y, f"Contract: {terms['campaign_title']}")
+    y -= 30
+    pdf.setFont("Times-Roman", 12)
+    for text in (
+        f"Brand: {terms['brand_name']}",
+        f"Influencer: {terms['influencer_name']}",
+        f"Campaign Dates: {terms['start_date']} to {terms['end_date']}",
+        f"Agreed Rate (per post): ₹{float(terms['agreed_rate_per_post']):.2f}",
+    ):
+        pdf.drawString(40, y, text)
+        y -= 18
+    text_obj = pdf.beginText(40, y)
+    text_obj.setFont("Times-Roman", 12)
+    for line in terms["final_deliverable_details"].splitlines():
+        for piece in [line[i : i + 80] for i in range(0, len(line), 80)]:
+            text_obj.textLine(piece)
+            y -= 14
+    pdf.drawText(text_obj)
+    y -= 48
+    for tc in contract_renderer.TERMS_AND_CONDITIONS:
+        pdf.drawString(60, y, f"- {tc}")
+        y -= 16
+    pdf.drawString(40, 100, "Brand Signature: ____________________________")
+    pdf.drawString(40, 60, "Influencer Signature: _______________________")
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+# ——— Cached renderer ———
+
+def cached_markdown_pdf() -> bytes:
+    rendered_md = contract_renderer.get_template("contract_template.md.j2").render(**TEMPLATE_CONTEXT)
+    return contract_renderer.render_markdown_pdf(rendered_md)
+
+
+def measure(fn, n: int) -> dict:
+    fn(0)   # warm-up (imports, first compile)
+    samples = []
+    for i in range(n):
+        started = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "contracts_per_sec": round(1000 / statistics.fmean(samples), 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Contract render micro-benchmark")
+    parser.add_argument("--contracts", type=int, default=300)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = {
+        "contracts": args.contracts,
+        "markdown_template": {
+            "before": measure(lambda i: legacy_markdown_pdf(), args.contracts),
+            "after": measure(lambda i: cached_markdown_pdf(), args.contracts),
+        },
+        "terms": {
+            "before": measure(lambda i: legacy_terms_pdf(sample_terms(i)), args.contracts),
+            "after": measure(lambda i: contract_renderer.render_contract_pdf(sample_terms(i)), args.contracts),
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Contract rendering: {args.contracts} contracts per case")
+        for case in ("markdown_template", "terms"):
+            for phase in ("before", "after"):
+                r = report[case][phase]
+                print(
+                    f"  {case:<18} {phase:<6} mean {r['mean_ms']:>7} ms  "
+                    f"p95 {r['p95_ms']:>7} ms  {r['contracts_per_sec']:>8} contracts/s"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# backend/app/scripts/bench_mail_delivery.py
+#
+# Throughput benchmark for the outbox delivery worker.
+#
+# Runs the real drain loop against an in-memory PostgREST stand-in and a local
+# aiosmtpd server, once with pooled multi-message sessions and once with a
+# fresh connection per message, and reports messages/s and connection reuse.
+#
+# Usage (from backend/):
+#   python -m app.scripts.bench_mail_delivery --messages 5000 --domains 20 --workers 8
+
+import argparse
+import json
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.utils.postgrest_stub import PostgrestStore, create_app
+from app.utils.smtp_stub import SMTPStub
+from app.utils.stub_server import StubServer, _free_port
+
+STUB_SERVICE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.c3R1Yg"
+
+
+def run(store, smtp, args, pooled: bool) -> dict:
+    from app.services import mail_delivery_service as mail
+
+    store.tables["outbox"] = []
+    mail.enqueue_emails([
+        {
+            "to_email": f"creator{i}@domain{i % args.domains}.example",
+            "subject": f"Collaboration opportunity #{i}",
+            "body": "Hi there,\n\nWe'd love to work with you on our next campaign.\n",
+        }
+        for i in range(args.messages)
+    ])
+
+    metrics = mail.DeliveryMetrics()
+    pool = mail.SMTPConnectionPool(
+        host=smtp.hostname,
+        port=smtp.port,
+        username=None,
+        starttls=False,
+        size=args.workers,
+        max_messages=500 if pooled else 1,
+        metrics=metrics,
+    )
+    limiter = mail.DomainRateLimiter(rate=args.domain_rate, burst=args.domain_rate * 2)
+    connections_before = smtp.connections
+
+    started = time.perf_counter()
+    while any(r["status"] in ("Queued", "Sending") for r in store.table("outbox")):
+        if mail.drain_outbox_once(
+            pool,
+            limiter,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            session_size=args.session_size if pooled else 1,
+        ) == 0:
+            time.sleep(0.01)   # waiting for retry backoff
+    elapsed = time.perf_counter() - started
+    pool.close()
+
+    snapshot = metrics.snapshot()
+    snapshot["messages_per_sec"] = round(snapshot["sent"] / elapsed, 1)
+    snapshot["elapsed_s"] = round(elapsed, 3)
+    snapshot["server_connections"] = smtp.connections - connections_before
+    return snapshot
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Outbox delivery throughput benchmark")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--domains", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--session-size", type=int, default=50)
+    parser.add_argument("--domain-rate", type=float, default=0, help="msgs/s per domain (0 = unlimited)")
+    parser.add_argument("--smtp-latency-ms", type=float, default=1.0)
+    parser.add_argument("--transient-failure-rate", type=float, default=0.01)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    store = PostgrestStore()
+    with StubServer(create_app(store)) as db_server, SMTPStub(
+        port=_free_port("127.0.0.1"),
+        latency_ms=args.smtp_latency_ms,
+        transient_failure_rate=args.transient_failure_rate,
+        seed=7,
+    ) as smtp:
+        # Must be set before the service (and its module-level client/config) is imported
+        os.environ["SUPABASE_URL"] = db_server.url
+        os.environ["SUPABASE_SERVICE_KEY"] = STUB_SERVICE_KEY
+        os.environ["OUTBOX_BACKOFF_SECONDS"] = "0.05"
+
+        report = {
+            "messages": args.messages,
+            "workers": args.workers,
+            "connection_per_message": run(store, smtp, args, pooled=False),
+            "pooled_sessions": run(store, smtp, args, pooled=True),
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Outbox delivery: {args.messages} messages, {args.domains} domains, {args.workers} workers")
+        for name in ("connection_per_message", "pooled_sessions"):
+            r = report[name]
+            print(
+                f"  {name:<24} {r['messages_per_sec']:>8} msg/s  "
+                f"reuse {r['connection_reuse_ratio']:.3f}  "
+                f"connections {r['connections_opened']}  retried {r['retried']}  failed {r['failed']}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# backend/app/scripts/bench_metrics.py
+#
+# Benchmark for the metrics store (app/utils/metrics_store.py): ingests
+# `--days` of per-minute data points for `--influencers` creators of one
+# campaign, compacting size tiers as ingest does (unless --no-compact), then
+# times chart queries at each rollup level and a cold reload of the segments
+# from disk (merged segments load from their rollup snapshots).
+#
+# Usage (from backend/):
+#   python -m app.scripts.bench_metrics --days 90 --influencers 20
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.services.metrics_service import pick_resolution
+from app.utils.metrics_store import RESOLUTIONS, MetricsStore
+
+DAY = 86400
+
+
+def _timed(fn, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Metrics store benchmark")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--influencers", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=50000, help="points per ingested segment")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--fanin", type=int, default=8, help="segments merged per size tier")
+    parser.add_argument("--no-compact", action="store_true", help="keep every ingested segment")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="metrics_bench_")
+    try:
+        store = MetricsStore(root, fanin=args.fanin)
+        start = 1_700_000_000 - 1_700_000_000 % DAY
+        end = start + args.days * DAY
+        influencers = [f"i{k}" for k in range(args.influencers)]
+
+        compactions = []
+
+        def append(points) -> int:
+            stored = store.append(points)
+            if not args.no_compact and store.compaction_due():
+                compact_started = time.perf_counter()
+                store.compact()
+                compactions.append(time.perf_counter() - compact_started)
+            return stored
+
+        started = time.perf_counter()
+        batch = []
+        total = 0
+        for ts in range(start, end, 60):
+            for k, influencer_id in enumerate(influencers):
+                batch.append(("c1", influencer_id, "views", ts, float(k + (ts - start) // 60)))
+            if len(batch) >= args.batch:
+                total += append(batch)
+                batch = []
+        total += append(batch)
+        ingest_s = time.perf_counter() - started
+        print(f"ingested {total} points in {ingest_s:.1f}s ({total / ingest_s:,.0f} points/s)")
+        if compactions:
+            print(f"{len(compactions)} compactions: slowest {max(compactions):.2f}s, total {sum(compactions):.2f}s")
+
+        ranges = [("1 day", DAY), ("1 week", 7 * DAY), ("30 days", 30 * DAY), (f"{args.days} days", args.days * DAY)]
+        for label, span in ranges:
+            if span > args.days * DAY:
+                continue
+            resolution = pick_resolution(end - span, end)
+            ms, buckets = _timed(lambda: store.query("c1", "views", end - span, end, resolution), args.runs)
+            print(f"{label:>9} @ {resolution:<6}: {len(buckets):5d} buckets in {ms:7.2f} ms")
+
+        ms, buckets = _timed(lambda: store.query("c1", "views", start, end, "minute"), 3)
+        print(f"full range @ minute: {len(buckets)} buckets in {ms:.1f} ms (what auto resolution avoids)")
+
+        segments = [n for n in os.listdir(root) if n.endswith(".seg")]
+        size = sum(os.path.getsize(os.path.join(root, n)) for n in segments)
+        print(f"segments: {len(segments)} files, {size / total:.1f} bytes/point")
+        started = time.perf_counter()
+        reloaded = MetricsStore(root)
+        print(f"cold load of all segments: {time.perf_counter() - started:.2f}s")
+        for resolution in RESOLUTIONS:
+            if reloaded.query("c1", "views", start, end, resolution) != store.query("c1", "views", start, end, resolution):
+                print(f"reloaded {resolution} rollups do not match the ingested points")
+                return 1
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
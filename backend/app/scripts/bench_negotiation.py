@@ -0,0 +1,199 @@
+# backend/app/scripts/bench_negotiation.py
+#
+# Offline load simulator for the negotiation flow.
+#
+# Starts an in-memory PostgREST stand-in and a stub chat-completions server,
+# points the app's module-level Supabase/OpenAI clients at them, seeds synthetic
+# campaigns/influencers, then replays many concurrent negotiation threads through
+# the real FastAPI routes (POST /api/campaign/{id}/negotiation/{influencer_id}).
+#
+# Usage (from backend/):
+#   python -m app.scripts.bench_negotiation --threads 2000 --turns 3 --concurrency 200
+#   python -m app.scripts.bench_negotiation --max-p95-ms 250 --min-turns-per-sec 100   # regression gate
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Make “app” importable when run as a plain script (same trick as index_creators_from_db.py)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.utils.llm_stub import LLMStub
+from app.utils.postgrest_stub import PostgrestStore, create_app
+from app.utils.stub_server import StubServer
+
+# The supabase client only checks that the key looks like a JWT
+STUB_SERVICE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.c3R1Yg"
+
+INFLUENCER_MESSAGES = [
+    "I can do ₹5000 per post.",
+    "Could we settle at ₹4200 per post if I add two stories?",
+    "My standard rate is ₹6000 but I'm flexible for a longer partnership.",
+    "Happy to go ahead at the current rate, please send the contract.",
+]
+
+
+def seed_store(store: PostgrestStore, threads: int, influencers_per_campaign: int) -> List[Dict[str, str]]:
+    """
+    Creates one business, ceil(threads / influencers_per_campaign) campaigns and
+    `threads` influencers, each linked to one campaign. Returns the
+    (campaign_id, influencer_id) pairs to negotiate on.
+    """
+    business = store.insert_row("business", {"name": "Bench Brand", "email": "bench@example.com"})
+    pairs = []
+    campaign = None
+    for i in range(threads):
+        if i % influencers_per_campaign == 0:
+            campaign = store.insert_row(
+                "campaign",
+                {
+                    "title": f"Bench Campaign {i // influencers_per_campaign}",
+                    "business_id": business["id"],
+                    "budget": 50000,
+                    "deliverables": ["Instagram Reel", "Instagram Story", "YouTube Short"],
+                    "proposed_dates": "[2025-06-01,2025-06-30)",
+                    "status": "Active",
+                },
+            )
+        influencer = store.insert_row(
+            "influencer",
+            {
+                "name": f"Bench Creator {i}",
+                "username": f"bench_creator_{i}",
+                "email": f"creator{i}@example.com",
+                "rate_per_post": 4000 + (i % 7) * 1000,
+            },
+        )
+        store.insert_row(
+            "campaign_influencer",
+            {"campaign_id": campaign["id"], "influencer_id": influencer["id"], "status": "Accepted"},
+        )
+        pairs.append({"campaign_id": campaign["id"], "influencer_id": influencer["id"]})
+    return pairs
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_threads(app, pairs: List[Dict[str, str]], turns: int, concurrency: int) -> Dict:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def negotiate(pair: Dict[str, str], idx: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                for turn in range(turns):
+                    message = INFLUENCER_MESSAGES[(idx + turn) % len(INFLUENCER_MESSAGES)]
+                    started = time.perf_counter()
+                    resp = await client.post(
+                        f"/api/campaign/{pair['campaign_id']}/negotiation/{pair['influencer_id']}",
+                        json={"sender_type": "influencer", "message": message},
+                    )
+                    latencies.append((time.perf_counter() - started) * 1000.0)
+                    if resp.status_code != 201:
+                        errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(negotiate(pair, i) for i, pair in enumerate(pairs)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {"latencies_ms": latencies, "errors": errors, "elapsed_s": elapsed}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline negotiation throughput benchmark")
+    parser.add_argument("--threads", type=int, default=1000, help="synthetic negotiation threads")
+    parser.add_argument("--turns", type=int, default=3, help="influencer messages per thread")
+    parser.add_argument("--concurrency", type=int, default=200, help="threads negotiating at once")
+    parser.add_argument("--influencers-per-campaign", type=int, default=50)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="fail if p95 latency exceeds this")
+    parser.add_argument("--min-turns-per-sec", type=float, default=None, help="fail if throughput drops below this")
+    args = parser.parse_args()
+
+    store = PostgrestStore()
+    llm = LLMStub(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms, seed=args.seed)
+
+    with StubServer(create_app(store)) as db_server, StubServer(llm.create_app()) as llm_server:
+        # Must be set before the app (and its module-level clients) is imported
+        os.environ["SUPABASE_URL"] = db_server.url
+        os.environ["SUPABASE_SERVICE_KEY"] = STUB_SERVICE_KEY
+        os.environ["OPENAI_API_KEY"] = "sk-stub"
+        os.environ["OPENAI_BASE_URL"] = f"{llm_server.url}/v1"
+
+        from app.main import app
+
+        pairs = seed_store(store, args.threads, args.influencers_per_campaign)
+        store.reset_calls()
+
+        result = asyncio.run(run_threads(app, pairs, args.turns, args.concurrency))
+
+    latencies = result["latencies_ms"]
+    total_turns = len(latencies)
+    report = {
+        "threads": args.threads,
+        "turns": total_turns,
+        "concurrency": args.concurrency,
+        "errors": result["errors"],
+        "elapsed_s": round(result["elapsed_s"], 3),
+        "turns_per_sec": round(total_turns / result["elapsed_s"], 1) if result["elapsed_s"] else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "upstream_per_turn": {
+            "db_calls": round(store.total_calls() / total_turns, 2) if total_turns else 0.0,
+            "llm_calls": round(llm.calls / total_turns, 2) if total_turns else 0.0,
+            "db_breakdown": {
+                f"{method} {table}": round(count / total_turns, 2)
+                for (method, table), count in sorted(store.calls.items())
+            } if total_turns else {},
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Negotiation benchmark: {report['threads']} threads × {args.turns} turns, concurrency {args.concurrency}")
+        print(f"  turns/s:   {report['turns_per_sec']}  ({total_turns} turns in {report['elapsed_s']}s, {report['errors']} errors)")
+        lat = report["latency_ms"]
+        print(f"  latency:   p50 {lat['p50']}ms  p95 {lat['p95']}ms  p99 {lat['p99']}ms  max {lat['max']}ms")
+        up = report["upstream_per_turn"]
+        print(f"  upstream:  {up['db_calls']} DB calls/turn, {up['llm_calls']} LLM calls/turn")
+        for name, per_turn in up["db_breakdown"].items():
+            print(f"             {name}: {per_turn}/turn")
+
+    failed = result["errors"] > 0
+    if args.max_p95_ms is not None and report["latency_ms"]["p95"] > args.max_p95_ms:
+        print(f"FAIL: p95 {report['latency_ms']['p95']}ms > {args.max_p95_ms}ms")
+        failed = True
+    if args.min_turns_per_sec is not None and report["turns_per_sec"] < args.min_turns_per_sec:
+        print(f"FAIL: {report['turns_per_sec']} turns/s < {args.min_turns_per_sec}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# backend/app/scripts/bench_repository.py
+#
+# Latency benchmark for the storage backends in app/services/repository.py:
+# primary-key lookups, join-row lookups, batched in(...) loads and guarded
+# status updates (the statement campaign_state_service issues), one at a time
+# so the numbers are per-query latency.
+#
+#   sqlite    seeds a temporary database file
+#   supabase  seeds the in-memory PostgREST stand-in and goes over HTTP to it
+#   postgres  uses existing rows at DATABASE_URL; updates only with --writes
+#             (each row is flipped and flipped back)
+#
+# Usage (from backend/):
+#   python -m app.scripts.bench_repository --backend sqlite --rows 5000
+#   DATABASE_URL=postgres://... python -m app.scripts.bench_repository --backend postgres
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# The supabase client only checks that the key looks like a JWT
+STUB_SERVICE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.c3R1Yg"
+
+BENCH_STATUS = "Bench"
+
+
+def seed_rows(rows: int):
+    campaigns = [{"id": str(uuid.uuid4()), "title": f"Bench Campaign {k}", "budget": 50000} for k in range(max(1, rows // 50))]
+    influencers = [
+        {"id": str(uuid.uuid4()), "name": f"Bench Creator {k}", "username": f"bench_{k}", "rate_per_post": 4000}
+        for k in range(rows)
+    ]
+    links = [
+        {"campaign_id": campaigns[k % len(campaigns)]["id"], "influencer_id": inf["id"], "status": "Pending"}
+        for k, inf in enumerate(influencers)
+    ]
+    return {"campaign": campaigns, "influencer": influencers, "campaign_influencer": links}
+
+
+async def _timed(fn, samples: int):
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        await fn()
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def run(args) -> int:
+    from app.services.repository import create_repository, use_repository
+
+    repo = create_repository(args.backend)
+    use_repository(repo)
+    await repo.open()
+    try:
+        if args.backend != "postgres":
+            for table, rows in seed_rows(args.rows).items():
+                seeder = repo.seed if args.backend == "sqlite" else args.store.seed
+                seeder(table, rows)
+
+        links = await repo.select("campaign_influencer", {}, limit=args.rows)
+        if not links:
+            print("no campaign_influencer rows to benchmark against")
+            return 1
+        ids = [str(link["influencer_id"]) for link in links]
+        print(f"backend={repo.name} rows={len(links)} samples={args.samples}")
+
+        async def by_id():
+            await repo.select("influencer", {"id": random.choice(ids)})
+
+        async def join_row():
+            link = random.choice(links)
+            await repo.select("campaign_influencer", {"campaign_id": link["campaign_id"], "influencer_id": link["influencer_id"]})
+
+        async def batch():
+            await repo.select("influencer", {"id": random.sample(ids, min(args.batch, len(ids)))})
+
+        cases = [("influencer by id", by_id), ("join row", join_row), (f"{args.batch} ids in one query", batch)]
+
+        if args.backend != "postgres" or args.writes:
+            async def guarded_update():
+                link = random.choice(links)
+                key = {"campaign_id": link["campaign_id"], "influencer_id": link["influencer_id"]}
+                status = link.get("status")
+                moved = await repo.update("campaign_influencer", {"status": BENCH_STATUS}, {**key, "status": [status]})
+                if moved:
+                    await repo.update("campaign_influencer", {"status": status}, {**key, "status": [BENCH_STATUS]})
+
+            cases.append(("guarded update (x2)", guarded_update))
+
+        for label, fn in cases:
+            await fn()   # warm-up: connections, prepared statements
+            p50, p99 = await _timed(fn, args.samples)
+            print(f"{label:>22}: p50 {p50:8.1f} µs   p99 {p99:8.1f} µs")
+    finally:
+        await repo.close()
+        if args.backend == "supabase":
+            from app.services.db import close_db
+
+            await close_db()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Repository backend latency benchmark")
+    parser.add_argument("--backend", choices=["sqlite", "supabase", "postgres"], default="sqlite")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--writes", action="store_true", help="also time updates against postgres")
+    args = parser.parse_args()
+
+    server = None
+    args.store = None
+    if args.backend == "sqlite":
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        os.environ["SQLITE_PATH"] = path
+    elif args.backend == "supabase":
+        from app.utils.postgrest_stub import PostgrestStore, create_app
+        from app.utils.stub_server import StubServer
+
+        args.store = PostgrestStore()
+        server = StubServer(create_app(args.store))
+        server.start()
+        os.environ["SUPABASE_URL"] = server.url
+        os.environ["SUPABASE_SERVICE_KEY"] = STUB_SERVICE_KEY
+    try:
+        return asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.stop()
+        if args.backend == "sqlite":
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(os.environ["SQLITE_PATH"] + suffix):
+                    os.remove(os.environ["SQLITE_PATH"] + suffix)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# backend/app/scripts/bench_responses.py
+#
+# Benchmark for response rendering and compression on the largest list
+# endpoints (GET /api/influencer/ and /api/campaign/ at the maximum page size).
+#
+# 1. Serialization of one page: FastAPI's default path (jsonable_encoder +
+#    json.dumps) against ORJSONResponse (app/utils/responses.py).
+# 2. Bytes on the wire and compression time for identity, gzip and brotli
+#    (app/utils/compression.py).
+# 3. The same pages requested through the app, against the in-memory
+#    PostgREST stand-in, with each Accept-Encoding.
+#
+# Usage (from backend/):
+#   python -m app.scripts.bench_responses --rows 2000 --runs 20
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.utils.postgrest_stub import PostgrestStore, create_app
+from app.utils.stub_server import StubServer
+
+# The supabase client only checks that the key looks like a JWT
+STUB_SERVICE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.c3R1Yg"
+
+CATEGORIES = ["fashion", "beauty", "tech", "travel", "fitness", "food", "gaming", "finance"]
+
+
+def seed_store(store: PostgrestStore, rows: int) -> None:
+    business = store.insert_row("business", {"name": "Bench Brand", "email": "bench@example.com"})
+    for i in range(rows):
+        store.insert_row(
+            "influencer",
+            {
+                "name": f"Bench Creator {i}",
+                "username": f"bench_creator_{i}",
+                "email": f"creator{i}@example.com",
+                "bio": f"Creator #{i} sharing {CATEGORIES[i % 8]} content with a loyal audience.",
+                "profile_picture_url": f"https://cdn.example.com/avatars/{i}.jpg",
+                "location": {"city": "Bengaluru", "state": "Karnataka", "country": "India", "lat": 12.97, "lng": 77.59},
+                "social_media": {
+                    platform: {
+                        "handle": f"@bench_{i}",
+                        "url": f"https://{platform}.com/bench_{i}",
+                        "followers": 10000 + i * 37,
+                        "engagement_rate": round(1.5 + (i % 40) / 10, 2),
+                        "verified": i % 5 == 0,
+                    }
+                    for platform in ("instagram", "youtube", "x", "tiktok")
+                },
+                "categories": [CATEGORIES[i % 8], CATEGORIES[(i + 3) % 8]],
+                "rate_per_post": 4000 + (i % 7) * 1000,
+                "availability": "available",
+            },
+        )
+        if i % 4 == 0:
+            store.insert_row(
+                "campaign",
+                {
+                    "title": f"Bench Campaign {i}",
+                    "description": "Launch campaign for the new collection across reels, stories and shorts.",
+                    "business_id": business["id"],
+                    "campaign_type": "paid",
+                    "deliverables": ["Instagram Reel", "Instagram Story", "YouTube Short"],
+                    "budget": 50000,
+                    "proposed_dates": "[2025-06-01,2025-06-30)",
+                    "status": "Active",
+                    "platform_targets": ["instagram", "youtube"],
+                    "categories": [CATEGORIES[i % 8]],
+                    "metrics": {"target_views": 100000, "target_engagement": 4.5},
+                },
+            )
+
+
+def _median_ms(fn, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+async def run(args) -> None:
+    import httpx
+    from starlette.responses import JSONResponse
+    from fastapi.encoders import jsonable_encoder
+
+    from app.main import app
+    from app.services.db import close_db
+    from app.utils.compression import ENCODERS, compress
+    from app.utils.pagination import MAX_PAGE_LIMIT
+    from app.utils.responses import ORJSONResponse
+
+    limit = min(args.rows, MAX_PAGE_LIMIT)
+    endpoints = [("/api/influencer/", "influencers"), ("/api/campaign/", "campaigns")]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for path, key in endpoints:
+            resp = await client.get(path, params={"limit": limit}, headers={"accept-encoding": "identity"})
+            payload = resp.json()
+            print(f"\n{path}?limit={limit}: {len(payload[key])} rows")
+
+            default_ms, default_body = _median_ms(lambda: JSONResponse(jsonable_encoder(payload)).body, args.runs)
+            orjson_ms, orjson_body = _median_ms(lambda: ORJSONResponse(payload).body, args.runs)
+            print(f"  serialize  jsonable_encoder+json: {default_ms:7.2f} ms   orjson: {orjson_ms:6.2f} ms"
+                  f"   ({default_ms / orjson_ms:.1f}x)")
+
+            print(f"  {'identity':>8}: {len(orjson_body):>9,} bytes")
+            for encoding in ENCODERS:
+                ms, data = _median_ms(lambda: compress(orjson_body, encoding), args.runs)
+                print(f"  {encoding:>8}: {len(data):>9,} bytes  ({len(data) / len(orjson_body):6.1%})  in {ms:6.2f} ms")
+
+            for accept in ["identity"] + list(ENCODERS):
+                samples = []
+                wire = 0
+                for _ in range(args.runs):
+                    started = time.perf_counter()
+                    async with client.stream("GET", path, params={"limit": limit}, headers={"accept-encoding": accept}) as r:
+                        wire = len(b"".join([chunk async for chunk in r.aiter_raw()]))
+                    samples.append((time.perf_counter() - started) * 1000)
+                print(f"  GET {accept:>8}: {wire:>9,} bytes on the wire, p50 {statistics.median(samples):7.2f} ms")
+    await close_db()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Response serialization and compression benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="influencers to seed (campaigns: rows / 4)")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    store = PostgrestStore()
+    seed_store(store, args.rows)
+    server = StubServer(create_app(store))
+    server.start()
+    os.environ["SUPABASE_URL"] = server.url
+    os.environ["SUPABASE_SERVICE_KEY"] = STUB_SERVICE_KEY
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    try:
+        asyncio.run(run(args))
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# backend/app/scripts/check_payment_ledger.py
+#
+# Concurrency check for the payment ledger: many threads (or concurrent
+# requests, for the async payment_service) race to create orders
+# against the same (campaign, influencer) link and the ordered total must never
+# exceed the agreed rate. Runs against the SQLite stand-in
+# (app/utils/sqlite_ledger.py) and against the real payment_service pointed at
+# the in-memory PostgREST stand-in. Exits 1 if any invariant is violated.
+#
+# Usage (from backend/):
+#   python -m app.scripts.check_payment_ledger --threads 32 --orders 400
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.utils.postgrest_stub import PostgrestStore, create_app
+from app.utils.sqlite_ledger import SQLiteLedger
+from app.utils.stub_server import StubServer
+
+STUB_SERVICE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.c3R1Yg"
+AGREED_TOTAL = 1000.0
+ORDER_AMOUNT = 7.0
+
+
+def race(create_order, threads: int, orders: int) -> int:
+    """Returns how many orders were accepted."""
+    def attempt(_):
+        try:
+            create_order()
+            return 1
+        except (RuntimeError, ValueError):
+            return 0
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return sum(pool.map(attempt, range(orders)))
+
+
+async def race_async(create_order, concurrency: int, orders: int) -> int:
+    """race() for coroutine functions: at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def attempt():
+        async with semaphore:
+            try:
+                await create_order()
+                return 1
+            except (RuntimeError, ValueError):
+                return 0
+
+    return sum(await asyncio.gather(*(attempt() for _ in range(orders))))
+
+
+def check(name: str, accepted: int, pending_total: float) -> bool:
+    ordered = accepted * ORDER_AMOUNT
+    expected = int(AGREED_TOTAL // ORDER_AMOUNT)
+    ok = ordered <= AGREED_TOTAL and accepted == expected and abs(pending_total - ordered) < 1e-6
+    print(
+        f"  {name:<10} accepted {accepted} (expected {expected})  "
+        f"ordered {ordered:.2f} / {AGREED_TOTAL:.2f}  ledger pending {pending_total:.2f}  "
+        f"{'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Payment ledger concurrency check")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=400)
+    args = parser.parse_args()
+    print(f"Payment ledger: {args.orders} orders of {ORDER_AMOUNT} from {args.threads} threads, agreed {AGREED_TOTAL}")
+    results = []
+
+    # 1) SQLite stand-in
+    ledger = SQLiteLedger()
+    ledger.add_link("c1", "i1", AGREED_TOTAL)
+    accepted = race(
+        lambda: ledger.create_payment_order("c1", "i1", ORDER_AMOUNT, f"order_{uuid.uuid4().hex}"),
+        args.threads,
+        args.orders,
+    )
+    results.append(check("sqlite", accepted, ledger.balance("c1", "i1")["pending_total"]))
+    os.remove(ledger.path)
+
+    # 2) payment_service over PostgREST (RPC + trigger mirrors)
+    store = PostgrestStore()
+    store.seed("campaign_influencer", [{"campaign_id": "c1", "influencer_id": "i1", "rate_per_post": AGREED_TOTAL}])
+    with StubServer(create_app(store)) as db_server:
+        # Must be set before the service (and its module-level client) is imported
+        os.environ["SUPABASE_URL"] = db_server.url
+        os.environ["SUPABASE_SERVICE_KEY"] = STUB_SERVICE_KEY
+        from app.services import payment_service
+        from app.services.db import close_db
+
+        async def run_orders():
+            try:
+                accepted = await race_async(
+                    lambda: payment_service.create_mock_order("c1", "i1", ORDER_AMOUNT),
+                    args.threads,
+                    args.orders,
+                )
+                return accepted, await payment_service.get_payment_balance("c1", "i1")
+            finally:
+                await close_db()
+
+        accepted, balance = asyncio.run(run_orders())
+        results.append(check("postgrest", accepted, balance["pending_total"]))
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,14 +14,14 @@ if project_root not in sys.path:
 
 # Now “import app.services.supabase_client” will work, because “app/” is found under project_root/backend/app/.
 from app.utils.es_client import es      # if es_client is at backend/app/utils/es_client.py
-from app.services.influencer_service import list_influencers
+from app.services.influencer_service import iter_influencers
 
 import asyncio
 
 async def main():
-    influencers = list_influencers() or []
-    print(f"Fetched {len(influencers)} influencers from Supabase.")
-    for infl in influencers:
+    count = 0
+    async for infl in iter_influencers():
+        count += 1
         doc_id = str(infl.get("id", ""))
         if not doc_id:
             print("Skipping a record without an 'id':", infl)
@@ -31,7 +31,7 @@ async def main():
             print(f"Indexed influencer {doc_id}")
         except Exception as e:
             print(f"Error indexing influencer {doc_id}:", e)
-    print("Finished indexing influencers from Supabase into Elasticsearch.")
+    print(f"Finished indexing {count} influencers from Supabase into Elasticsearch.")
 
 if __name__ == "__main__":
     asyncio.run(main())
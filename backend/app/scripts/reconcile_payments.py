@@ -0,0 +1,47 @@
+# backend/app/scripts/reconcile_payments.py
+#
+# Reconcile the payments table against campaign_influencer and payment_ledger
+# (see app/services/reconciliation_service.py) and write a JSON Lines report.
+# Abandoned Pending payments (older than PENDING_PAYMENT_TTL_HOURS) are
+# expired first, releasing the balance they reserved (--no-expire to skip).
+# Exits 1 if any issue was found, so it can run from cron / CI.
+#
+# Usage (from backend/):
+#   python -m app.scripts.reconcile_payments --output recon.jsonl --stale-hours 24
+
+import argparse
+import json
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.services.reconciliation_service import (
+    RECON_PAGE_SIZE,
+    STALE_PENDING_HOURS,
+    reconcile_payments,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Payment reconciliation")
+    parser.add_argument("--output", default=None, help="report path (default: RECON_REPORT_DIR)")
+    parser.add_argument("--page-size", type=int, default=RECON_PAGE_SIZE)
+    parser.add_argument("--stale-hours", type=float, default=STALE_PENDING_HOURS)
+    parser.add_argument("--no-expire", action="store_true", help="report abandoned Pending payments without expiring them")
+    args = parser.parse_args()
+
+    summary = reconcile_payments(
+        page_size=args.page_size,
+        stale_pending_hours=args.stale_hours,
+        report_path=args.output,
+        expire_pending=not args.no_expire,
+    )
+    print(json.dumps(summary, indent=2))
+    return 1 if any(summary["issues"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# backend/app/scripts/run_outbox_worker.py
+#
+# Long-running mail delivery worker: drains the `outbox` table over pooled SMTP
+# connections (see app/services/mail_delivery_service.py).
+# Configure with SMTP_HOST / SMTP_PORT / SMTP_USER / SMTP_PASSWORD / SMTP_POOL_SIZE.
+#
+# Usage (from backend/):
+#   python -m app.scripts.run_outbox_worker
+
+import os
+import signal
+import sys
+import threading
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.services.mail_delivery_service import run_outbox_worker
+
+
+def main():
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    print("Outbox worker started.")
+    metrics = run_outbox_worker(stop_event=stop)
+    print("Outbox worker stopped:", metrics.snapshot())
+
+
+if __name__ == "__main__":
+    main()
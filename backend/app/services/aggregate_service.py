@@ -0,0 +1,70 @@
+# backend/app/services/aggregate_service.py
+#
+# Loads campaign aggregates (campaign + business + join rows + influencers)
+# with a single PostgREST embedded-resource select instead of one query per
+# entity, and returns them as typed records (app/models/aggregates.py).
+
+from typing import Iterable, List, Optional
+
+from app.models.aggregates import CampaignRecord, RosterEntry
+from app.services.db import db
+
+BUSINESS_FIELDS = "name, email, phone, website_url"
+INFLUENCER_FIELDS = "id, name, username, email, profile_picture_url"
+JOIN_FIELDS = "influencer_id, status, rate_per_post, agreed_rate_per_post, final_deliverable_details"
+
+CAMPAIGN_AGGREGATE_SELECT = (
+    "id, title, budget, deliverables, proposed_dates, business_id, "
+    f"business({BUSINESS_FIELDS}), "
+    f"campaign_influencer({JOIN_FIELDS}, influencer({INFLUENCER_FIELDS}))"
+)
+
+
+async def load_campaign_aggregate(
+    campaign_id: str,
+    influencer_ids: Optional[Iterable[str]] = None,
+    statuses: Optional[Iterable[str]] = None,
+) -> Optional[CampaignRecord]:
+    """
+    One HTTP call: the campaign row with its business and its
+    campaign_influencer rows (each with the influencer embedded), optionally
+    restricted to `influencer_ids` and/or join-row `statuses`.
+    Returns None if the campaign does not exist.
+    """
+    query = db().table("campaign").select(CAMPAIGN_AGGREGATE_SELECT).eq("id", campaign_id)
+    if influencer_ids is not None:
+        query = query.in_("campaign_influencer.influencer_id", [str(i) for i in influencer_ids])
+    if statuses is not None:
+        query = query.in_("campaign_influencer.status", list(statuses))
+    resp = await query.execute()
+    if resp is None or getattr(resp, "error", None) or not resp.data:
+        return None
+    return CampaignRecord.model_validate(resp.data[0])
+
+
+async def load_campaign_roster(campaign_id: str) -> List[RosterEntry]:
+    """
+    One HTTP call: every campaign_influencer row for the campaign with the
+    influencer's basic info embedded.
+    """
+    resp = await (
+        db().table("campaign_influencer")
+        .select("status, influencer(id, name, profile_picture_url)")
+        .eq("campaign_id", campaign_id)
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None):
+        return []
+
+    roster: List[RosterEntry] = []
+    for jr in resp.data or []:
+        influencer = jr.get("influencer")
+        if not influencer:
+            continue
+        roster.append(RosterEntry(
+            id=influencer["id"],
+            name=influencer.get("name"),
+            profile_picture_url=influencer.get("profile_picture_url"),
+            invite_status=jr.get("status") or "Pending",
+        ))
+    return roster
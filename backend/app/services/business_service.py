@@ -1,57 +1,98 @@
 # backend/app/services/business_services.py
 
-from app.services.supabase_client import supabase
-from typing import List, Dict, Optional
+from app.services.dataloader import forget, load
+from app.services.db import db
+from app.utils.entity_cache import EntityCache
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, paginate, select_list
+from typing import Any, List, Dict, Optional
 
 
-def get_business_by_id(business_id: str) -> Optional[Dict]:
-    resp = (
-        supabase
-        .table("business")
-        .select("*")
-        .eq("id", business_id)
-        .single()
-        .execute()
-    )
-    return resp.data if resp and not getattr(resp, "error", None) else None
+_businesses = EntityCache("business")
 
 
-def list_businesses() -> List[Dict]:
-    resp = supabase.table("business").select("*").execute()
-    return resp.data or []
+async def _load_business(business_id: str) -> Optional[Dict]:
+    return await load("business", business_id)
 
 
-def create_business(data: Dict) -> Optional[Dict]:
-    resp = supabase.table("business").insert(data).single().execute()
-    return resp.data if resp and not getattr(resp, "error", None) else None
+async def get_business_by_id(business_id: str, updated_at: Optional[str] = None) -> Optional[Dict]:
+    return await _businesses.get_current(str(business_id), _load_business, "updated_at", updated_at)
+
+
+async def get_business_version(business_id: str) -> Optional[Dict]:
+    """
+    { id, updated_at } of one business, or None (conditional GET probe).
+    """
+    resp = await db().table("business").select("id, updated_at").eq("id", business_id).limit(1).execute()
+    if resp is None or getattr(resp, "error", None) or not resp.data:
+        return None
+    return resp.data[0]
 
 
-def update_business(business_id: str, data: Dict) -> Optional[Dict]:
-    resp = (
-        supabase
+async def list_businesses(limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None, fields: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One page of businesses in id order: { items, next_cursor }.
+    `fields` is a comma-separated column list (all columns when omitted).
+    """
+    select = select_list(fields)
+    return await paginate(lambda: db().table("business").select(select), ("id",), limit, cursor)
+
+
+async def create_business(data: Dict) -> Optional[Dict]:
+    resp = await db().table("business").insert(data).single().execute()
+    if resp is None or getattr(resp, "error", None):
+        return None
+    if resp.data:
+        _businesses.prime(str(resp.data["id"]), resp.data)
+    return resp.data
+
+
+async def update_business(business_id: str, data: Dict) -> Optional[Dict]:
+    resp = await (
+        db()
         .table("business")
         .update(data)
         .eq("id", business_id)
         .single()
         .execute()
     )
+    _businesses.invalidate(str(business_id))
+    forget("business")
     return resp.data if resp and not getattr(resp, "error", None) else None
 
 
-def delete_business(business_id: str) -> Optional[List[Dict]]:
-    resp = supabase.table("business").delete().eq("id", business_id).execute()
+async def delete_business(business_id: str) -> Optional[List[Dict]]:
+    resp = await db().table("business").delete().eq("id", business_id).execute()
+    _businesses.invalidate(str(business_id))
+    forget("business")
     return resp.data  # If no data returned, will be [] or None
 
 
-def list_campaigns_for_business(business_id: str) -> List[Dict]:
+async def list_campaigns_for_business(
+    business_id: str,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Returns all campaigns where campaign.business_id == business_id.
+    Returns one page of campaigns where campaign.business_id == business_id:
+    { items, next_cursor }.
     """
-    resp = (
-        supabase
-        .table("campaign")
-        .select("*")
-        .eq("business_id", business_id)
-        .execute()
+    select = select_list(fields)
+    return await paginate(
+        lambda: db().table("campaign").select(select).eq("business_id", business_id),
+        ("id",),
+        limit,
+        cursor,
     )
-    return resp.data or []
+
+
+async def list_campaign_versions_for_business(
+    business_id: str,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    The page list_campaigns_for_business() would return, with only id and
+    updated_at selected (conditional GET probe).
+    """
+    return await list_campaigns_for_business(business_id, limit, cursor, "id,updated_at")
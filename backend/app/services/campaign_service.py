@@ -1,36 +1,68 @@
 # backend/app/services/campaign_services.py
 
 from typing import Optional, List, Dict, Any
-from app.services.supabase_client import supabase
+from app.services.dataloader import forget, load
+from app.services.db import db
+from app.services.aggregate_service import load_campaign_roster
+from app.services.campaign_state_service import transition
+from app.services.profile_service import ID_CHUNK_SIZE
+from app.utils.entity_cache import EntityCache
+from app.utils.keyset import iter_keyset_async
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, paginate, select_list
+
+# Join rows read per page when diffing an invite list
+SYNC_PAGE_SIZE = 1000
+MAX_BULK_INVITES = 5000
+
+
+_campaigns = EntityCache("campaign")
 
 
 # ----- Campaign CRUD Operations -----
 
 
-def get_campaign_by_id(campaign_id: str) -> Optional[Dict[str, Any]]:
+async def _load_campaign(campaign_id: str) -> Optional[Dict[str, Any]]:
+    return await load("campaign", campaign_id)
+
+
+async def get_campaign_by_id(campaign_id: str, updated_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
-    Fetch a single campaign by its primary key.
+    Fetch a single campaign by its primary key (through the entity cache).
+    Pass the `updated_at` from get_campaign_version() to skip a cached copy
+    older than that.
     """
-    resp = (
-        supabase
-        .table("campaign")
-        .select("*")
-        .eq("id", campaign_id)
-        .single()
-        .execute()
-    )
-    return resp.data if resp and not getattr(resp, "error", None) else None
+    return await _campaigns.get_current(str(campaign_id), _load_campaign, "updated_at", updated_at)
 
 
-def list_campaigns() -> List[Dict[str, Any]]:
+async def get_campaign_version(campaign_id: str) -> Optional[Dict[str, Any]]:
     """
-    Return all campaigns (no filtering).
+    { id, updated_at } of one campaign, or None: the cheap probe behind
+    conditional GETs.
     """
-    resp = supabase.table("campaign").select("*").execute()
-    return resp.data or []
+    resp = await db().table("campaign").select("id, updated_at").eq("id", campaign_id).limit(1).execute()
+    if resp is None or getattr(resp, "error", None) or not resp.data:
+        return None
+    return resp.data[0]
+
+
+async def list_campaigns(limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None, fields: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return one page of campaigns (no filtering) in id order: { items, next_cursor }.
+    `fields` is a comma-separated column list (all columns when omitted).
+    """
+    select = select_list(fields)
+    return await paginate(lambda: db().table("campaign").select(select), ("id",), limit, cursor)
+
+
+async def list_campaign_versions(limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    The page list_campaigns(limit, cursor) would return, with only id and
+    updated_at selected (conditional GET probe).
+    """
+    return await list_campaigns(limit, cursor, "id,updated_at")
 
 
-def create_campaign(data: Dict[str, Any], influencer_ids: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+async def create_campaign(data: Dict[str, Any], influencer_ids: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
     """
     Inserts a new campaign row. 
     Expects data["proposed_dates"] = {"start_date": "...", "end_date": "..."} → converts to a Postgres daterange.
@@ -43,11 +75,12 @@ def create_campaign(data: Dict[str, Any], influencer_ids: Optional[List[str]] =
         end = pd.get("end_date")
         insert_data["proposed_dates"] = f"[{start},{end}]"
 
-    resp = supabase.table("campaign").insert(insert_data).execute()
+    resp = await db().table("campaign").insert(insert_data).execute()
     if not resp or not resp.data:
         return None
 
     created_campaign = resp.data[0]
+    _campaigns.prime(str(created_campaign["id"]), created_campaign)
     campaign_id = created_campaign.get("id")
 
     if influencer_ids:
@@ -61,12 +94,12 @@ def create_campaign(data: Dict[str, Any], influencer_ids: Optional[List[str]] =
                 "payment_status": False,
                 "performance": None
             })
-        supabase.table("campaign_influencer").insert(rows).execute()
+        await db().table("campaign_influencer").insert(rows).execute()
 
     return created_campaign
 
 
-def update_campaign(
+async def update_campaign(
     campaign_id: str,
     data: Dict[str, Any],
     influencer_ids: Optional[List[str]] = None
@@ -84,140 +117,135 @@ def update_campaign(
         end = pd.get("end_date")
         update_data["proposed_dates"] = f"[{start},{end}]"
 
-    resp = (
-        supabase
+    resp = await (
+        db()
         .table("campaign")
         .update(update_data)
         .eq("id", campaign_id)
         .execute()
     )
+    _campaigns.invalidate(str(campaign_id))
+    forget("campaign")
     if not resp or not resp.data:
         return None
 
     updated_campaign = resp.data[0]
 
     if influencer_ids is not None:
-        # Delete all existing join rows for this campaign
-        supabase.table("campaign_influencer").delete().eq("campaign_id", campaign_id).execute()
-
-        # Insert new join rows with status = "Pending"
-        rows = []
-        for infl_id in influencer_ids:
-            rows.append({
-                "campaign_id": campaign_id,
-                "influencer_id": infl_id,
-                "status": "Pending",
-                "deliverables_submitted": {},
-                "payment_status": False,
-                "performance": None
-            })
-        if rows:
-            supabase.table("campaign_influencer").insert(rows).execute()
+        await sync_campaign_influencers(campaign_id, influencer_ids)
 
     return updated_campaign
 
 
-def delete_campaign(campaign_id: str) -> List[Dict[str, Any]]:
+async def sync_campaign_influencers(campaign_id: str, influencer_ids: List[str]) -> Dict[str, Any]:
+    """
+    Makes the campaign's invite list exactly `influencer_ids` by diffing against
+    the existing join rows: new influencers are bulk-inserted as "Pending",
+    missing ones are bulk-deleted, and everyone else keeps their row (status,
+    negotiated terms, payment state) untouched.
+    Returns { added: [ids], removed: [ids], unchanged: int }.
+    """
+    wanted = [str(i) for i in dict.fromkeys(influencer_ids)]
+    existing = {
+        str(row["influencer_id"])
+        async for row in iter_keyset_async(
+            lambda: db().table("campaign_influencer")
+            .select("influencer_id")
+            .eq("campaign_id", campaign_id),
+            ("influencer_id",),
+            SYNC_PAGE_SIZE,
+        )
+    }
+    wanted_set = set(wanted)
+    added = [i for i in wanted if i not in existing]
+    removed = sorted(existing - wanted_set)
+
+    if added:
+        rows = [_pending_invite_row(campaign_id, infl_id) for infl_id in added]
+        # ignore_duplicates: a concurrent invite of the same influencer is not an error
+        await db().table("campaign_influencer").upsert(
+            rows,
+            on_conflict="campaign_id,influencer_id",
+            ignore_duplicates=True,
+            returning="minimal",
+        ).execute()
+
+    # Chunked only so the in.(...) filter stays within URL limits
+    for start in range(0, len(removed), ID_CHUNK_SIZE):
+        await (
+            db().table("campaign_influencer")
+            .delete(returning="minimal")
+            .eq("campaign_id", campaign_id)
+            .in_("influencer_id", removed[start : start + ID_CHUNK_SIZE])
+            .execute()
+        )
+    forget("campaign_influencer")
+
+    return {
+        "added": added,
+        "removed": removed,
+        "unchanged": len(existing & wanted_set),
+    }
+
+
+async def delete_campaign(campaign_id: str) -> List[Dict[str, Any]]:
     """
     Deletes all campaign_influencer rows first, then deletes the campaign row.
     Returns the deleted campaign row(s) or [] if none.
     """
-    supabase.table("campaign_influencer").delete().eq("campaign_id", campaign_id).execute()
-    resp = supabase.table("campaign").delete().eq("id", campaign_id).execute()
+    await db().table("campaign_influencer").delete().eq("campaign_id", campaign_id).execute()
+    forget("campaign_influencer")
+    resp = await db().table("campaign").delete().eq("id", campaign_id).execute()
+    _campaigns.invalidate(str(campaign_id))
+    forget("campaign")
     return resp.data or []
 
 
 # ----- Campaign‐Influencer (Join Table) Read Operations -----
 
 
-def get_campaigns_for_influencer(influencer_id: str) -> List[Dict[str, Any]]:
+async def get_campaigns_for_influencer(
+    influencer_id: str,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Returns all campaigns (with invite_status) for a given influencer.
-    Merge the join‐table status into each campaign under "invite_status".
+    Returns one page of campaigns (with invite_status) for a given influencer:
+    { items, next_cursor }, ordered by campaign id.
+    The campaign rows are embedded in the join-table query and the join-table
+    status is merged into each campaign under "invite_status".
     """
-    # 1) Query join‐table for (campaign_id, status)
-    ji_resp = (
-        supabase.table("campaign_influencer")
-        .select("campaign_id, status")
-        .eq("influencer_id", influencer_id)
-        .execute()
+    select = f"campaign_id, status, campaign({select_list(fields)})"
+    page = await paginate(
+        lambda: db().table("campaign_influencer").select(select).eq("influencer_id", influencer_id),
+        ("campaign_id",),
+        limit,
+        cursor,
     )
-    if ji_resp is None or getattr(ji_resp, "error", None):
-        raise RuntimeError(f"DB error when querying join table: {ji_resp.error.message if ji_resp and hasattr(ji_resp,'error') else 'None returned'}")
-
-    join_rows = ji_resp.data or []
-    if not join_rows:
-        return []
-
-    status_map: Dict[str, str] = {}
-    campaign_ids: List[str] = []
-    for jr in join_rows:
-        cid = jr.get("campaign_id")
-        st  = jr.get("status", "Pending")
-        if cid:
-            campaign_ids.append(cid)
-            status_map[cid] = st
-
-    # 2) Fetch those campaigns
-    c_resp = (
-        supabase.table("campaign")
-        .select("*")
-        .in_("id", campaign_ids)
-        .execute()
-    )
-    if c_resp is None or getattr(c_resp, "error", None):
-        raise RuntimeError(f"DB error when querying campaigns: {c_resp.error.message if c_resp and hasattr(c_resp,'error') else 'None returned'}")
-
-    campaigns = c_resp.data or []
-    result: List[Dict[str, Any]] = []
-    for camp in campaigns:
-        cid = camp.get("id")
-        merged = {**camp, "invite_status": status_map.get(cid, "Pending")}
-        result.append(merged)
+    page["items"] = [
+        {**jr["campaign"], "invite_status": jr.get("status") or "Pending"}
+        for jr in page["items"]
+        if jr.get("campaign")
+    ]
+    return page
 
-    return result
 
-
-def list_influencers_for_campaign(campaign_id: str) -> List[Dict[str, Any]]:
+async def list_influencers_for_campaign(campaign_id: str) -> List[Dict[str, Any]]:
     """
     Returns a list of the invited influencers for this campaign, each with:
       { id, name, profile_picture_url, invite_status }.
+    The influencer rows are embedded in the join-table query (one round trip).
     """
-    join_rows = (
-        supabase.table("campaign_influencer")
-        .select("influencer_id, status")
-        .eq("campaign_id", campaign_id)
-        .execute()
-    )
-    if join_rows is None or getattr(join_rows, "error", None):
-        return []
-
-    result: List[Dict[str, Any]] = []
-    for jr in join_rows.data or []:
-        infl_id = jr.get("influencer_id")
-        status  = jr.get("status", "Pending")
-        # Fetch that influencer’s basic info
-        inf_resp = (
-            supabase.table("influencer")
-            .select("id, name, profile_picture_url")
-            .eq("id", infl_id)
-            .single()
-            .execute()
-        )
-        if inf_resp is None or getattr(inf_resp, "error", None) or not inf_resp.data:
-            continue
+    return [entry.model_dump() for entry in await load_campaign_roster(campaign_id)]
+
 
-        inf_data = inf_resp.data
-        result.append({
-            "id": inf_data["id"],
-            "name": inf_data["name"],
-            "profile_picture_url": inf_data.get("profile_picture_url"),
-            "invite_status": status,
-        })
-    return result
+async def _load_join_row(campaign_id: str, influencer_id: str) -> Optional[Dict[str, Any]]:
+    # Every reader of one link shares a single load per request (dataloader)
+    return await load("campaign_influencer", (campaign_id, influencer_id), ("campaign_id", "influencer_id"))
 
 
-def get_join_row(campaign_id: str, influencer_id: str) -> Optional[Dict[str, Any]]:
+async def get_join_row(campaign_id: str, influencer_id: str) -> Optional[Dict[str, Any]]:
     """
     Returns the campaign_influencer row for this influencer+campaign, including:
       { status: str,
@@ -226,63 +254,31 @@ def get_join_row(campaign_id: str, influencer_id: str) -> Optional[Dict[str, Any
         performance: { views, likes } or other metrics
       }
     """
-    resp = (
-        supabase.table("campaign_influencer")
-        .select("status, deliverables_submitted, payment_status, performance, agreed_rate_per_post")
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .single()
-        .execute()
-    )
-    if resp is None or getattr(resp, "error", None):
+    row = await _load_join_row(campaign_id, influencer_id)
+    if row is None:
         return None
-    return resp.data
+    return {
+        k: row.get(k)
+        for k in ("status", "deliverables_submitted", "payment_status", "performance", "agreed_rate_per_post")
+    }
 
 
-def get_influencer_performance(campaign_id: str, influencer_id: str) -> Optional[Dict[str, Any]]:
+async def get_influencer_performance(campaign_id: str, influencer_id: str) -> Optional[Dict[str, Any]]:
     """
     Returns whatever JSON is stored in performance—for example:
       { "views": 1234, "likes": 56 }
     """
-    resp = (
-        supabase.table("campaign_influencer")
-        .select("performance")
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .single()
-        .execute()
-    )
-    if resp is None or getattr(resp, "error", None) or not resp.data:
+    row = await _load_join_row(campaign_id, influencer_id)
+    if row is None:
         return None
-    return resp.data.get("performance")
+    return row.get("performance")
 
 
 # ----- Campaign‐Influencer (Join Table) Write Operations -----
 
 
-def invite_influencer_to_campaign(campaign_id: str, influencer_id: str) -> bool:
-    """
-    Inserts a new row into campaign_influencer with status="Pending", if none exists.
-    Returns True if the row already existed or was successfully inserted.
-    Raises on DB errors.
-    """
-    # 1) Check if that join row already exists
-    existing = (
-        supabase.table("campaign_influencer")
-        .select("*")
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .execute()
-    )
-    if existing is None or getattr(existing, "error", None):
-        raise RuntimeError(f"DB error when checking existing invite: {existing.error.message if existing and hasattr(existing,'error') else 'None returned'}")
-
-    if existing.data and len(existing.data) > 0:
-        # Already invited or joined
-        return True
-
-    # 2) Insert new join row with defaults
-    new_row = {
+def _pending_invite_row(campaign_id: str, influencer_id: str) -> Dict[str, Any]:
+    return {
         "campaign_id": campaign_id,
         "influencer_id": influencer_id,
         "status": "Pending",
@@ -290,93 +286,71 @@ def invite_influencer_to_campaign(campaign_id: str, influencer_id: str) -> bool:
         "payment_status": False,
         "performance": None
     }
-    insert_resp = supabase.table("campaign_influencer").insert(new_row).execute()
-    if insert_resp is None or getattr(insert_resp, "error", None):
-        raise RuntimeError(f"DB error when inserting invite: {insert_resp.error.message if insert_resp and hasattr(insert_resp,'error') else 'None returned'}")
-
-    return bool(insert_resp.data)
 
 
-def accept_influencer_invitation(campaign_id: str, influencer_id: str) -> bool:
+async def invite_influencer_to_campaign(campaign_id: str, influencer_id: str) -> bool:
     """
-    Updates an existing campaign_influencer row from status="Pending" to status="Accepted".
-    Returns True if updated, False if no pending row was found.
+    Inserts a new row into campaign_influencer with status="Pending", if none exists.
+    Returns True if the row already existed or was successfully inserted.
     Raises on DB errors.
     """
-    check = (
-        supabase.table("campaign_influencer")
-        .select("status")
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .single()
-        .execute()
-    )
-    if check is None or getattr(check, "error", None):
-        raise RuntimeError(
-            f"DB error when looking up join row: "
-            f"{check.error.message if check and hasattr(check, 'error') else 'None returned'}"
-        )
+    await bulk_invite_influencers(campaign_id, [influencer_id])
+    return True
 
-    row = check.data or {}
-    if row.get("status") != "Pending":
-        return False
 
-    update = (
-        supabase.table("campaign_influencer")
-        .update({"status": "Accepted"})
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
+async def bulk_invite_influencers(campaign_id: str, influencer_ids: List[str]) -> Dict[str, List[str]]:
+    """
+    Invites every influencer in `influencer_ids` (status="Pending") with one
+    upsert; rows that already exist are left untouched (ON CONFLICT DO NOTHING),
+    so re-inviting never resets a negotiated or signed link.
+    Returns { invited: [ids newly inserted], already_invited: [ids that existed] }.
+    Raises ValueError if more than MAX_BULK_INVITES ids are given, RuntimeError on DB errors.
+    """
+    wanted = [str(i) for i in dict.fromkeys(influencer_ids)]
+    if len(wanted) > MAX_BULK_INVITES:
+        raise ValueError(f"At most {MAX_BULK_INVITES} influencers can be invited at once")
+    if not wanted:
+        return {"invited": [], "already_invited": []}
+
+    # With ignore_duplicates PostgREST only returns the rows it actually inserted
+    resp = await (
+        db().table("campaign_influencer")
+        .upsert(
+            [_pending_invite_row(campaign_id, infl_id) for infl_id in wanted],
+            on_conflict="campaign_id,influencer_id",
+            ignore_duplicates=True,
+        )
         .execute()
     )
-    if update is None or getattr(update, "error", None):
-        raise RuntimeError(
-            f"DB error when accepting invite: "
-            f"{update.error.message if update and hasattr(update, 'error') else 'None returned'}"
-        )
+    forget("campaign_influencer")
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("DB error when inserting invites")
 
-    return bool(update.data)
+    inserted = {str(row["influencer_id"]) for row in resp.data or []}
+    return {
+        "invited": [i for i in wanted if i in inserted],
+        "already_invited": [i for i in wanted if i not in inserted],
+    }
 
 
-def reject_influencer_invitation(campaign_id: str, influencer_id: str) -> bool:
+async def accept_influencer_invitation(campaign_id: str, influencer_id: str) -> bool:
     """
-    Updates an existing campaign_influencer row from status="Pending" to status="Rejected".
+    Updates an existing campaign_influencer row from status="Pending" to status="Accepted".
     Returns True if updated, False if no pending row was found.
     Raises on DB errors.
     """
-    check = (
-        supabase.table("campaign_influencer")
-        .select("status")
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .single()
-        .execute()
-    )
-    if check is None or getattr(check, "error", None):
-        raise RuntimeError(
-            f"DB error when looking up join row: "
-            f"{check.error.message if check and hasattr(check, 'error') else 'None returned'}"
-        )
-
-    row = check.data or {}
-    if row.get("status") != "Pending":
-        return False
+    return await transition(campaign_id, influencer_id, "accept") is not None
 
-    update = (
-        supabase.table("campaign_influencer")
-        .update({"status": "Rejected"})
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .execute()
-    )
-    if update is None or getattr(update, "error", None):
-        raise RuntimeError(
-            f"DB error when rejecting invite: "
-            f"{update.error.message if update and hasattr(update, 'error') else 'None returned'}"
-        )
 
-    return bool(update.data)
+async def reject_influencer_invitation(campaign_id: str, influencer_id: str) -> bool:
+    """
+    Updates an existing campaign_influencer row from status="Pending" to status="Rejected".
+    Returns True if updated, False if no pending row was found.
+    Raises on DB errors.
+    """
+    return await transition(campaign_id, influencer_id, "reject") is not None
 
-def finalize_influencer_terms(
+async def finalize_influencer_terms(
     campaign_id: str,
     influencer_id: str,
     agreed_rate: float,
@@ -387,57 +361,33 @@ def finalize_influencer_terms(
       - Set status = "Ready to Sign Contract"
       - Set rate_per_post = agreed_rate
       - Store final_deliverable_details in a JSONB field (or text column).
+    Only links that are not yet signed can be finalized.
     Returns True if exactly one row was updated.
     """
     update_data = {
-        "status": "Ready to Sign Contract",
         "agreed_rate_per_post": agreed_rate,
         # Assuming you added a text column `final_deliverable_details` to campaign_influencer
         "final_deliverable_details": deliverable_details,
     }
-    resp = (
-        supabase.table("campaign_influencer")
-        .update(update_data)
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .execute()
-    )
-    if resp and not getattr(resp, "error", None) and resp.data:
-        return True
-    return False
+    return await transition(campaign_id, influencer_id, "finalize", update_data) is not None
 
-def get_finalized_terms(campaign_id: str, influencer_id: str) -> Optional[Dict]:
+async def get_finalized_terms(campaign_id: str, influencer_id: str) -> Optional[Dict]:
     """
     Returns the agreed_rate_per_post and final_deliverable_details
     for this campaign+influencer join row. Returns None if not found.
     """
-    resp = (
-        supabase.table("campaign_influencer")
-        .select("agreed_rate_per_post, final_deliverable_details")
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .single()
-        .execute()
-    )
-    if resp and not getattr(resp, "error", None) and resp.data:
+    row = await _load_join_row(campaign_id, influencer_id)
+    if row:
         return {
-            "agreed_rate_per_post": resp.data.get("agreed_rate_per_post", 0),
-            "final_deliverable_details": resp.data.get("final_deliverable_details", ""),
+            "agreed_rate_per_post": row.get("agreed_rate_per_post", 0),
+            "final_deliverable_details": row.get("final_deliverable_details", ""),
         }
     return None
 
-def sign_contract_for_influencer(campaign_id: str, influencer_id: str) -> bool:
+async def sign_contract_for_influencer(campaign_id: str, influencer_id: str) -> bool:
     """
-    Updates campaign_influencer.status = "Signed" for the given pair.
+    Updates campaign_influencer.status = "Signed" for the given pair,
+    if it is "Ready to Sign Contract".
     Returns True if exactly one row was updated.
     """
-    resp = (
-        supabase.table("campaign_influencer")
-        .update({"status": "Signed"})
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .execute()
-    )
-    if resp and not getattr(resp, "error", None) and resp.data:
-        return True
-    return False
\ No newline at end of file
+    return await transition(campaign_id, influencer_id, "sign") is not None
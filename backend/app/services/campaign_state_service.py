@@ -0,0 +1,112 @@
+# backend/app/services/campaign_state_service.py
+#
+# State machine for campaign_influencer.status.
+#
+# Every transition is one conditional UPDATE guarded on the statuses it may
+# start from (compare-and-set): there is no read before the write, and when
+# two requests race on the same link exactly one of them sees its row come
+# back. Batch transitions move many links of a campaign with the same single
+# statement.
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.profile_service import ID_CHUNK_SIZE
+from app.services.dataloader import forget
+from app.services.repository import repository
+
+PENDING = "Pending"
+ACCEPTED = "Accepted"
+REJECTED = "Rejected"
+READY_TO_SIGN = "Ready to Sign Contract"
+SIGNED = "Signed"
+COMPLETED = "Completed"
+
+# transition name -> (statuses it may start from, status it ends in)
+TRANSITIONS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "accept": ((PENDING,), ACCEPTED),
+    "reject": ((PENDING,), REJECTED),
+    # Terms may be agreed straight from a negotiated invite and revised until signed
+    "finalize": ((PENDING, ACCEPTED, READY_TO_SIGN), READY_TO_SIGN),
+    "sign": ((READY_TO_SIGN,), SIGNED),
+    # Accepted links without a contract can still be completed directly
+    "complete": ((ACCEPTED, SIGNED), COMPLETED),
+}
+
+
+def _rule(name: str) -> Tuple[Tuple[str, ...], str]:
+    if name not in TRANSITIONS:
+        raise ValueError(f"Unknown transition '{name}'. Expected one of: {', '.join(TRANSITIONS)}")
+    return TRANSITIONS[name]
+
+
+def _guard(campaign_id: str, sources: Tuple[str, ...]) -> Dict[str, Any]:
+    # The compare-and-set condition: the link must still be in a source status
+    return {"campaign_id": campaign_id, "status": sources[0] if len(sources) == 1 else list(sources)}
+
+
+async def _guarded_update(name: str, where: Dict[str, Any], changes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    try:
+        return await repository().update("campaign_influencer", changes, where)
+    except RuntimeError as e:
+        raise RuntimeError(f"DB error when applying '{name}' transition") from e
+    finally:
+        forget("campaign_influencer")
+
+
+async def transition(
+    campaign_id: str,
+    influencer_id: str,
+    name: str,
+    changes: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Applies transition `name` to one campaign_influencer link, together with
+    any extra column `changes`, in a single conditional update.
+    Returns the updated row, or None if the link does not exist or is not in
+    a status the transition may start from.
+    Raises ValueError for an unknown transition, RuntimeError on DB errors.
+    """
+    sources, target = _rule(name)
+    rows = await _guarded_update(
+        name,
+        {**_guard(campaign_id, sources), "influencer_id": influencer_id},
+        {**(changes or {}), "status": target},
+    )
+    return rows[0] if rows else None
+
+
+async def transition_many(
+    campaign_id: str,
+    name: str,
+    influencer_ids: Optional[List[str]] = None,
+) -> Dict[str, List[str]]:
+    """
+    Applies transition `name` to many links of one campaign: the given
+    `influencer_ids`, or every link of the campaign when None (e.g. completing
+    a whole campaign). Links not in a valid source status are left as they are.
+    Returns { moved: [influencer ids], skipped: [influencer ids] }; skipped is
+    only reported when ids were given.
+    """
+    sources, target = _rule(name)
+    moved: List[str] = []
+
+    if influencer_ids is None:
+        chunks: List[Optional[List[str]]] = [None]
+        wanted: List[str] = []
+    else:
+        wanted = [str(i) for i in dict.fromkeys(influencer_ids)]
+        # Chunked only so the in.(...) filter stays within URL limits
+        chunks = [wanted[i : i + ID_CHUNK_SIZE] for i in range(0, len(wanted), ID_CHUNK_SIZE)]
+
+    for chunk in chunks:
+        where = _guard(campaign_id, sources)
+        if chunk is not None:
+            where["influencer_id"] = chunk
+        rows = await _guarded_update(name, where, {"status": target})
+        moved.extend(str(row["influencer_id"]) for row in rows)
+
+    moved_set = set(moved)
+    return {
+        "moved": moved,
+        "skipped": [i for i in wanted if i not in moved_set],
+    }
@@ -0,0 +1,93 @@
+# backend/app/services/campaign_summary_service.py
+#
+# Campaign dashboard summary: invite status counts, agreed vs paid spend,
+# budget utilization and summed performance metrics.
+#
+# The numbers come from the campaign_summary rollup (009_campaign_summary.sql),
+# which triggers keep current on every campaign_influencer / payments write,
+# so a summary is one indexed row read whatever the roster size.
+
+from typing import Any, Dict, Optional
+
+from app.services.campaign_state_service import (
+    ACCEPTED,
+    COMPLETED,
+    PENDING,
+    READY_TO_SIGN,
+    REJECTED,
+    SIGNED,
+)
+from app.services.db import db
+
+SUMMARY_STATUSES = (PENDING, ACCEPTED, REJECTED, READY_TO_SIGN, SIGNED, COMPLETED)
+
+SUMMARY_FIELDS = (
+    "influencer_count, status_counts, agreed_total, paid_total, pending_total, performance, updated_at"
+)
+
+
+def _ratio(part: float, whole: Optional[float]) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
+
+def _number(value: Any) -> float:
+    return float(value or 0)
+
+
+async def get_campaign_summary(campaign_id: str) -> Optional[Dict[str, Any]]:
+    """
+    One HTTP call: the campaign row with its campaign_summary embedded.
+    Returns None if the campaign does not exist, otherwise:
+      { campaign_id, title, budget, influencer_count,
+        status_counts: {status: n},
+        spend: { agreed_total, paid_total, pending_total, unpaid_total },
+        budget_utilization: { agreed, paid } (fractions of budget, None without a budget),
+        performance: {metric: total}, updated_at }
+    """
+    resp = await (
+        db().table("campaign")
+        .select(f"id, title, budget, campaign_summary({SUMMARY_FIELDS})")
+        .eq("id", campaign_id)
+        .limit(1)
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("DB error when loading campaign summary")
+    if not resp.data:
+        return None
+
+    campaign = resp.data[0]
+    summary = campaign.get("campaign_summary")
+    # One-to-one embeds come back as an object; tolerate the list form too
+    if isinstance(summary, list):
+        summary = summary[0] if summary else None
+    summary = summary or {}
+
+    counts = {st: 0 for st in SUMMARY_STATUSES}
+    for st, n in (summary.get("status_counts") or {}).items():
+        counts[st] = int(n)
+
+    budget = float(campaign["budget"]) if campaign.get("budget") else None
+    agreed = _number(summary.get("agreed_total"))
+    paid = _number(summary.get("paid_total"))
+    pending = _number(summary.get("pending_total"))
+
+    return {
+        "campaign_id": campaign["id"],
+        "title": campaign.get("title"),
+        "budget": budget,
+        "influencer_count": int(summary.get("influencer_count") or 0),
+        "status_counts": counts,
+        "spend": {
+            "agreed_total": agreed,
+            "paid_total": paid,
+            "pending_total": pending,
+            "unpaid_total": max(agreed - paid - pending, 0.0),
+        },
+        "budget_utilization": {
+            "agreed": _ratio(agreed, budget),
+            "paid": _ratio(paid, budget),
+        },
+        "performance": summary.get("performance") or {},
+        "updated_at": summary.get("updated_at"),
+    }
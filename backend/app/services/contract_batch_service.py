@@ -0,0 +1,212 @@
+# backend/app/services/contract_batch_service.py
+#
+# Batch contract generation for a whole campaign.
+#
+# ReportLab rendering is CPU-bound, so contracts are rendered in a shared
+# ProcessPoolExecutor (one worker per core by default) and never on the event
+# loop. The pool starts its workers with forkserver (spawn where that is not
+# available), never fork: forking the threaded server process could leave a
+# child stuck on a lock another thread held at fork time. Finished PDFs are written into a ZIP that is streamed to the client as
+# each contract completes; progress and per-contract errors are tracked on a
+# ContractBatch that can be polled while the download is running, and a
+# manifest.json summarising the batch is written as the last ZIP entry.
+
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from app.services.contract_service import (
+    contract_fingerprint,
+    load_campaign_contract_terms,
+    lookup_cached_contract,
+    render_contract_pdf,
+    store_contract_pdf,
+)
+
+CONTRACT_WORKERS = int(os.getenv("CONTRACT_WORKERS", "0")) or os.cpu_count() or 1
+CONTRACT_POOL_START_METHOD = os.getenv(
+    "CONTRACT_POOL_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+# Finished batches kept around for progress polling
+MAX_TRACKED_BATCHES = 100
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_batches: "OrderedDict[str, ContractBatch]" = OrderedDict()
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            context = multiprocessing.get_context(CONTRACT_POOL_START_METHOD)
+            if CONTRACT_POOL_START_METHOD == "forkserver":
+                # Workers fork from a server that has the renderer imported already
+                context.set_forkserver_preload(["app.utils.contract_renderer"])
+            _pool = ProcessPoolExecutor(max_workers=CONTRACT_WORKERS, mp_context=context)
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+class ContractBatch:
+    """
+    Progress of one batch: total/rendered/cached/failed counts plus the
+    error message for every contract that could not be produced.
+    """
+
+    def __init__(self, campaign_id: str):
+        self.batch_id = str(uuid.uuid4())
+        self.campaign_id = campaign_id
+        self.status = "Pending"
+        self.total = 0
+        self.rendered = 0
+        self.cached = 0
+        self.errors: Dict[str, str] = {}
+        self.contracts: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, str] = {}
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def summary(self) -> Dict[str, Any]:
+        done = self.rendered + self.cached + len(self.errors)
+        return {
+            "batch_id": self.batch_id,
+            "campaign_id": self.campaign_id,
+            "status": self.status,
+            "total": self.total,
+            "done": done,
+            "rendered": self.rendered,
+            "cached": self.cached,
+            "failed": len(self.errors),
+            "errors": dict(self.errors),
+            "elapsed_s": round((self.finished_at or time.time()) - self.started_at, 3),
+        }
+
+
+class _ZipSink:
+    """
+    Write-only file object for zipfile. Not seekable, so ZipFile falls back to
+    data descriptors and every entry can be flushed to the client right away.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _track(batch: ContractBatch) -> None:
+    _batches[batch.batch_id] = batch
+    while len(_batches) > MAX_TRACKED_BATCHES:
+        _batches.popitem(last=False)
+
+
+def get_contract_batch(batch_id: str) -> Optional[Dict[str, Any]]:
+    batch = _batches.get(batch_id)
+    return batch.summary() if batch else None
+
+
+async def start_contract_batch(
+    campaign_id: str,
+    influencer_ids: Optional[Iterable[str]] = None,
+) -> ContractBatch:
+    """
+    Loads the terms for every eligible contract on the campaign (or just
+    `influencer_ids`) and registers the batch for progress polling.
+    Raises RuntimeError if the campaign cannot be loaded.
+    """
+    contracts, errors = await load_campaign_contract_terms(campaign_id, influencer_ids)
+    batch = ContractBatch(campaign_id)
+    batch.contracts = contracts
+    batch.errors.update(errors)
+    batch.total = len(contracts) + len(errors)
+    _track(batch)
+    return batch
+
+
+def _contract_filename(terms: Dict[str, Any], influencer_id: str) -> str:
+    name = "".join(c if c.isalnum() else "_" for c in terms["influencer_name"]).strip("_")
+    return f"contract_{name or 'influencer'}_{influencer_id}.pdf"
+
+
+async def stream_contract_batch(batch: ContractBatch) -> AsyncIterator[bytes]:
+    """
+    Renders the batch's contracts in the process pool and yields the ZIP
+    archive incrementally, one entry per finished contract.
+    Contracts whose inputs are unchanged are served from the PDF cache.
+    """
+    loop = asyncio.get_running_loop()
+    batch.status = "Running"
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    pool = get_render_pool()
+
+    async def produce(influencer_id: str, terms: Dict[str, Any]):
+        # Returns (influencer_id, terms, pdf_bytes, cached, error)
+        try:
+            key = contract_fingerprint(terms)
+            pdf_bytes = await asyncio.to_thread(lookup_cached_contract, key)
+            if pdf_bytes is not None:
+                return influencer_id, terms, pdf_bytes, True, None
+            pdf_bytes = await loop.run_in_executor(pool, render_contract_pdf, terms)
+            await asyncio.to_thread(store_contract_pdf, key, pdf_bytes)
+            return influencer_id, terms, pdf_bytes, False, None
+        except Exception as e:
+            return influencer_id, terms, None, False, str(e) or type(e).__name__
+
+    tasks = [asyncio.ensure_future(produce(i, t)) for i, t in batch.contracts.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            influencer_id, terms, pdf_bytes, cached, error = await next_done
+            if error:
+                batch.errors[influencer_id] = error
+                continue
+
+            filename = _contract_filename(terms, influencer_id)
+            archive.writestr(filename, pdf_bytes)
+            batch.files[influencer_id] = filename
+            if cached:
+                batch.cached += 1
+            else:
+                batch.rendered += 1
+            yield sink.drain()
+
+        batch.status = "Completed" if not batch.errors else "Completed with errors"
+        batch.finished_at = time.time()
+        manifest = {**batch.summary(), "files": batch.files}
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Client went away (or something failed): stop queued renders
+        for task in tasks:
+            task.cancel()
+        if batch.finished_at is None:
+            batch.status = "Cancelled"
+            batch.finished_at = time.time()
@@ -1,20 +1,33 @@
 # backend/app/services/contract_service.py
 
+import asyncio
 import os
-import io
-from typing import Optional
-
-from jinja2 import Environment, FileSystemLoader
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-
-from app.services.supabase_client import supabase
-from app.services.campaign_service import get_finalized_terms
-from app.services.influencer_service import get_influencer_by_id
-from app.services.campaign_service import get_campaign_by_id
-
-
-def generate_contract(campaign_id: str, creator_id: Optional[str] = None) -> bytes:
+import json
+import hashlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.models.aggregates import CampaignInfluencerRecord, CampaignRecord
+from app.services.aggregate_service import load_campaign_aggregate
+from app.services.profile_service import resolve_profile
+from app.utils.blob_store import DiskBlobStore
+from app.utils.contract_renderer import (
+    CONTRACT_TEMPLATE_VERSION,
+    get_template,
+    render_contract_pdf,
+    render_markdown_pdf,
+)
+
+CONTRACT_CACHE_DIR = os.getenv(
+    "CONTRACT_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "contracts"),
+)
+_contract_store = DiskBlobStore(CONTRACT_CACHE_DIR, suffix=".pdf")
+
+# campaign_influencer statuses whose terms are final enough to put in a contract
+CONTRACT_ELIGIBLE_STATUSES = ("Ready to Sign Contract", "Signed", "Completed")
+
+
+async def generate_contract(campaign_id: str, creator_id: Optional[str] = None) -> bytes:
     """
     1) Load campaign, business, and influencer rows from the database
     2) Render a legally styled Markdown template via Jinja2
@@ -23,59 +36,38 @@ def generate_contract(campaign_id: str, creator_id: Optional[str] = None) -> byt
 
     # ——— 1) Fetch from Supabase ———
 
-    # a) Campaign row
-    cam_resp = (
-        supabase.table("campaign")
-        .select("title, budget, deliverables, proposed_dates, business_id")
-        .eq("id", campaign_id)
-        .single()
-        .execute()
+    # Campaign + business + this creator's join row/profile in one embedded select
+    campaign = await load_campaign_aggregate(
+        campaign_id, influencer_ids=[creator_id] if creator_id else []
     )
-    if cam_resp is None or getattr(cam_resp, "error", None) or not cam_resp.data:
+    if campaign is None:
         raise RuntimeError(f"Campaign {campaign_id} not found")
-    campaign = cam_resp.data
-    campaign_title = campaign.get("title")
-    budget = campaign.get("budget")
-    deliverables_list = campaign.get("deliverables") or []
-    # proposed_dates comes back as a string like "[2025-06-01,2025-06-15)" – convert to two parts
-    daterange = campaign.get("proposed_dates")  # e.g. "[2025-06-01,2025-06-15)"
-    # strip brackets and split on comma
-    if isinstance(daterange, str) and "," in daterange:
-        start_date = daterange.strip("[]()").split(",")[0]
-        end_date = daterange.strip("[]()").split(",")[1]
-    else:
-        start_date = end_date = "TBD"
-
-    business_id = campaign.get("business_id")
-
-    # b) Business row (brand info)
-    biz_resp = (
-        supabase.table("business")
-        .select("name, email, phone, website_url")
-        .eq("id", business_id)
-        .single()
-        .execute()
-    )
-    if biz_resp is None or getattr(biz_resp, "error", None) or not biz_resp.data:
-        raise RuntimeError(f"Business {business_id} not found")
-    business = biz_resp.data
-    brand_name = business.get("name")
-    brand_email = business.get("email")
-    brand_phone = business.get("phone") or ""
-    brand_website = business.get("website_url") or ""
-
-    # c) Influencer row (if provided)
+    campaign_title = campaign.title
+    budget = campaign.budget
+    deliverables_list = campaign.deliverables or []
+    start_date, end_date = campaign.dates()
+
+    # a) Business row (brand info)
+    business = campaign.business
+    if business is None:
+        raise RuntimeError(f"Business {campaign.business_id} not found")
+    brand_name = business.name
+    brand_email = business.email
+    brand_phone = business.phone or ""
+    brand_website = business.website_url or ""
+
+    # b) Influencer row (if provided), plus any pre‑negotiated rate_per_post on the join row
+    rate_per_post = None
     if creator_id:
-        infl_resp = (
-            supabase.table("influencer")
-            .select("name, username, email")
-            .eq("id", creator_id)
-            .single()
-            .execute()
-        )
-        if infl_resp is None or getattr(infl_resp, "error", None) or not infl_resp.data:
+        join_row = campaign.campaign_influencer[0] if campaign.campaign_influencer else None
+        if join_row and join_row.influencer:
+            influencer = join_row.influencer.model_dump()
+            rate_per_post = join_row.rate_per_post
+        else:
+            # Not invited to this campaign; look the creator up directly
+            influencer = await resolve_profile(creator_id)
+        if not influencer:
             raise RuntimeError(f"Influencer {creator_id} not found")
-        influencer = infl_resp.data
         creator_name = influencer.get("name")
         creator_username = influencer.get("username")
         creator_email = influencer.get("email")
@@ -84,21 +76,6 @@ def generate_contract(campaign_id: str, creator_id: Optional[str] = None) -> byt
         creator_username = ""
         creator_email = ""
 
-    # d) (Optional) fetch join table entry to pull any pre‑negotiated rate_per_post or other terms
-    # For example purposes, let’s assume we want to check if campaign_influencer has a rate_per_post override
-    rate_per_post = None
-    if creator_id:
-        join_resp = (
-            supabase.table("campaign_influencer")
-            .select("rate_per_post")
-            .eq("campaign_id", campaign_id)
-            .eq("influencer_id", creator_id)
-            .single()
-            .execute()
-        )
-        if join_resp and not getattr(join_resp, "error", None) and join_resp.data:
-            rate_per_post = join_resp.data.get("rate_per_post")
-
     # If no rate_per_post in join table, we fall back to a simple split of campaign.budget
     if rate_per_post is None and budget:
         # e.g. 20% of budget
@@ -109,11 +86,8 @@ def generate_contract(campaign_id: str, creator_id: Optional[str] = None) -> byt
 
     # ——— 2) Render Markdown via Jinja2 ———
 
-    templates_path = os.path.join(os.path.dirname(__file__), "..", "utils", "templates")
-    env = Environment(loader=FileSystemLoader(templates_path))
-
-    # Load our new legally styled contract template
-    template = env.get_template("contract_template.md.j2")
+    # Compiled once per process (and per template version)
+    template = get_template("contract_template.md.j2")
 
     rendered_md = template.render(
         campaign_title=campaign_title,
@@ -133,34 +107,90 @@ def generate_contract(campaign_id: str, creator_id: Optional[str] = None) -> byt
 
     # ——— 3) Convert Markdown to PDF using ReportLab ———
 
-    # Split into lines for PDF layout
-    lines = rendered_md.splitlines()
+    return render_markdown_pdf(rendered_md)
 
-    buffer = io.BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
 
-    pdf.setFont("Times-Roman", 12)
-    x_margin = 40
-    y_position = height - 50  # start near top
+async def load_contract_terms(campaign_id: str, influencer_id: str) -> Dict[str, Any]:
+    """
+    Fetch everything the terms contract depends on (one embedded select) and
+    return it as a flat dict:
+      { campaign_title, start_date, end_date, influencer_name,
+        agreed_rate_per_post, final_deliverable_details, brand_name }
+    """
+    campaign = await load_campaign_aggregate(campaign_id, influencer_ids=[influencer_id])
+    if campaign is None:
+        raise RuntimeError(f"Campaign {campaign_id} not found")
+    if not campaign.campaign_influencer:
+        raise RuntimeError("Finalized terms not found for this campaign/influencer")
+    join_row = campaign.campaign_influencer[0]
+    if join_row.influencer is None:
+        raise RuntimeError(f"Influencer {influencer_id} not found")
+    return _contract_terms(campaign, join_row)
 
-    for line in lines:
-        pdf.drawString(x_margin, y_position, line)
-        y_position -= 16
-        if y_position < 50:
-            pdf.showPage()         # new page
-            pdf.setFont("Times-Roman", 12)
-            y_position = height - 50
 
-    pdf.showPage()
-    pdf.save()
+def _contract_terms(campaign: CampaignRecord, join_row: CampaignInfluencerRecord) -> Dict[str, Any]:
+    start_date, end_date = campaign.dates()
+    return {
+        "campaign_title": campaign.title or "Untitled Campaign",
+        "start_date": start_date,
+        "end_date": end_date,
+        "influencer_name": join_row.influencer.name or "Unknown Creator",
+        "agreed_rate_per_post": join_row.agreed_rate_per_post or 0.0,
+        "final_deliverable_details": join_row.final_deliverable_details or "",
+        "brand_name": (campaign.business.name if campaign.business else None) or "Brand",
+    }
 
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
 
+async def load_campaign_contract_terms(
+    campaign_id: str,
+    influencer_ids: Optional[Iterable[str]] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Batch variant of load_contract_terms() for every contract-eligible
+    influencer on a campaign (or just `influencer_ids`), in one embedded select.
+    Returns ({influencer_id: terms}, {influencer_id: error}).
+    """
+    wanted = None
+    if influencer_ids is not None:
+        wanted = [str(i) for i in dict.fromkeys(influencer_ids)]
+        campaign = await load_campaign_aggregate(campaign_id, influencer_ids=wanted)
+    else:
+        campaign = await load_campaign_aggregate(campaign_id, statuses=CONTRACT_ELIGIBLE_STATUSES)
+    if campaign is None:
+        raise RuntimeError(f"Campaign {campaign_id} not found")
+    rows = {r.influencer_id: r for r in campaign.campaign_influencer}
 
-def generate_contract_with_terms(
+    errors: Dict[str, str] = {}
+    for influencer_id in wanted or []:
+        if influencer_id not in rows:
+            errors[influencer_id] = "Influencer is not part of this campaign"
+
+    contracts: Dict[str, Dict[str, Any]] = {}
+    for influencer_id, row in rows.items():
+        if row.agreed_rate_per_post is None:
+            errors[influencer_id] = "Finalized terms not found for this campaign/influencer"
+        elif row.influencer is None:
+            errors[influencer_id] = f"Influencer {influencer_id} not found"
+        else:
+            contracts[influencer_id] = _contract_terms(campaign, row)
+    return contracts, errors
+
+
+def contract_fingerprint(terms: Dict[str, Any]) -> str:
+    """
+    Content hash of every input that affects the rendered PDF, plus the
+    template version. Used as both the cache key and the strong ETag.
+    """
+    payload = json.dumps(
+        {**terms, "template_version": CONTRACT_TEMPLATE_VERSION},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def generate_contract_with_terms(
     campaign_id: str,
     influencer_id: str
 ) -> bytes:
@@ -168,127 +198,41 @@ def generate_contract_with_terms(
     1) Fetch campaign, influencer, and finalized terms.
     2) Build a simple one‑page PDF via ReportLab based on those values.
     """
+    return render_contract_pdf(await load_contract_terms(campaign_id, influencer_id))
 
-    # ——— 1) Fetch from our services ———
 
-    # a) Campaign row
-    campaign = get_campaign_by_id(campaign_id)
-    if not campaign:
-        raise RuntimeError(f"Campaign {campaign_id} not found")
+async def get_contract_etag(campaign_id: str, influencer_id: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Cheap revalidation path: load the inputs and hash them, without rendering
+    or reading the PDF. Returns (etag, terms).
+    """
+    terms = await load_contract_terms(campaign_id, influencer_id)
+    return contract_fingerprint(terms), terms
 
-    campaign_title = campaign.get("title", "Untitled Campaign")
-    # proposed_dates is a string like "[2025-06-01,2025-06-15)"
-    pd = campaign.get("proposed_dates", "")
-    if isinstance(pd, str) and "," in pd:
-        start_date = pd.strip("[]()").split(",")[0]
-        end_date = pd.strip("[]()").split(",")[1]
-    else:
-        start_date = end_date = "TBD"
 
-    # b) Influencer row
-    influencer = get_influencer_by_id(influencer_id)
-    if not influencer:
-        raise RuntimeError(f"Influencer {influencer_id} not found")
+def lookup_cached_contract(key: str) -> Optional[bytes]:
+    return _contract_store.get(key)
 
-    influencer_name = influencer.get("name", "Unknown Creator")
 
-    # c) Finalized terms (rate + deliverable details)
-    terms = get_finalized_terms(campaign_id, influencer_id)
-    if not terms:
-        raise RuntimeError("Finalized terms not found for this campaign/influencer")
+def store_contract_pdf(key: str, pdf_bytes: bytes) -> None:
+    _contract_store.put(key, pdf_bytes)
 
-    agreed_rate = terms.get("agreed_rate_per_post", 0.0)
-    deliverable_details = terms.get("final_deliverable_details", "")
 
-    # d) Fetch business name (so we can display “Brand X”)
-    biz_resp = (
-        supabase.table("business")
-        .select("name")
-        .eq("id", campaign.get("business_id"))
-        .single()
-        .execute()
-    )
-    if not biz_resp or getattr(biz_resp, "error", None) or not biz_resp.data:
-        brand_name = "Brand"
-    else:
-        brand_name = biz_resp.data.get("name", "Brand")
-
-    # ——— 2) Build PDF via ReportLab ———
-
-    buffer = io.BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    # Set up fonts and margins
-    pdf.setFont("Times-Bold", 16)
-    y = height - 50
-    x_margin = 40
-
-    # Title
-    pdf.drawString(x_margin, y, f"Contract: {campaign_title}")
-    y -= 30
-
-    pdf.setFont("Times-Roman", 12)
-    pdf.drawString(x_margin, y, f"Brand: {brand_name}")
-    y -= 18
-
-    pdf.drawString(x_margin, y, f"Influencer: {influencer_name}")
-    y -= 18
-
-    pdf.drawString(x_margin, y, f"Campaign Dates: {start_date} to {end_date}")
-    y -= 18
-
-    pdf.drawString(x_margin, y, f"Agreed Rate (per post): ₹{agreed_rate:.2f}")
-    y -= 24
-
-    pdf.setFont("Times-Bold", 12)
-    pdf.drawString(x_margin, y, "Deliverable Details:")
-    y -= 18
-
-    pdf.setFont("Times-Roman", 12)
-    # Wrap deliverable_details if it’s long
-    max_width = width - 2 * x_margin
-    text_obj = pdf.beginText(x_margin, y)
-    text_obj.setFont("Times-Roman", 12)
-    for line in deliverable_details.splitlines():
-        # ReportLab doesn’t auto-wrap, so we manually wrap at ~80 chars
-        pieces = [line[i : i + 80] for i in range(0, len(line), 80)]
-        for piece in pieces:
-            text_obj.textLine(piece)
-            y -= 14
-    pdf.drawText(text_obj)
-
-    # Move down a bit
-    y -= 30
-
-    # Terms & Conditions stub
-    pdf.setFont("Times-Bold", 12)
-    pdf.drawString(x_margin, y, "Terms & Conditions:")
-    y -= 18
-
-    pdf.setFont("Times-Roman", 12)
-    tcs = [
-        "1. Influencer agrees to deliver the above content by the agreed dates.",
-        "2. Brand will pay the agreed rate within 30 days of submission.",
-        "3. Usage rights remain with the Brand for marketing purposes.",
-        "4. This contract is governed by applicable local laws.",
-    ]
-    for tc in tcs:
-        pdf.drawString(x_margin + 20, y, f"- {tc}")
-        y -= 16
-
-    # Signature lines at bottom
-    y = 100
-    pdf.setFont("Times-Roman", 12)
-    pdf.drawString(x_margin, y, "Brand Signature: ____________________________")
-    pdf.drawString(x_margin + 300, y, "Date: ____________")
-    y -= 40
-    pdf.drawString(x_margin, y, "Influencer Signature: _______________________")
-    pdf.drawString(x_margin + 300, y, "Date: ____________")
-
-    pdf.showPage()
-    pdf.save()
-
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
\ No newline at end of file
+def get_cached_contract(key: str, terms: Dict[str, Any]) -> bytes:
+    """
+    Returns the cached PDF for `key`, rendering and storing it on a miss.
+    """
+    pdf_bytes = lookup_cached_contract(key)
+    if pdf_bytes is None:
+        pdf_bytes = render_contract_pdf(terms)
+        store_contract_pdf(key, pdf_bytes)
+    return pdf_bytes
+
+
+async def get_contract_pdf(campaign_id: str, influencer_id: str) -> Tuple[str, bytes]:
+    """
+    Returns (etag, pdf_bytes), serving the PDF from the content-addressed cache
+    when none of its inputs changed since it was last rendered.
+    """
+    key, terms = await get_contract_etag(campaign_id, influencer_id)
+    return key, await asyncio.to_thread(get_cached_contract, key, terms)
@@ -0,0 +1,183 @@
+# backend/app/services/dataloader.py
+#
+# Request-scoped batching loader for rows fetched by key.
+#
+# Every HTTP request gets its own DataLoader (RequestLoaderMiddleware, added
+# in app/main.py) bound to a ContextVar. `await load("campaign", id)` does not
+# query right away: keys asked for during the same event-loop tick are
+# collected and sent as one `in.(...)` query per table once the tick ends, so
+#
+#     await asyncio.gather(load("campaign", c), load("influencer", a), load("influencer", b))
+#
+# costs two round trips, not three. Results (including "no such row") are
+# memoized until the request finishes; services call forget() from write
+# paths so a read after a write in the same request sees the new row.
+#
+# Keys are either a single column ("id") or two columns, e.g.
+# ("campaign_id", "influencer_id") for join rows: those are batched as
+# `eq(first)` + `in_(second)` per distinct first value. UUID key values are
+# lowercased, the way Postgres returns them, so rows match keys given in any
+# case (as an `eq()` on a uuid column would).
+#
+# Outside a request (scripts, background jobs) load() still works; it just
+# uses a throwaway loader, so nothing is batched or remembered.
+# Loaded rows are shared between callers and must not be mutated.
+
+import asyncio
+import contextvars
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.services.repository import repository
+
+# Keys per in.(...) filter, so the query string stays within URL limits
+LOADER_CHUNK_SIZE = int(os.getenv("LOADER_CHUNK_SIZE", "500"))
+
+_UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+
+Key = Union[str, Tuple[str, ...]]
+Columns = Tuple[str, ...]
+
+_current: contextvars.ContextVar[Optional["DataLoader"]] = contextvars.ContextVar("dataloader", default=None)
+
+
+def _columns(columns: Union[str, Sequence[str]]) -> Columns:
+    columns = (columns,) if isinstance(columns, str) else tuple(columns)
+    if len(columns) not in (1, 2):
+        raise ValueError("DataLoader keys are one column or two columns")
+    return columns
+
+
+def _value(value: Any) -> str:
+    text = str(value)
+    return text.lower() if _UUID.match(text) else text
+
+
+def _key(key: Key, columns: Columns) -> Tuple[str, ...]:
+    key = (key,) if not isinstance(key, tuple) else key
+    if len(key) != len(columns):
+        raise ValueError(f"Key {key!r} does not match columns {columns!r}")
+    return tuple(_value(k) for k in key)
+
+
+class DataLoader:
+    def __init__(self):
+        # (table, columns, key) -> future of the row (or None)
+        self._memo: Dict[Tuple[str, Columns, Tuple[str, ...]], asyncio.Future] = {}
+        # (table, columns) -> key -> future, waiting for the next dispatch
+        self._queue: Dict[Tuple[str, Columns], Dict[Tuple[str, ...], asyncio.Future]] = {}
+        self._scheduled = False
+        self.loads = 0
+        self.queries = 0
+
+    async def load(self, table: str, key: Key, columns: Union[str, Sequence[str]] = "id") -> Optional[Dict[str, Any]]:
+        """
+        The `table` row whose `columns` equal `key`, or None.
+        """
+        columns = _columns(columns)
+        key = _key(key, columns)
+        self.loads += 1
+        memo_key = (table, columns, key)
+        future = self._memo.get(memo_key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._memo[memo_key] = future
+            self._queue.setdefault((table, columns), {})[key] = future
+            if not self._scheduled:
+                # Runs after every callback already queued for this tick,
+                # i.e. after the other coroutines of a gather() got to load()
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # shield: one caller being cancelled must not cancel the shared fetch
+        return await asyncio.shield(future)
+
+    async def load_many(
+        self, table: str, keys: Sequence[Key], columns: Union[str, Sequence[str]] = "id"
+    ) -> List[Optional[Dict[str, Any]]]:
+        return list(await asyncio.gather(*(self.load(table, k, columns) for k in keys)))
+
+    def forget(self, table: str) -> None:
+        """
+        Drops every remembered row of `table`; the next load() reads again.
+        """
+        for memo_key in [k for k in self._memo if k[0] == table]:
+            del self._memo[memo_key]
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        queue, self._queue = self._queue, {}
+        for (table, columns), waiting in queue.items():
+            asyncio.ensure_future(self._fetch(table, columns, waiting))
+
+    async def _query(self, table: str, columns: Columns, prefix: Tuple[str, ...], values: List[str]) -> List[Dict[str, Any]]:
+        where: Dict[str, Any] = dict(zip(columns, prefix))
+        where[columns[-1]] = values[0] if len(values) == 1 else values
+        self.queries += 1
+        return await repository().select(table, where)
+
+    async def _fetch(self, table: str, columns: Columns, waiting: Dict[Tuple[str, ...], asyncio.Future]) -> None:
+        # Group by every column but the last: one eq(...) + in_(last) per group
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for key in waiting:
+            groups.setdefault(key[:-1], []).append(key[-1])
+
+        try:
+            results = await asyncio.gather(*(
+                self._query(table, columns, prefix, values[i : i + LOADER_CHUNK_SIZE])
+                for prefix, values in groups.items()
+                for i in range(0, len(values), LOADER_CHUNK_SIZE)
+            ))
+        except Exception as e:
+            for key, future in waiting.items():
+                # Not memoized: a later load() in this request retries
+                if self._memo.get((table, columns, key)) is future:
+                    del self._memo[(table, columns, key)]
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {tuple(_value(row.get(c)) for c in columns): row for rows in results for row in rows}
+        for key, future in waiting.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+
+def current_loader() -> Optional[DataLoader]:
+    return _current.get()
+
+
+async def load(table: str, key: Key, columns: Union[str, Sequence[str]] = "id") -> Optional[Dict[str, Any]]:
+    """
+    Loads one row through the current request's DataLoader (see module
+    docstring); outside a request, through a loader of its own.
+    """
+    loader = _current.get() or DataLoader()
+    return await loader.load(table, key, columns)
+
+
+def forget(table: str) -> None:
+    loader = _current.get()
+    if loader is not None:
+        loader.forget(table)
+
+
+class RequestLoaderMiddleware:
+    """
+    Gives every HTTP request a fresh DataLoader. A plain ASGI middleware
+    (not BaseHTTPMiddleware), so the endpoint runs in the context it sets.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current.set(DataLoader())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,88 @@
+# backend/app/services/db.py
+#
+# Async data-access client for request handlers.
+#
+# One AsyncPostgrestClient per worker process, on top of a pooled
+# httpx.AsyncClient (HTTP/2 where the server negotiates it, keep-alive,
+# bounded pool). It is opened in the FastAPI lifespan (app/main.py); services
+# `await db().table(...)...execute()`, so a handler waiting on the database
+# hands the event loop to other requests instead of blocking the worker.
+#
+# The synchronous client in supabase_client.py is still used by background
+# workers and batch jobs that run in their own threads.
+
+import os
+from typing import Optional
+
+import httpx
+from postgrest import AsyncPostgrestClient
+
+from app.services.supabase_client import SUPABASE_SERVICE_KEY, SUPABASE_URL
+
+# Kept small on purpose: over HTTP/2 (Supabase negotiates it via TLS ALPN)
+# requests multiplex on a few connections, and httpx's pool gets slower, not
+# faster, with dozens of busy HTTP/1.1 connections from one event loop.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_KEEPALIVE_SECONDS = float(os.getenv("DB_KEEPALIVE_SECONDS", "30"))
+DB_TIMEOUT_SECONDS = float(os.getenv("DB_TIMEOUT_SECONDS", "30"))
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+DB_HTTP2 = _HTTP2_AVAILABLE and os.getenv("DB_HTTP2", "true").lower() not in ("0", "false", "no")
+
+_client: Optional[AsyncPostgrestClient] = None
+
+
+def create_db_client(pool_size: int = DB_POOL_SIZE) -> AsyncPostgrestClient:
+    http = httpx.AsyncClient(
+        http2=DB_HTTP2,
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=DB_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(DB_TIMEOUT_SECONDS),
+        follow_redirects=True,
+    )
+    return AsyncPostgrestClient(
+        f"{(SUPABASE_URL or '').rstrip('/')}/rest/v1",
+        headers={
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "apikey": SUPABASE_SERVICE_KEY or "",
+            "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+        },
+        http_client=http,
+    )
+
+
+async def open_db() -> AsyncPostgrestClient:
+    """
+    Creates the worker's client; called once from the FastAPI lifespan.
+    """
+    global _client
+    if _client is None:
+        _client = create_db_client()
+    return _client
+
+
+async def close_db() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+def db() -> AsyncPostgrestClient:
+    """
+    The worker's async PostgREST client. Outside the app (scripts) it is
+    created on first use; it must then be used from a single event loop.
+    """
+    global _client
+    if _client is None:
+        _client = create_db_client()
+    return _client
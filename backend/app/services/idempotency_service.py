@@ -0,0 +1,179 @@
+# backend/app/services/idempotency_service.py
+#
+# Idempotency-Key handling for non-idempotent endpoints (payments).
+#
+# The first request with a given (scope, key) claims a row in idempotency_keys,
+# runs the handler and stores its response; any retry within the TTL gets the
+# stored response back without running the handler again. An in-flight claim
+# only holds a short lease (expires_at = claim time + IDEMPOTENCY_LOCK_SECONDS):
+# if the worker dies before completing or releasing it, a retry takes the key
+# over once the lease runs out instead of getting 409 for the whole TTL.
+# Completing the request extends expires_at to the TTL. Completed responses
+# are also kept in a process-local TTL cache, so a retry storm against one
+# worker costs no database calls at all.
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.services.db import db
+from app.utils.ttl_cache import TTLCache
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# Lease of an in-flight claim; longer than any idempotent handler runs
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+_responses = TTLCache(
+    maxsize=int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000")),
+    ttl=IDEMPOTENCY_TTL_SECONDS,
+)
+
+
+class IdempotencyError(Exception):
+    """
+    The key cannot be used for this request: 409 while the original request
+    is still in flight, 422 if it was used with a different body.
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def request_hash(body: Any) -> str:
+    payload = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _stored_response(row: Dict[str, Any], req_hash: str) -> Optional[Tuple[int, Any]]:
+    if row.get("request_hash") != req_hash:
+        raise IdempotencyError(422, "Idempotency-Key was already used with a different request")
+    if row.get("status_code") is None:
+        raise IdempotencyError(409, "A request with this Idempotency-Key is still in progress")
+    return row["status_code"], row.get("response")
+
+
+async def _claim(scope: str, key: str, req_hash: str) -> Optional[Tuple[int, Any]]:
+    """
+    Claims (scope, key) for this request. Returns None if the caller now owns
+    it, or the stored (status_code, body) if it was already completed.
+    """
+    now = _now()
+    claim = {
+        "scope": scope,
+        "key": key,
+        "request_hash": req_hash,
+        "status_code": None,
+        "response": None,
+        "created_at": now.isoformat(),
+        "expires_at": (now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)).isoformat(),
+    }
+    resp = await (
+        db().table("idempotency_keys")
+        .upsert(claim, on_conflict="scope,key", ignore_duplicates=True)
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("Could not record Idempotency-Key")
+    if resp.data:
+        return None
+
+    existing = await (
+        db().table("idempotency_keys")
+        .select("request_hash, status_code, response, expires_at")
+        .eq("scope", scope)
+        .eq("key", key)
+        .gt("expires_at", now.isoformat())
+        .execute()
+    )
+    if existing and not getattr(existing, "error", None) and existing.data:
+        return _stored_response(existing.data[0], req_hash)
+
+    # The stored response has expired, or the claim's lease ran out (its worker
+    # died): take it over (conditional, so only one request wins)
+    taken = await (
+        db().table("idempotency_keys")
+        .update(claim)
+        .eq("scope", scope)
+        .eq("key", key)
+        .lte("expires_at", now.isoformat())
+        .execute()
+    )
+    if taken and not getattr(taken, "error", None) and taken.data:
+        return None
+    raise IdempotencyError(409, "A request with this Idempotency-Key is still in progress")
+
+
+async def _complete(scope: str, key: str, status_code: int, body: Any) -> None:
+    expires_at = _now() + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+    await db().table("idempotency_keys").update(
+        {"status_code": status_code, "response": body, "expires_at": expires_at.isoformat()}
+    ).eq("scope", scope).eq("key", key).execute()
+
+
+async def _release(scope: str, key: str) -> None:
+    await db().table("idempotency_keys").delete().eq("scope", scope).eq("key", key).execute()
+
+
+async def run_idempotent(
+    scope: str,
+    key: Optional[str],
+    body: Any,
+    handler: Callable[[], Awaitable[Tuple[int, Any]]],
+) -> Tuple[int, Any, bool]:
+    """
+    Awaits handler() at most once per (scope, key) within the TTL.
+    handler returns (status_code, response_body); responses below 500 are
+    stored and replayed, 5xx (and exceptions) release the key so the client
+    can retry. Returns (status_code, response_body, replayed).
+    Without a key the handler simply runs.
+    """
+    if not key:
+        status_code, response = await handler()
+        return status_code, response, False
+
+    req_hash = request_hash(body)
+    cached = _responses.get((scope, key))
+    if cached is not None:
+        stored = _stored_response(cached, req_hash)
+        return stored[0], stored[1], True
+
+    stored = await _claim(scope, key, req_hash)
+    if stored is not None:
+        _responses.set((scope, key), {"request_hash": req_hash, "status_code": stored[0], "response": stored[1]})
+        return stored[0], stored[1], True
+
+    try:
+        status_code, response = await handler()
+    except Exception:
+        await _release(scope, key)
+        raise
+    if status_code >= 500:
+        await _release(scope, key)
+        return status_code, response, False
+
+    await _complete(scope, key, status_code, response)
+    _responses.set((scope, key), {"request_hash": req_hash, "status_code": status_code, "response": response})
+    return status_code, response, False
+
+
+async def purge_expired_keys() -> int:
+    """
+    Deletes expired idempotency_keys rows; returns how many were removed.
+    """
+    resp = await (
+        db().table("idempotency_keys")
+        .delete()
+        .lt("expires_at", _now().isoformat())
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None):
+        return 0
+    return len(resp.data or [])
@@ -1,36 +1,79 @@
 # backend/app/services/influencer_service.py
 
-from app.services.supabase_client import supabase
+from typing import Any, AsyncIterator, Dict, Optional
 
+from app.services.dataloader import forget, load
+from app.services.db import db
+from app.services.profile_service import influencer_cache
+from app.services.campaign_state_service import transition
+from app.utils.keyset import iter_keyset_async
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, paginate, select_list
 
-def get_influencer_by_id(influencer_id: str):
-    resp = supabase.table("influencer").select("*").eq("id", influencer_id).single().execute()
-    return resp.data if resp and not getattr(resp, "error", None) else None
 
+async def _load_influencer(influencer_id: str):
+    return await load("influencer", influencer_id)
 
-def list_influencers():
-    resp = supabase.table("influencer").select("*").execute()
-    return resp.data or []
 
+async def get_influencer_by_id(influencer_id: str, updated_at: Optional[str] = None):
+    """
+    The influencer row, or None; served from the entity cache when warm, unless
+    the cached copy is older than `updated_at` (from get_influencer_version()).
+    """
+    return await influencer_cache.get_current(str(influencer_id), _load_influencer, "updated_at", updated_at)
 
-def create_influencer(data: dict):
-    resp = supabase.table("influencer").insert(data).single().execute()
-    return resp.data if resp and not getattr(resp, "error", None) else None
 
+async def get_influencer_version(influencer_id: str) -> Optional[Dict[str, Any]]:
+    """
+    { id, updated_at } of one influencer, or None (conditional GET probe).
+    """
+    resp = await db().table("influencer").select("id, updated_at").eq("id", influencer_id).limit(1).execute()
+    if resp is None or getattr(resp, "error", None) or not resp.data:
+        return None
+    return resp.data[0]
+
+
+async def list_influencers(limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None, fields: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One page of influencers in id order: { items, next_cursor }.
+    `fields` is a comma-separated column list (all columns when omitted).
+    """
+    select = select_list(fields)
+    return await paginate(lambda: db().table("influencer").select(select), ("id",), limit, cursor)
+
+
+def iter_influencers(page_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Every influencer row, fetched in keyset pages of `page_size`.
+    """
+    return iter_keyset_async(lambda: db().table("influencer").select("*"), ("id",), page_size)
+
+
+async def create_influencer(data: dict):
+    resp = await db().table("influencer").insert(data).single().execute()
+    if resp is None or getattr(resp, "error", None):
+        return None
+    if resp.data:
+        influencer_cache.prime(str(resp.data["id"]), resp.data)
+    return resp.data
 
-def update_influencer(influencer_id: str, data: dict):
-    resp = supabase.table("influencer").update(data).eq("id", influencer_id).single().execute()
+
+async def update_influencer(influencer_id: str, data: dict):
+    resp = await db().table("influencer").update(data).eq("id", influencer_id).single().execute()
+    influencer_cache.invalidate(str(influencer_id))
+    forget("influencer")
     return resp.data if resp and not getattr(resp, "error", None) else None
 
 
-def delete_influencer(influencer_id: str):
-    resp = supabase.table("influencer").delete().eq("id", influencer_id).execute()
+async def delete_influencer(influencer_id: str):
+    resp = await db().table("influencer").delete().eq("id", influencer_id).execute()
+    influencer_cache.invalidate(str(influencer_id))
+    forget("influencer")
     return resp.data or []
 
 
-def search_influencers(query: str) -> list[dict]:
-    resp = (
-        supabase
+async def search_influencers(query: str) -> list[dict]:
+    resp = await (
+        db()
         .table("influencer")
         .select("*")
         .ilike("name", f"%{query}%")
@@ -39,58 +82,21 @@ def search_influencers(query: str) -> list[dict]:
     return resp.data or []
 
 
-def get_payment_status(influencer_id: str, campaign_id: str) -> bool:
+async def get_payment_status(influencer_id: str, campaign_id: str) -> bool:
     """
     Return True if the influencer has been paid for this campaign.
     We assume `payment_status` is a column in campaign_influencer or
     you have a separate payments table. Here we read from campaign_influencer.
     """
-    resp = (
-        supabase.table("campaign_influencer")
-        .select("payment_status")
-        .eq("influencer_id", influencer_id)
-        .eq("campaign_id", campaign_id)
-        .single()
-        .execute()
-    )
-    if resp is None or getattr(resp, "error", None):
-        raise RuntimeError(f"DB error when fetching payment status: {resp.error.message if resp and hasattr(resp,'error') else 'None returned'}")
-
-    row = resp.data or {}
+    row = await load("campaign_influencer", (campaign_id, influencer_id), ("campaign_id", "influencer_id")) or {}
     # Assuming `payment_status` column is boolean or "Paid"/"Pending"
     return bool(row.get("payment_status"))
 
 
-def mark_campaign_complete(campaign_id: str, influencer_id: str) -> bool:
+async def mark_campaign_complete(campaign_id: str, influencer_id: str) -> bool:
     """
     Updates campaign_influencer.status = 'Completed' for this influencer+campaign.
+    Only an Accepted or Signed link can be marked Completed.
     Returns True if exactly one row was updated.
     """
-    # 1) Fetch existing join row
-    check = (
-        supabase.table("campaign_influencer")
-        .select("status")
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .single()
-        .execute()
-    )
-    if check is None or getattr(check, "error", None):
-        raise RuntimeError(f"DB error when looking up join row: {check.error.message if check and hasattr(check,'error') else 'None returned'}")
-
-    if not check.data or check.data.get("status") != "Accepted":
-        # Only an Accepted invitation can be marked Completed
-        return False
-
-    # 2) Update to Completed
-    update = (
-        supabase.table("campaign_influencer")
-        .update({"status": "Completed"})
-        .eq("campaign_id", campaign_id)
-        .eq("influencer_id", influencer_id)
-        .execute()
-    )
-    if update is None or getattr(update, "error", None):
-        raise RuntimeError(f"DB error when marking complete: {update.error.message if update and hasattr(update,'error') else 'None returned'}")
-
-    return bool(update.data)
+    return await transition(campaign_id, influencer_id, "complete") is not None
@@ -0,0 +1,392 @@
+# backend/app/services/mail_delivery_service.py
+#
+# Outbox-backed outbound mail delivery.
+#
+# Producers (bulk outreach) insert rows into the `outbox` table. A drain pass
+# leases a batch of due rows (claim_outbox_batch RPC), groups them by recipient
+# domain and hands each group to a worker thread. Workers borrow a connection
+# from a shared SMTP pool and send several messages per session, so the
+# TCP/TLS/AUTH handshake is paid once per connection instead of once per email.
+# Transient failures are re-queued with exponential backoff.
+
+import os
+import random
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Any, Dict, List, Optional
+
+from app.services.supabase_client import supabase
+
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_FROM = os.getenv("SMTP_FROM", "outreach@influencerflow.app")
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "8"))
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+# Messages sent over one borrowed connection before it goes back to the pool
+OUTBOX_SESSION_SIZE = int(os.getenv("OUTBOX_SESSION_SIZE", "50"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "30"))
+# Per recipient domain, e.g. stay under gmail.com's inbound throttling
+OUTBOX_DOMAIN_RATE = float(os.getenv("OUTBOX_DOMAIN_RATE", "20"))   # messages / second
+OUTBOX_DOMAIN_BURST = int(os.getenv("OUTBOX_DOMAIN_BURST", "40"))
+
+# Outbox statuses
+QUEUED = "Queued"
+SENDING = "Sending"
+SENT = "Sent"
+FAILED = "Failed"
+
+
+class DeliveryMetrics:
+    """
+    Counters for one worker process. reuse_ratio is the share of messages that
+    did not need a fresh SMTP connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.sessions = 0
+        self.connections_opened = 0
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "sessions": self.sessions,
+            "connections_opened": self.connections_opened,
+            "messages_per_sec": round(self.sent / elapsed, 1) if elapsed else 0.0,
+            "connection_reuse_ratio": round(max(1 - self.connections_opened / self.sent, 0.0), 3) if self.sent else 0.0,
+        }
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated smtplib connections. Connections are reused
+    until they break or have carried `max_messages` messages (many servers cap
+    messages per session).
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        username: Optional[str] = SMTP_USER,
+        password: Optional[str] = SMTP_PASSWORD,
+        starttls: bool = SMTP_STARTTLS,
+        size: int = SMTP_POOL_SIZE,
+        max_messages: int = 500,
+        timeout: float = 30.0,
+        metrics: Optional[DeliveryMetrics] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.metrics = metrics or DeliveryMetrics()
+        self._idle: deque = deque()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _open(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        conn.ehlo()
+        if self.starttls and conn.has_extn("starttls"):
+            conn.starttls()
+            conn.ehlo()
+        if self.username:
+            conn.login(self.username, self.password or "")
+        conn.messages_sent = 0
+        self.metrics.add(connections_opened=1)
+        return conn
+
+    def acquire(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        while True:
+            with self._lock:
+                conn = self._idle.popleft() if self._idle else None
+            if conn is None:
+                break
+            # The server may have closed it while idle; don't let a message find out
+            if _alive(conn):
+                return conn
+            conn.close()
+        try:
+            return self._open()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: smtplib.SMTP, broken: bool = False) -> None:
+        if broken or conn.messages_sent >= self.max_messages:
+            _quit(conn)
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            while self._idle:
+                _quit(self._idle.popleft())
+
+
+def _alive(conn: smtplib.SMTP) -> bool:
+    try:
+        return conn.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _quit(conn: smtplib.SMTP) -> None:
+    try:
+        conn.quit()
+    except Exception:
+        conn.close()
+
+
+class DomainRateLimiter:
+    """
+    Token bucket per recipient domain; acquire() blocks until a token is free.
+    """
+
+    def __init__(self, rate: float = OUTBOX_DOMAIN_RATE, burst: int = OUTBOX_DOMAIN_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, List[float]] = {}   # domain -> [tokens, last refill]
+        self._lock = threading.Lock()
+
+    def acquire(self, domain: str) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(domain, [float(self.burst), now])
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self._buckets[domain] = [tokens - 1, now]
+                    return
+                self._buckets[domain] = [tokens, now]
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+# ----- Enqueue -----
+
+
+def enqueue_emails(messages: List[Dict[str, Any]]) -> int:
+    """
+    Bulk-inserts messages into the outbox. Each message needs to_email, subject
+    and body; job_id / influencer_id are optional back-references.
+    Returns the number of rows queued.
+    """
+    rows = [
+        {
+            "job_id": m.get("job_id"),
+            "influencer_id": m.get("influencer_id"),
+            "to_email": m["to_email"],
+            "subject": m["subject"],
+            "body": m["body"],
+            "status": QUEUED,
+        }
+        for m in messages
+        if m.get("to_email")
+    ]
+    if not rows:
+        return 0
+    resp = supabase.table("outbox").insert(rows, returning="minimal").execute()
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("Failed to enqueue outbox messages")
+    return len(rows)
+
+
+# ----- Drain -----
+
+
+def _connection_lost(exc: Exception) -> bool:
+    """
+    True when the SMTP connection itself is gone (dropped, reset, timed out).
+    SMTPException subclasses OSError, so reply errors (a 550 refusal, a 452)
+    must be told apart from real socket errors: the connection survives those.
+    """
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+def _is_transient(exc: Exception) -> bool:
+    if _connection_lost(exc):
+        return True
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return False
+
+
+def _build_message(row: Dict[str, Any], sender: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["To"] = row["to_email"]
+    msg["Subject"] = row["subject"]
+    msg.set_content(row["body"])
+    return msg
+
+
+def _send_session(
+    rows: List[Dict[str, Any]],
+    pool: SMTPConnectionPool,
+    limiter: DomainRateLimiter,
+    sender: str,
+) -> List[Dict[str, Any]]:
+    """
+    Sends `rows` (all for one domain) over as few pooled connections as possible.
+    Returns one {row, error, transient} result per row.
+    """
+    results = []
+    pending = list(rows)
+    while pending:
+        try:
+            conn = pool.acquire()
+        except Exception as e:
+            results.extend({"row": r, "error": str(e), "transient": True} for r in pending)
+            break
+        pool.metrics.add(sessions=1)
+        broken = False
+        while pending and not broken:
+            row = pending.pop(0)
+            limiter.acquire(row["to_email"].rpartition("@")[2].lower())
+            try:
+                conn.send_message(_build_message(row, sender))
+                conn.messages_sent += 1
+                results.append({"row": row, "error": None, "transient": False})
+            except Exception as e:
+                results.append({"row": row, "error": str(e), "transient": _is_transient(e)})
+                # A dropped connection poisons the session; the rest go on a fresh one
+                broken = _connection_lost(e)
+        pool.release(conn, broken=broken)
+    return results
+
+
+def _sessions_by_domain(rows: List[Dict[str, Any]], session_size: int) -> List[List[Dict[str, Any]]]:
+    by_domain: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_domain.setdefault(row["to_email"].rpartition("@")[2].lower(), []).append(row)
+    return [
+        group[i : i + session_size]
+        for group in by_domain.values()
+        for i in range(0, len(group), session_size)
+    ]
+
+
+def _backoff(attempts: int) -> timedelta:
+    delay = OUTBOX_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _write_results(results: List[Dict[str, Any]], metrics: DeliveryMetrics) -> None:
+    now = datetime.utcnow()
+    sent_ids = [r["row"]["id"] for r in results if r["error"] is None]
+    if sent_ids:
+        supabase.table("outbox").update(
+            {"status": SENT, "sent_at": now.isoformat(), "last_error": None, "locked_until": None}
+        ).in_("id", sent_ids).execute()
+
+    # Failed rows have individual attempts/next_attempt_at, so write them back in one upsert
+    failed_rows = []
+    for r in results:
+        if r["error"] is None:
+            continue
+        row = dict(r["row"])
+        retry = r["transient"] and row.get("attempts", 0) < OUTBOX_MAX_ATTEMPTS
+        row.update({
+            "status": QUEUED if retry else FAILED,
+            "last_error": r["error"][:500],
+            "locked_until": None,
+            "next_attempt_at": (now + _backoff(row.get("attempts", 1))).isoformat() if retry else row.get("next_attempt_at"),
+        })
+        failed_rows.append(row)
+        if retry:
+            metrics.add(retried=1)
+        else:
+            metrics.add(failed=1)
+    if failed_rows:
+        supabase.table("outbox").upsert(failed_rows, on_conflict="id", returning="minimal").execute()
+
+    metrics.add(sent=len(sent_ids))
+
+
+def drain_outbox_once(
+    pool: SMTPConnectionPool,
+    limiter: Optional[DomainRateLimiter] = None,
+    workers: int = SMTP_POOL_SIZE,
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    session_size: int = OUTBOX_SESSION_SIZE,
+    sender: str = SMTP_FROM,
+) -> int:
+    """
+    Leases one batch of due outbox rows, delivers it with `workers` threads and
+    records the outcome. Returns the number of rows processed (0 = outbox idle).
+    """
+    resp = supabase.rpc(
+        "claim_outbox_batch", {"batch_size": batch_size, "max_attempts": OUTBOX_MAX_ATTEMPTS}
+    ).execute()
+    rows = resp.data if resp and not getattr(resp, "error", None) else []
+    if not rows:
+        return 0
+
+    limiter = limiter or DomainRateLimiter()
+    sessions = _sessions_by_domain(rows, session_size)
+    results: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for session_results in executor.map(lambda s: _send_session(s, pool, limiter, sender), sessions):
+            results.extend(session_results)
+
+    _write_results(results, pool.metrics)
+    return len(rows)
+
+
+def run_outbox_worker(
+    pool: Optional[SMTPConnectionPool] = None,
+    poll_interval: float = 2.0,
+    stop_event: Optional[threading.Event] = None,
+    **drain_kwargs: Any,
+) -> DeliveryMetrics:
+    """
+    Drains the outbox until `stop_event` is set, sleeping `poll_interval`
+    seconds whenever there is nothing due.
+    """
+    pool = pool or SMTPConnectionPool()
+    limiter = DomainRateLimiter()
+    stop_event = stop_event or threading.Event()
+    try:
+        while not stop_event.is_set():
+            if drain_outbox_once(pool, limiter, **drain_kwargs) == 0:
+                stop_event.wait(poll_interval)
+    finally:
+        pool.close()
+    return pool.metrics
@@ -0,0 +1,164 @@
+# backend/app/services/metrics_service.py
+#
+# Performance metrics history (views, likes, impressions, reach,
+# link_clicks, ...) per (campaign, influencer), kept in the columnar
+# MetricsStore (app/utils/metrics_store.py) with minute/hour/day rollups.
+
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from app.utils.metrics_store import RESOLUTIONS, MetricsStore
+
+METRICS_DIR = os.getenv(
+    "METRICS_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "metrics"),
+)
+MAX_INGEST_POINTS = int(os.getenv("MAX_INGEST_POINTS", "50000"))
+# "auto" picks the finest resolution that keeps a chart under this many buckets
+MAX_CHART_POINTS = int(os.getenv("MAX_CHART_POINTS", "1500"))
+# Compaction merges this many segments of one size tier at a time
+METRICS_COMPACT_SEGMENTS = int(os.getenv("METRICS_COMPACT_SEGMENTS", "8"))
+# Minute buckets are kept this long; hour and day buckets are kept for all time
+METRICS_MINUTE_RETENTION_DAYS = float(os.getenv("METRICS_MINUTE_RETENTION_DAYS", "14"))
+
+_METRIC_NAME = re.compile(r"^[a-z][a-z0-9_]{0,63}$")
+
+_store: Optional[MetricsStore] = None
+_compaction: Optional[threading.Thread] = None
+
+
+def get_metrics_store() -> MetricsStore:
+    global _store
+    if _store is None:
+        _store = MetricsStore(
+            METRICS_DIR,
+            minute_retention=int(METRICS_MINUTE_RETENTION_DAYS * 86400),
+            fanin=METRICS_COMPACT_SEGMENTS,
+        )
+    return _store
+
+
+def _epoch(value: Union[str, int, float, datetime]) -> int:
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, (int, float)):
+        return int(value)
+    else:
+        try:
+            moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"Invalid timestamp '{value}'")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def _iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+def ingest_metric_points(points: List[Dict[str, Any]]) -> int:
+    """
+    Appends data points { campaign_id, influencer_id, metric, ts, value }
+    (ts: ISO-8601 or epoch seconds) as one segment.
+    Raises ValueError on an invalid point; nothing is written in that case.
+    Starts a background compaction when a size tier holds
+    METRICS_COMPACT_SEGMENTS segments.
+    Returns the number of points stored.
+    """
+    if len(points) > MAX_INGEST_POINTS:
+        raise ValueError(f"At most {MAX_INGEST_POINTS} points can be ingested at once")
+    rows = []
+    for n, point in enumerate(points):
+        metric = point.get("metric") or ""
+        if not _METRIC_NAME.match(metric):
+            raise ValueError(f"Point {n}: invalid metric name '{metric}'")
+        if not point.get("campaign_id") or not point.get("influencer_id"):
+            raise ValueError(f"Point {n}: campaign_id and influencer_id are required")
+        try:
+            value = float(point["value"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Point {n}: value must be a number")
+        rows.append((point["campaign_id"], point["influencer_id"], metric, _epoch(point["ts"]), value))
+    store = get_metrics_store()
+    stored = store.append(rows)
+    if store.compaction_due():
+        _compact_in_background()
+    return stored
+
+
+def _compact_in_background() -> None:
+    global _compaction
+    if _compaction is not None and _compaction.is_alive():
+        return
+    _compaction = threading.Thread(target=compact_metrics, name="metrics-compaction", daemon=True)
+    _compaction.start()
+
+
+def pick_resolution(start: int, end: int, max_points: int = MAX_CHART_POINTS, minute_horizon: int = 0) -> str:
+    for name, step in RESOLUTIONS.items():
+        if name == "minute" and start < minute_horizon:
+            continue
+        if (end - start) / step <= max_points:
+            return name
+    return "day"
+
+
+def get_metric_series(
+    campaign_id: str,
+    metric: str,
+    start: Union[str, int, datetime],
+    end: Optional[Union[str, int, datetime]] = None,
+    resolution: str = "auto",
+    influencer_ids: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Chart data for one metric of a campaign (optionally limited to some
+    influencers) in [start, end), read from a single rollup level:
+      { campaign_id, metric, resolution, start, end, points: [{ t, sum, count, min, max, avg, last }] }
+    `resolution` is minute, hour, day or auto; minute is only available
+    within the last METRICS_MINUTE_RETENTION_DAYS.
+    """
+    start_ts = _epoch(start)
+    end_ts = _epoch(end) if end is not None else int(datetime.now(timezone.utc).timestamp()) + 1
+    if end_ts <= start_ts:
+        raise ValueError("end must be after start")
+    store = get_metrics_store()
+    horizon = store.minute_horizon()
+    if resolution == "auto":
+        resolution = pick_resolution(start_ts, end_ts, minute_horizon=horizon)
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Invalid resolution '{resolution}'. Expected auto, {', '.join(RESOLUTIONS)}")
+    if resolution == "minute" and start_ts < horizon:
+        raise ValueError(f"Minute resolution is only kept for the last {METRICS_MINUTE_RETENTION_DAYS:g} days")
+
+    store.refresh()
+    buckets = store.query(campaign_id, metric, start_ts, end_ts, resolution, influencer_ids)
+    for bucket in buckets:
+        bucket["avg"] = bucket["sum"] / bucket["count"] if bucket["count"] else None
+        bucket["t"] = _iso(bucket["t"])
+    return {
+        "campaign_id": campaign_id,
+        "metric": metric,
+        "resolution": resolution,
+        "start": _iso(start_ts),
+        "end": _iso(end_ts),
+        "points": buckets,
+    }
+
+
+def list_campaign_metrics(campaign_id: str) -> List[str]:
+    store = get_metrics_store()
+    store.refresh()
+    return store.metrics(campaign_id)
+
+
+def compact_metrics() -> int:
+    """
+    Merges full size tiers of metric segments and snapshots their rollups;
+    returns how many segments were replaced.
+    """
+    return get_metrics_store().compact()
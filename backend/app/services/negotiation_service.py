@@ -1,9 +1,12 @@
 # backend/app/services/negotiation_service.py
 
+import asyncio
 import os
 from typing import Dict, Optional
 
-from app.services.supabase_client import supabase
+from app.services.db import db
+from app.services.campaign_service import get_campaign_by_id
+from app.services.influencer_service import get_influencer_by_id
 from app.config import OPENAI_API_KEY
 
 
@@ -11,58 +14,40 @@ from app.config import OPENAI_API_KEY
 # OpenAI setup (assumes you’ve already set OPENAI_API_KEY in env)
 import openai
 # openai.api_key = os.getenv("OPENAI_API_KEY", "")
-openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
+async_openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
 
-def _fetch_campaign_budget(campaign_id: str) -> Optional[float]:
+async def _fetch_campaign_budget(campaign_id: str) -> Optional[float]:
     """
     Helper to get the campaign's budget as a float.
     """
-    resp = (
-        supabase.table("campaign")
-        .select("budget")
-        .eq("id", campaign_id)
-        .single()
-        .execute()
-    )
-    if resp and not getattr(resp, "error", None) and resp.data:
-        return float(resp.data.get("budget", 0))
+    campaign = await get_campaign_by_id(campaign_id)
+    if campaign:
+        return float(campaign.get("budget") or 0)
     return None
 
 
-def _fetch_influencer_rate(influencer_id: str) -> Optional[float]:
+async def _fetch_influencer_rate(influencer_id: str) -> Optional[float]:
     """
     Helper to get the influencer's rate_per_post as a float.
     """
-    resp = (
-        supabase.table("influencer")
-        .select("rate_per_post")
-        .eq("id", influencer_id)
-        .single()
-        .execute()
-    )
-    if resp and not getattr(resp, "error", None) and resp.data:
-        return float(resp.data.get("rate_per_post", 0))
+    influencer = await get_influencer_by_id(influencer_id)
+    if influencer:
+        return float(influencer.get("rate_per_post") or 0)
     return None
 
 
-def _fetch_campaign_deliverables(campaign_id: str) -> Optional[list]:
+async def _fetch_campaign_deliverables(campaign_id: str) -> Optional[list]:
     """
     Helper to get the campaign's deliverables array.
     Returns the Python list, or empty list if none.
     """
-    resp = (
-        supabase.table("campaign")
-        .select("deliverables")   # assume deliverables is a text[] or JSONB array
-        .eq("id", campaign_id)
-        .single()
-        .execute()
-    )
-    if resp and not getattr(resp, "error", None) and resp.data:
-        return resp.data.get("deliverables", []) or []
+    campaign = await get_campaign_by_id(campaign_id)
+    if campaign:
+        return campaign.get("deliverables", []) or []
     return []
 
 
-def add_negotiation_message(
+async def add_negotiation_message(
     campaign_id: str,
     influencer_id: str,
     sender_type: str,
@@ -78,13 +63,13 @@ def add_negotiation_message(
         "sender_type": sender_type,
         "message": message,
     }
-    resp = supabase.table("negotiations").insert(data).execute()
+    resp = await db().table("negotiations").insert(data).execute()
     if resp and not getattr(resp, "error", None) and resp.data:
         return resp.data[0]
     return None
 
 
-def business_ai_response(
+async def business_ai_response(
     campaign_id: str,
     influencer_id: str,
     incoming_message: str
@@ -101,9 +86,15 @@ def business_ai_response(
     """
 
     # 1) Fetch budget, influencer rate, and deliverables
-    budget = _fetch_campaign_budget(campaign_id) or 0.0
-    infl_rate = _fetch_influencer_rate(influencer_id) or 0.0
-    deliverables = _fetch_campaign_deliverables(campaign_id) or []
+    # Issued together so the request's dataloader sends one query per table
+    budget, infl_rate, deliverables = await asyncio.gather(
+        _fetch_campaign_budget(campaign_id),
+        _fetch_influencer_rate(influencer_id),
+        _fetch_campaign_deliverables(campaign_id),
+    )
+    budget = budget or 0.0
+    infl_rate = infl_rate or 0.0
+    deliverables = deliverables or []
     num_deliverables = len(deliverables)
 
     # 2) Calculate total cost
@@ -144,7 +135,7 @@ def business_ai_response(
 
     # 5) Call OpenAI to generate a response
     try:
-        chat_resp = openai_client.chat.completions.create(
+        chat_resp = await async_openai_client.chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a helpful negotiation assistant for brand-influencer talks."},
@@ -174,7 +165,7 @@ def business_ai_response(
             )
 
     # 7) Insert the AI response into negotiations table
-    inserted = add_negotiation_message(
+    inserted = await add_negotiation_message(
         campaign_id=campaign_id,
         influencer_id=influencer_id,
         sender_type="business",
@@ -184,7 +175,7 @@ def business_ai_response(
         return ai_text
     return None
 
-def handle_influencer_message_and_counter(
+async def handle_influencer_message_and_counter(
     campaign_id: str,
     influencer_id: str,
     influencer_message: str
@@ -196,7 +187,7 @@ def handle_influencer_message_and_counter(
     """
 
     # a) Insert influencer’s message
-    inf_inserted = add_negotiation_message(
+    inf_inserted = await add_negotiation_message(
         campaign_id=campaign_id,
         influencer_id=influencer_id,
         sender_type="influencer",
@@ -206,13 +197,13 @@ def handle_influencer_message_and_counter(
         return None
 
     # b) Generate & insert business reply
-    return business_ai_response(campaign_id, influencer_id, influencer_message)
+    return await business_ai_response(campaign_id, influencer_id, influencer_message)
 
-def list_negotiation_messages(campaign_id: str, influencer_id: str) -> Optional[list]:
+async def list_negotiation_messages(campaign_id: str, influencer_id: str) -> Optional[list]:
     """
     List all negotiations for a given campaign.
     Returns a list of negotiation rows, or None on failure.
     """
-    resp = supabase.table("negotiations").select("*").eq("campaign_id", campaign_id).eq("influencer_id", influencer_id).execute()
+    resp = await db().table("negotiations").select("*").eq("campaign_id", campaign_id).eq("influencer_id", influencer_id).execute()
     return resp.data if resp and not getattr(resp, "error", None) else None
 
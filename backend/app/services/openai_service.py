@@ -4,6 +4,8 @@ from dotenv import load_dotenv
 from app.config import OPENAI_API_KEY
 
 openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
+# Async client for fan-out work (bulk outreach) so many completions can be in flight at once
+async_openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
 
 def get_creator_recommendations(prompt: str) -> str:
     response = openai_client.chat.completions.create(
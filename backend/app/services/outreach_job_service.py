@@ -0,0 +1,438 @@
+# backend/app/services/outreach_job_service.py
+#
+# Bulk outreach: one campaign brief, many creators.
+# Emails are rendered from one cached LLM template per brief (default) or
+# generated per creator with bounded concurrency, then handed through a queue
+# to a delivery stage that batches them into the mail outbox
+# (mail_delivery_service). Per-creator status lives in the
+# `outreach_message` table so failed creators can be retried later.
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.services.db import db
+from app.services.outreach_service import generate_outreach_email_async
+from app.services.mail_delivery_service import enqueue_emails
+from app.services.profile_service import resolve_profiles
+from app.services.outreach_template_service import (
+    get_outreach_template_async,
+    render_outreach_email,
+)
+
+DEFAULT_CONCURRENCY = 20
+MAX_CONCURRENCY = 200
+# Status rows are written in batches instead of one UPDATE per creator
+STATUS_FLUSH_SIZE = 200
+# Generated emails are inserted into the mail outbox this many at a time
+OUTBOX_ENQUEUE_BATCH = 200
+# Pending status rows are inserted this many per request
+INSERT_CHUNK_SIZE = 1000
+
+# Personalization modes: render every email from one cached LLM template,
+# or ask the LLM to write each email from scratch
+MODE_TEMPLATE = "template"
+MODE_PER_CREATOR = "per_creator"
+
+# Per-creator statuses
+PENDING = "Pending"
+QUEUED = "Queued"   # handed to the mail outbox
+FAILED = "Failed"
+
+# Finished jobs stay in the registry this long so late progress streams and
+# summaries still see their live counters; after that the DB is the source
+JOB_RETENTION_SECONDS = float(os.getenv("OUTREACH_JOB_RETENTION_SECONDS", "3600"))
+
+# In-process registry of jobs started by this worker (for progress streaming)
+_jobs: Dict[str, "OutreachJob"] = {}
+
+
+class OutreachJob:
+    """
+    In-memory view of a running bulk outreach job: counters plus an append-only
+    event log that progress streams replay from.
+    """
+
+    def __init__(self, job_id: str, campaign_id: str, brief: str, total: int, mode: str = MODE_TEMPLATE):
+        self.id = job_id
+        self.campaign_id = campaign_id
+        self.brief = brief
+        self.total = total
+        self.mode = mode
+        self.status = "Running"
+        self.counts = {PENDING: total, QUEUED: 0, FAILED: 0}
+        self.events: List[Dict[str, Any]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Condition()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "campaign_id": self.campaign_id,
+            "status": self.status,
+            "mode": self.mode,
+            "total": self.total,
+            "queued": self.counts[QUEUED],
+            "failed": self.counts[FAILED],
+            "pending": self.counts[PENDING],
+        }
+
+    async def record(self, creator_id: str, status: str, error: Optional[str] = None) -> None:
+        self.counts[PENDING] -= 1
+        self.counts[status] += 1
+        event = {"creator_id": creator_id, "status": status}
+        if error:
+            event["error"] = error
+        await self._publish(event)
+
+    async def finish(self, error: Optional[str] = None) -> None:
+        """
+        Marks the job done and ends every progress stream. `error` means the
+        pipeline itself failed (creators it never reached stay Pending, so a
+        retry picks them up).
+        """
+        if error is not None:
+            self.status = "Failed"
+        else:
+            self.status = "Completed" if self.counts[FAILED] == 0 else "Completed with errors"
+        self.finished_at = time.monotonic()
+        event = {"type": "done", **self.summary()}
+        if error is not None:
+            event["error"] = error
+        await self._publish(event)
+
+    async def _publish(self, event: Dict[str, Any]) -> None:
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields every event from the start of the job, then live events until it finishes.
+        """
+        cursor = 0
+        while True:
+            async with self._changed:
+                while cursor >= len(self.events):
+                    await self._changed.wait()
+                batch = self.events[cursor:]
+            cursor += len(batch)
+            for event in batch:
+                yield event
+                if event.get("type") == "done":
+                    return
+
+
+class _StatusWriter:
+    """
+    Buffers per-creator status rows and upserts them in batches.
+    """
+
+    def __init__(self, job: OutreachJob, attempts: Dict[str, int]):
+        self.job = job
+        self.attempts = attempts
+        self.rows: List[Dict[str, Any]] = []
+
+    async def add(self, creator_id: str, status: str, subject: str = None, body: str = None, error: str = None) -> None:
+        self.rows.append({
+            "job_id": self.job.id,
+            "campaign_id": self.job.campaign_id,
+            "influencer_id": creator_id,
+            "status": status,
+            "subject": subject,
+            "body": body,
+            "error": error,
+            "attempts": self.attempts.get(creator_id, 0) + 1,
+            "updated_at": datetime.utcnow().isoformat(),
+        })
+        if len(self.rows) >= STATUS_FLUSH_SIZE:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        await (
+            db().table("outreach_message")
+            .upsert(rows, on_conflict="job_id,influencer_id")
+            .execute()
+        )
+
+
+# ----- DB helpers -----
+
+
+def _chunks(items: List[str], size: int = INSERT_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+async def _campaign_creator_ids(campaign_id: str) -> List[str]:
+    resp = await (
+        db().table("campaign_influencer")
+        .select("influencer_id")
+        .eq("campaign_id", campaign_id)
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None):
+        return []
+    return [r["influencer_id"] for r in resp.data or []]
+
+
+async def _create_job_rows(campaign_id: str, brief: str, creator_ids: List[str]) -> str:
+    resp = await (
+        db().table("outreach_job")
+        .insert({"campaign_id": campaign_id, "brief": brief, "status": "Running", "total": len(creator_ids)})
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None) or not resp.data:
+        raise RuntimeError("Failed to create outreach job")
+    job_id = resp.data[0]["id"]
+
+    for chunk in _chunks(creator_ids):
+        await db().table("outreach_message").insert(
+            [
+                {"job_id": job_id, "campaign_id": campaign_id, "influencer_id": cid, "status": PENDING, "attempts": 0}
+                for cid in chunk
+            ],
+            returning="minimal",
+        ).execute()
+    return job_id
+
+
+async def _load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    resp = await (
+        db().table("outreach_job")
+        .select("id, campaign_id, brief, status, total")
+        .eq("id", job_id)
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None) or not resp.data:
+        return None
+    return resp.data[0]
+
+
+async def _failed_messages(job_id: str) -> Dict[str, int]:
+    """
+    Returns {influencer_id: attempts} for every creator not yet handed to the outbox.
+    """
+    resp = await (
+        db().table("outreach_message")
+        .select("influencer_id, attempts")
+        .eq("job_id", job_id)
+        .in_("status", [FAILED, PENDING])
+        .execute()
+    )
+    if resp is None or getattr(resp, "error", None):
+        return {}
+    return {r["influencer_id"]: r.get("attempts") or 0 for r in resp.data or []}
+
+
+async def _update_job_status(job: OutreachJob) -> None:
+    await db().table("outreach_job").update(
+        {"status": job.status, "updated_at": datetime.utcnow().isoformat()}
+    ).eq("id", job.id).execute()
+
+
+# ----- Pipeline -----
+
+
+async def _run_job(job: OutreachJob, creator_ids: List[str], attempts: Dict[str, int], concurrency: int) -> None:
+    writer = _StatusWriter(job, attempts)
+    error: Optional[str] = None
+    try:
+        await _run_pipeline(job, writer, creator_ids, concurrency)
+    except BaseException as e:
+        error = str(e) or type(e).__name__
+        raise
+    finally:
+        try:
+            await writer.flush()
+        finally:
+            await job.finish(error)
+            await _update_job_status(job)
+
+
+async def _run_pipeline(job: OutreachJob, writer: "_StatusWriter", creator_ids: List[str], concurrency: int) -> None:
+    profiles = await resolve_profiles(creator_ids)
+    templates = await get_outreach_template_async(job.brief) if job.mode == MODE_TEMPLATE else None
+    semaphore = asyncio.Semaphore(concurrency)
+    # Bounded so generation cannot run arbitrarily far ahead of delivery
+    handoff: asyncio.Queue = asyncio.Queue(maxsize=max(concurrency * 2, OUTBOX_ENQUEUE_BATCH))
+
+    async def generate(creator_id: str) -> None:
+        async with semaphore:
+            try:
+                profile = profiles.get(creator_id) or {"name": f"Creator {creator_id}"}
+                if templates is not None:
+                    subject, body = render_outreach_email(templates, profile)
+                else:
+                    subject, body = await generate_outreach_email_async(profile["name"], job.brief)
+            except Exception as e:
+                await writer.add(creator_id, FAILED, error=f"generation: {e}")
+                await job.record(creator_id, FAILED, error=str(e))
+                return
+        await handoff.put((creator_id, subject, body))
+
+    async def enqueue(batch: List[tuple]) -> None:
+        messages = []
+        for creator_id, subject, body in batch:
+            to_email = (profiles.get(creator_id) or {}).get("email")
+            if not to_email:
+                await writer.add(creator_id, FAILED, subject, body, error="delivery: no email address")
+                await job.record(creator_id, FAILED, error="no email address")
+                continue
+            messages.append({
+                "job_id": job.id,
+                "influencer_id": creator_id,
+                "to_email": to_email,
+                "subject": subject,
+                "body": body,
+            })
+        if not messages:
+            return
+        try:
+            await asyncio.to_thread(enqueue_emails, messages)
+        except Exception as e:
+            for m in messages:
+                await writer.add(m["influencer_id"], FAILED, m["subject"], m["body"], error=f"delivery: {e}")
+                await job.record(m["influencer_id"], FAILED, error=str(e))
+            return
+        for m in messages:
+            await writer.add(m["influencer_id"], QUEUED, m["subject"], m["body"])
+            await job.record(m["influencer_id"], QUEUED)
+
+    async def deliver() -> None:
+        # Hand generated emails to the mail outbox in batches (one insert per batch)
+        done = False
+        while not done:
+            batch = []
+            item = await handoff.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= OUTBOX_ENQUEUE_BATCH or handoff.empty():
+                    break
+                item = handoff.get_nowait()
+            done = item is None
+            if batch:
+                await enqueue(batch)
+
+    delivery_task = asyncio.create_task(deliver())
+    generators = [asyncio.create_task(generate(cid)) for cid in creator_ids]
+    producing = asyncio.gather(*generators)
+    try:
+        # Delivery only ends early by failing: stop at its error or the first generator's
+        await asyncio.wait({producing, delivery_task}, return_when=asyncio.FIRST_COMPLETED)
+        if delivery_task.done():
+            delivery_task.result()
+        await producing
+        await handoff.put(None)
+        await delivery_task
+    finally:
+        # Nothing of this job may keep running once its final status is written
+        pending = [t for t in (*generators, delivery_task) if not t.done()]
+        for task in pending:
+            task.cancel()
+        # Also retrieves producing's error, which asyncio would log otherwise
+        await asyncio.gather(*pending, producing, return_exceptions=True)
+
+
+def _register(job: OutreachJob) -> None:
+    """
+    Adds `job` to the registry and drops jobs finished more than
+    JOB_RETENTION_SECONDS ago.
+    """
+    cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+    for job_id in [j.id for j in _jobs.values() if j.finished_at is not None and j.finished_at < cutoff]:
+        del _jobs[job_id]
+    _jobs[job.id] = job
+
+
+def _clamp(concurrency: Optional[int]) -> int:
+    return max(1, min(concurrency or DEFAULT_CONCURRENCY, MAX_CONCURRENCY))
+
+
+async def start_bulk_outreach(
+    campaign_id: str,
+    brief: str,
+    creator_ids: Optional[List[str]] = None,
+    concurrency: Optional[int] = None,
+    mode: str = MODE_TEMPLATE,
+) -> OutreachJob:
+    """
+    Creates an outreach job for `creator_ids` (default: every influencer linked to
+    the campaign), persists one Pending row per creator and starts the pipeline
+    in the background. Returns immediately with the job handle.
+    """
+    if mode not in (MODE_TEMPLATE, MODE_PER_CREATOR):
+        raise ValueError(f"Unknown outreach mode: {mode}")
+    if creator_ids is None:
+        creator_ids = await _campaign_creator_ids(campaign_id)
+    creator_ids = list(dict.fromkeys(creator_ids))  # de-duplicate, keep order
+    if not creator_ids:
+        raise ValueError("No creators selected for outreach")
+
+    job_id = await _create_job_rows(campaign_id, brief, creator_ids)
+    job = OutreachJob(job_id, campaign_id, brief, len(creator_ids), mode)
+    _register(job)
+    job.task = asyncio.create_task(_run_job(job, creator_ids, {}, _clamp(concurrency)))
+    return job
+
+
+async def retry_failed_outreach(
+    job_id: str,
+    concurrency: Optional[int] = None,
+    mode: str = MODE_TEMPLATE,
+) -> Optional[OutreachJob]:
+    """
+    Re-runs generation + delivery for every creator of the job that is still
+    Failed or Pending (e.g. after a crash). Returns None if the job does not exist.
+    """
+    current = _jobs.get(job_id)
+    if current is not None and current.status == "Running":
+        raise ValueError("Job is still running")
+
+    row = await _load_job(job_id)
+    if row is None:
+        return None
+
+    attempts = await _failed_messages(job_id)
+    job = OutreachJob(job_id, row["campaign_id"], row.get("brief") or "", len(attempts), mode)
+    _register(job)
+    if not attempts:
+        await job.finish()
+        return job
+
+    job.task = asyncio.create_task(_run_job(job, list(attempts), attempts, _clamp(concurrency)))
+    return job
+
+
+def get_outreach_job(job_id: str) -> Optional[OutreachJob]:
+    return _jobs.get(job_id)
+
+
+async def get_outreach_job_summary(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Live counters if the job ran in this process, otherwise counts from the DB.
+    """
+    job = _jobs.get(job_id)
+    if job is not None:
+        return job.summary()
+
+    row = await _load_job(job_id)
+    if row is None:
+        return None
+    resp = await db().table("outreach_message").select("status").eq("job_id", job_id).execute()
+    statuses = [r.get("status") for r in (resp.data or [])] if resp else []
+    return {
+        "job_id": job_id,
+        "campaign_id": row["campaign_id"],
+        "status": row.get("status"),
+        "total": row.get("total") or len(statuses),
+        "queued": statuses.count(QUEUED),
+        "failed": statuses.count(FAILED),
+        "pending": statuses.count(PENDING),
+    }
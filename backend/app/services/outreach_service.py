@@ -1,30 +1,79 @@
+import asyncio
 import openai
+import json
 from app.config import OPENAI_API_KEY
-from app.services.openai_service import openai_client
+from app.services.openai_service import async_openai_client
+from app.services.mail_delivery_service import enqueue_emails
+from app.services.profile_service import resolve_profile
 from app.utils.mock_data import MOCK_CREATORS
 
-def send_outreach_email(campaign_id: int, creator_id: int, brief: str) -> dict:
-    creator = next((c for c in MOCK_CREATORS if c['id'] == creator_id), None)
-    creator_name = creator['name'] if creator else f'Creator {creator_id}'
-    prompt = f"""
+OUTREACH_SYSTEM_PROMPT = "You are an expert outreach manager drafting emails to creators."
+DEFAULT_SUBJECT = 'Collaboration Opportunity'
+
+_MOCK_CREATORS_BY_ID = {c['id']: c for c in MOCK_CREATORS}
+
+
+def build_outreach_prompt(creator_name: str, brief: str) -> str:
+    return f"""
 You are an expert outreach manager. Write a personalized email (subject and body) to {creator_name} about a campaign. The campaign brief is: {brief}
 Return the subject and body as JSON with keys 'subject' and 'body'.
 """
-    response = openai_client.chat.completions.create(
+
+
+def parse_outreach_reply(content: str) -> tuple:
+    """
+    GPT is asked for {"subject", "body"} JSON; fall back to using the raw text as the body.
+    """
+    try:
+        result = json.loads(content)
+        subject = result.get('subject', DEFAULT_SUBJECT)
+        body = result.get('body', '')
+    except Exception:
+        subject = DEFAULT_SUBJECT
+        body = content
+    return subject, body
+
+
+async def generate_outreach_email_async(creator_name: str, brief: str) -> tuple:
+    """
+    The GPT call behind send_outreach_email and bulk outreach jobs.
+    Returns (subject, body).
+    """
+    response = await async_openai_client.chat.completions.create(
         model="gpt-4o",
         messages=[
-            {"role": "system", "content": "You are an expert outreach manager drafting emails to creators."},
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": OUTREACH_SYSTEM_PROMPT},
+            {"role": "user", "content": build_outreach_prompt(creator_name, brief)}
         ],
         max_tokens=300
     )
-    import json
-    try:
-        result = json.loads(response.choices[0].message.content)
-        subject = result.get('subject', 'Collaboration Opportunity')
-        body = result.get('body', '')
-    except Exception:
-        subject = 'Collaboration Opportunity'
-        body = response.choices[0].message.content
-    print('Sending email to creator_id:', creator_id, 'subject:', subject)
-    return {"success": True, "subject": subject, "body": body} 
\ No newline at end of file
+    return parse_outreach_reply(response.choices[0].message.content)
+
+
+def deliver_outreach_email(creator_id, subject: str, body: str, to_email: str = None) -> None:
+    """
+    Queues the email in the mail outbox for the delivery worker.
+    Mock creators have no address, so those are only logged.
+    """
+    if not to_email:
+        print('Sending email to creator_id:', creator_id, 'subject:', subject)
+        return
+    enqueue_emails([{"to_email": to_email, "subject": subject, "body": body}])
+
+
+async def resolve_creator(creator_id) -> dict:
+    """
+    Real influencers are looked up by UUID through the cached profile resolver;
+    integer ids refer to the demo MOCK_CREATORS.
+    """
+    if isinstance(creator_id, int) or str(creator_id).isdigit():
+        return _MOCK_CREATORS_BY_ID.get(int(creator_id))
+    return await resolve_profile(creator_id)
+
+
+async def send_outreach_email(campaign_id, creator_id, brief: str) -> dict:
+    creator = await resolve_creator(creator_id)
+    creator_name = creator['name'] if creator else f'Creator {creator_id}'
+    subject, body = await generate_outreach_email_async(creator_name, brief)
+    await asyncio.to_thread(deliver_outreach_email, creator_id, subject, body, (creator or {}).get('email'))
+    return {"success": True, "subject": subject, "body": body}
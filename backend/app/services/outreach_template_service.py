@@ -0,0 +1,185 @@
+# backend/app/services/outreach_template_service.py
+#
+# Template-once, render-many outreach personalization.
+# GPT writes ONE Jinja template per campaign brief (cached); every creator's
+# email is then rendered locally from their profile fields, so an outreach wave
+# costs ~1 LLM call instead of one per creator.
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import TemplateSyntaxError, meta
+from jinja2.sandbox import SandboxedEnvironment
+
+from app.services.openai_service import async_openai_client
+from app.services.outreach_service import OUTREACH_SYSTEM_PROMPT
+
+# Bump when the prompt or the variable set changes so cached templates are rebuilt
+TEMPLATE_VERSION = 1
+TEMPLATE_CACHE_SIZE = 256
+
+# Variables a template may reference (filled from the influencer row)
+TEMPLATE_VARIABLES = ("name", "platform", "niche", "followers")
+
+DEFAULT_SUBJECT_TEMPLATE = "Collaboration opportunity for {{ name }}"
+DEFAULT_BODY_TEMPLATE = (
+    "Hi {{ name }},\n\n"
+    "We love your {{ niche }} content on {{ platform }} and think your {{ followers }} followers "
+    "would be a great fit for our upcoming campaign.\n\n"
+    "{{ brief }}\n\n"
+    "Would you be open to a quick chat about a collaboration?\n\n"
+    "Best regards,\nThe InfluencerFlow team"
+)
+
+PLATFORM_NAMES = {"youtube": "YouTube", "tiktok": "TikTok", "instagram": "Instagram", "twitter": "Twitter"}
+
+# LLM-written templates are untrusted input, so render them in a sandbox
+_env = SandboxedEnvironment(autoescape=False, keep_trailing_newline=True)
+
+# brief hash -> (subject template, body template); LRU-bounded
+_template_cache: "OrderedDict[str, Tuple[Any, Any]]" = OrderedDict()
+_inflight: Dict[str, asyncio.Lock] = {}
+
+
+def _cache_key(brief: str) -> str:
+    return hashlib.sha256(f"v{TEMPLATE_VERSION}:{brief}".encode("utf-8")).hexdigest()
+
+
+def _build_template_prompt(brief: str) -> str:
+    placeholders = ", ".join("{{ %s }}" % v for v in TEMPLATE_VARIABLES)
+    return f"""
+You are an expert outreach manager. Write ONE reusable outreach email (subject and body) for a campaign that will be sent to many creators.
+The campaign brief is: {brief}
+Personalize it ONLY with these Jinja placeholders: {placeholders}.
+Do not use any other placeholders, loops or conditionals.
+Return the subject and body as JSON with keys 'subject' and 'body'.
+"""
+
+
+def _compile(subject_src: str, body_src: str, brief: str) -> Optional[Tuple[Any, Any]]:
+    """
+    Compiles the LLM's templates, rejecting syntax errors and unknown variables.
+    """
+    allowed = set(TEMPLATE_VARIABLES) | {"brief"}
+    try:
+        for src in (subject_src, body_src):
+            if not meta.find_undeclared_variables(_env.parse(src)) <= allowed:
+                return None
+        return (
+            _env.from_string(subject_src, globals={"brief": brief}),
+            _env.from_string(body_src, globals={"brief": brief}),
+        )
+    except TemplateSyntaxError:
+        return None
+
+
+def _templates_from_reply(content: str, brief: str) -> Optional[Tuple[Any, Any]]:
+    try:
+        result = json.loads(content)
+        return _compile(result.get("subject", ""), result.get("body", ""), brief)
+    except Exception:
+        return None
+
+
+def _default_templates(brief: str) -> Tuple[Any, Any]:
+    return _compile(DEFAULT_SUBJECT_TEMPLATE, DEFAULT_BODY_TEMPLATE, brief)
+
+
+def _remember(key: str, templates: Tuple[Any, Any]) -> Tuple[Any, Any]:
+    _template_cache[key] = templates
+    _template_cache.move_to_end(key)
+    while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+        _template_cache.popitem(last=False)
+    return templates
+
+
+def _cached(key: str) -> Optional[Tuple[Any, Any]]:
+    templates = _template_cache.get(key)
+    if templates is not None:
+        _template_cache.move_to_end(key)
+    return templates
+
+
+def _template_messages(brief: str) -> list:
+    return [
+        {"role": "system", "content": OUTREACH_SYSTEM_PROMPT},
+        {"role": "user", "content": _build_template_prompt(brief)},
+    ]
+
+
+async def get_outreach_template_async(brief: str) -> Tuple[Any, Any]:
+    """
+    Returns the compiled (subject, body) templates for this brief, asking GPT
+    only on a cache miss; concurrent callers for the same brief share a single
+    LLM call. If GPT fails or writes an unusable template, the built-in one is
+    returned but not cached, so the next call asks again.
+    """
+    key = _cache_key(brief)
+    templates = _cached(key)
+    if templates is not None:
+        return templates
+
+    lock = _inflight.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            templates = _cached(key)
+            if templates is not None:
+                return templates
+            try:
+                response = await async_openai_client.chat.completions.create(
+                    model="gpt-4o", messages=_template_messages(brief), max_tokens=400
+                )
+                templates = _templates_from_reply(response.choices[0].message.content, brief)
+            except Exception:
+                templates = None
+            if templates is None:
+                return _default_templates(brief)
+            return _remember(key, templates)
+    finally:
+        if _inflight.get(key) is lock and not lock.locked():
+            _inflight.pop(key, None)
+
+
+def _format_followers(count: int) -> str:
+    if count >= 1_000_000:
+        return f"{count / 1_000_000:.1f}M".replace(".0M", "M")
+    if count >= 1_000:
+        return f"{count / 1_000:.1f}K".replace(".0K", "K")
+    return str(count)
+
+
+def creator_template_context(creator: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Maps an influencer row to template variables. The top platform is the
+    social_media entry with the largest audience (followers or subscribers).
+    """
+    top_platform, top_audience = None, 0
+    for platform, stats in (creator.get("social_media") or {}).items():
+        stats = stats if isinstance(stats, dict) else {}
+        audience = stats.get("followers") or stats.get("subscribers") or 0
+        try:
+            audience = int(audience)
+        except (TypeError, ValueError):
+            audience = 0
+        if top_platform is None or audience > top_audience:
+            top_platform, top_audience = platform, audience
+
+    categories = creator.get("categories") or []
+    return {
+        "name": creator.get("name") or "there",
+        "platform": PLATFORM_NAMES.get(top_platform, top_platform.capitalize()) if top_platform else "social media",
+        "niche": categories[0] if categories else "creator",
+        "followers": _format_followers(top_audience) if top_audience else "growing",
+    }
+
+
+def render_outreach_email(templates: Tuple[Any, Any], creator: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Renders (subject, body) for one creator locally — no LLM call.
+    """
+    subject_tpl, body_tpl = templates
+    context = creator_template_context(creator)
+    return subject_tpl.render(**context).strip(), body_tpl.render(**context)
@@ -1,19 +1,39 @@
 # backend/app/services/payment_service.py
 
+import os
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from app.services.supabase_client import supabase
+from postgrest.exceptions import APIError
 
+from app.services.db import db
 
-def get_payment_history(campaign_id: str, influencer_id: str) -> List[Dict]:
+# Upper bound on lines per bulk payout call (one RPC, one INSERT)
+MAX_PAYOUT_LINES = 2000
+# Pending orders reserve balance; after this long they are treated as
+# abandoned and expired, releasing the reservation (006_payment_ledger.sql)
+PENDING_PAYMENT_TTL_HOURS = float(os.getenv("PENDING_PAYMENT_TTL_HOURS", "24"))
+
+
+def _rejected(e: APIError) -> bool:
+    """
+    True when Postgres rejected the request itself: a RAISE EXCEPTION in the
+    function (P0001, e.g. an amount over the remaining balance) or bad input
+    data (class 22, e.g. a malformed uuid). Anything else is an
+    infrastructure failure the client may retry.
+    """
+    code = str(getattr(e, "code", "") or "")
+    return code == "P0001" or code.startswith("22")
+
+
+async def get_payment_history(campaign_id: str, influencer_id: str) -> List[Dict]:
     """
     Returns a list of all payments (rows) for this campaign+influencer.
     Each row: { id, amount, status, razorpay_order_id, razorpay_payment_id, razorpay_signature, created_at }
     """
-    resp = (
-        supabase.table("payments")
+    resp = await (
+        db().table("payments")
         .select("id, amount, status, razorpay_order_id, razorpay_payment_id, razorpay_signature, created_at")
         .eq("campaign_id", campaign_id)
         .eq("influencer_id", influencer_id)
@@ -25,63 +45,61 @@ def get_payment_history(campaign_id: str, influencer_id: str) -> List[Dict]:
     return resp.data or []
 
 
-def create_mock_order(
-    campaign_id: str,
-    influencer_id: str,
-    payment_amount: float
-) -> Dict:
+async def get_payment_balance(campaign_id: str, influencer_id: str) -> Dict:
     """
-    1) Verify that campaign_influencer exists and retrieve the agreed total rate_per_post (or total)
-    2) Ensure payment_amount <= remaining balance
-    3) Generate a mock order_id
-    4) Insert new row in 'payments' with status='Pending', amount=payment_amount
-    5) Return { order_id, amount (paise), currency, key_id }
+    Returns the materialized ledger totals for this campaign+influencer:
+      { paid_total, pending_total }  (zeros if nothing was ever ordered)
     """
-
-    # 1) Fetch the agreed total from campaign_influencer
-    ji_resp = (
-        supabase.table("campaign_influencer")
-        .select("rate_per_post")
+    resp = await (
+        db().table("payment_ledger")
+        .select("paid_total, pending_total")
         .eq("campaign_id", campaign_id)
         .eq("influencer_id", influencer_id)
         .execute()
     )
-    if ji_resp is None or getattr(ji_resp, "error", None) or not ji_resp.data:
-        raise RuntimeError("campaign_influencer link not found")
-
-    row_data = ji_resp.data
-    if isinstance(row_data, list) and len(row_data) > 0:
-        agreed_total = row_data[0].get("rate_per_post")
-    else:
-        agreed_total = row_data.get("rate_per_post")
-
-    if agreed_total is None or agreed_total <= 0:
-        raise RuntimeError("Invalid agreed total for payment")
+    if resp is None or getattr(resp, "error", None) or not resp.data:
+        return {"paid_total": 0, "pending_total": 0}
+    return resp.data[0]
 
-    # 2) Compute already paid
-    hist = get_payment_history(campaign_id, influencer_id)
-    already_paid = sum(r.get("amount", 0) for r in hist if r.get("status") == "Paid")
 
-    remaining = agreed_total - already_paid
-    if payment_amount <= 0 or payment_amount > remaining:
-        raise RuntimeError(f"Invalid payment amount. Remaining: {remaining}")
+async def create_mock_order(
+    campaign_id: str,
+    influencer_id: str,
+    payment_amount: float
+) -> Dict:
+    """
+    1) Generate a mock order_id
+    2) create_payment_order() (006_payment_ledger.sql) atomically checks the
+       agreed rate_per_post against the ledger's paid + pending totals and
+       inserts the 'Pending' payments row — one round trip, no read/insert race
+    3) Return { order_id, amount (paise), currency, key_id }
+    Raises ValueError when the order is rejected (no link, amount over the
+    remaining balance) and RuntimeError when the database call fails.
+    """
 
-    # 3) Generate mock order ID
+    # 1) Generate mock order ID
     mock_order_id = f"order_mock_{uuid.uuid4().hex}"
 
-    # 4) Insert new payment row with status='Pending'
-    insert_data = {
-        "campaign_id": campaign_id,
-        "influencer_id": influencer_id,
-        "amount": payment_amount,
-        "status": "Pending",
-        "razorpay_order_id": mock_order_id,
-    }
-    p_resp = supabase.table("payments").insert(insert_data).execute()
+    # 2) Balance check + insert, server-side
+    try:
+        p_resp = await db().rpc(
+            "create_payment_order",
+            {
+                "p_campaign_id": campaign_id,
+                "p_influencer_id": influencer_id,
+                "p_amount": payment_amount,
+                "p_order_id": mock_order_id,
+                "p_pending_ttl_hours": PENDING_PAYMENT_TTL_HOURS,
+            },
+        ).execute()
+    except APIError as e:
+        if _rejected(e):
+            raise ValueError(e.message or "Invalid payment order")
+        raise RuntimeError(e.message or "Failed to create payment record")
     if p_resp is None or getattr(p_resp, "error", None) or not p_resp.data:
         raise RuntimeError("Failed to create payment record")
 
-    # 5) Return info for frontend
+    # 3) Return info for frontend
     amount_paise = int(payment_amount * 100)
     return {
         "order_id": mock_order_id,
@@ -91,45 +109,71 @@ def create_mock_order(
     }
 
 
-def mark_payment_success(
-    razorpay_order_id: str,
-    razorpay_payment_id: str,
-    razorpay_signature: str
-) -> bool:
+async def create_bulk_payout(campaign_id: str, payouts: List[Dict]) -> Dict:
     """
-    1) Look up the payments row by razorpay_order_id
-    2) Update status = 'Paid', store payment_id & signature, updated_at
-    3) Return True if successful
+    Settles many influencers of one campaign in one round trip.
+    payouts: [ { influencer_id, amount }, … ]
+    create_payout_batch() (008_bulk_payout.sql) validates every line against
+    the ledger in one query and bulk-inserts the valid ones as 'Paid'.
+    Returns { campaign_id, paid, failed, total_paid, results: [ {line,
+    influencer_id, amount, ok, error, payment_id, razorpay_order_id}, … ] }.
+    Raises ValueError for a batch rejected as a whole and RuntimeError when
+    the database call fails.
     """
-    resp = (
-        supabase.table("payments")
-        .select("id, status")
-        .eq("razorpay_order_id", razorpay_order_id)
-        .execute()
-    )
-    if resp is None or getattr(resp, "error", None) or not resp.data:
-        return False
+    if len(payouts) > MAX_PAYOUT_LINES:
+        raise ValueError(f"At most {MAX_PAYOUT_LINES} payouts per request")
+
+    lines = [{"influencer_id": p["influencer_id"], "amount": p["amount"]} for p in payouts]
+    try:
+        resp = await db().rpc(
+            "create_payout_batch",
+            {"p_campaign_id": campaign_id, "p_lines": lines, "p_pending_ttl_hours": PENDING_PAYMENT_TTL_HOURS},
+        ).execute()
+    except APIError as e:
+        if _rejected(e):
+            raise ValueError(e.message or "Invalid payout batch")
+        raise RuntimeError(e.message or "Failed to create payouts")
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("Failed to create payouts")
 
-    payment_rows = resp.data
-    payment_row = payment_rows[0] if isinstance(payment_rows, list) else payment_rows
+    results = resp.data or []
+    paid = [r for r in results if r.get("ok")]
+    return {
+        "campaign_id": campaign_id,
+        "paid": len(paid),
+        "failed": len(results) - len(paid),
+        "total_paid": sum(float(r.get("amount") or 0) for r in paid),
+        "results": results,
+    }
 
-    if payment_row.get("status") != "Pending":
-        return False
 
-    payment_id = payment_row.get("id")
+async def mark_payment_success(
+    razorpay_order_id: str,
+    razorpay_payment_id: str,
+    razorpay_signature: str
+) -> Optional[Dict]:
+    """
+    One conditional update: status 'Pending' -> 'Paid' for this order, storing
+    payment_id & signature. The status guard makes a duplicate or concurrent
+    verify a no-op. An 'Expired' order (abandoned, then paid after all) is
+    still marked Paid: the money was captured, and reconciliation flags any
+    overpayment. Returns the updated payments row, or None if the order does
+    not exist or was not Pending / Expired.
+    """
     update_data = {
         "status": "Paid",
         "razorpay_payment_id": razorpay_payment_id,
         "razorpay_signature": razorpay_signature,
         "updated_at": datetime.utcnow().isoformat(),
     }
-    upd_resp = (
-        supabase.table("payments")
+    upd_resp = await (
+        db().table("payments")
         .update(update_data)
-        .eq("id", payment_id)
+        .eq("razorpay_order_id", razorpay_order_id)
+        .in_("status", ["Pending", "Expired"])
         .execute()
     )
-    if upd_resp is None or getattr(upd_resp, "error", None):
-        return False
+    if upd_resp is None or getattr(upd_resp, "error", None) or not upd_resp.data:
+        return None
 
-    return True
+    return upd_resp.data[0]
@@ -0,0 +1,56 @@
+# backend/app/services/profile_service.py
+#
+# Influencer profile resolver shared by outreach, recommendations and contracts.
+# Profiles are read through the influencer entity cache (the one process-wide
+# cache of influencer rows, also used by influencer_service, which invalidates
+# it on writes); missing ids are batch-fetched with one `in_()` query per chunk,
+# so resolving thousands of creators for a bulk send costs a handful of queries.
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from app.services.repository import repository
+from app.utils.entity_cache import EntityCache
+
+# Public profile columns (never password_hash)
+PROFILE_FIELDS = (
+    "id", "name", "username", "email", "bio", "profile_picture_url", "location",
+    "social_media", "categories", "rate_per_post", "availability",
+)
+# Max ids per `in_()` filter so the query string stays well under URL limits
+ID_CHUNK_SIZE = 500
+
+# Full influencer rows by id
+influencer_cache = EntityCache("influencer")
+
+
+async def _load_rows(ids: List[Hashable]) -> Dict[Hashable, Dict[str, Any]]:
+    rows: Dict[Hashable, Dict[str, Any]] = {}
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        try:
+            chunk = await repository().select("influencer", {"id": ids[start : start + ID_CHUNK_SIZE]})
+        except RuntimeError:
+            continue
+        for row in chunk:
+            rows[str(row["id"])] = row
+    return rows
+
+
+def _profile(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: row[field] for field in PROFILE_FIELDS if field in row}
+
+
+async def resolve_profiles(influencer_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns {influencer_id: profile} for every id that exists.
+    Cached ids cost nothing; the rest are fetched in chunks of ID_CHUNK_SIZE.
+    """
+    ids = [str(i) for i in influencer_ids if i is not None]
+    rows = await influencer_cache.get_many(ids, _load_rows)
+    return {influencer_id: _profile(row) for influencer_id, row in rows.items()}
+
+
+async def resolve_profile(influencer_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Single-id convenience wrapper around resolve_profiles().
+    """
+    return (await resolve_profiles([influencer_id])).get(str(influencer_id))
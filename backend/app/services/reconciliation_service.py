@@ -0,0 +1,233 @@
+# backend/app/services/reconciliation_service.py
+#
+# Reconciles payments against campaign_influencer (agreed rate, payment_status
+# flag) and payment_ledger.
+#
+# payments, campaign_influencer and payment_ledger are each streamed in keyset
+# pages ordered by (campaign_id, influencer_id), then merge-joined, so only one
+# page per table and one (campaign, influencer) group are in memory however
+# many payment rows there are. Issues are written to a JSON Lines report as
+# they are found.
+
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.services.payment_service import PENDING_PAYMENT_TTL_HOURS
+from app.services.supabase_client import supabase
+from app.utils.keyset import iter_keyset
+
+RECON_PAGE_SIZE = int(os.getenv("RECON_PAGE_SIZE", "1000"))
+STALE_PENDING_HOURS = float(os.getenv("STALE_PENDING_HOURS", "24"))
+RECON_REPORT_DIR = os.getenv(
+    "RECON_REPORT_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "reconciliation"),
+)
+# Amounts are numeric in Postgres but arrive as floats
+AMOUNT_TOLERANCE = 0.005
+
+ISSUE_TYPES = (
+    "overpaid",            # paid_total > agreed rate_per_post
+    "paid_flag_false",     # fully paid but campaign_influencer.payment_status is false
+    "flag_true_unpaid",    # payment_status true but paid_total < agreed rate
+    "stale_pending",       # Pending payment older than STALE_PENDING_HOURS
+    "ledger_mismatch",     # payment_ledger totals differ from the payments table
+    "orphan_payment",      # payments for a (campaign, influencer) with no link row
+)
+
+Key = Tuple[str, str]
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _keyed(rows: Iterator[Dict[str, Any]]) -> Iterator[Tuple[Key, Dict[str, Any]]]:
+    for row in rows:
+        yield (str(row["campaign_id"]), str(row["influencer_id"])), row
+
+
+def _payment_groups(page_size: int) -> Iterator[Tuple[Key, Dict[str, Any]]]:
+    """
+    Streams payments ordered by (campaign_id, influencer_id, id) and yields one
+    aggregate per pair: { paid_total, pending_total, count, pending: [rows] }.
+    """
+    rows = iter_keyset(
+        lambda: supabase.table("payments")
+        .select("id, campaign_id, influencer_id, amount, status, created_at")
+        .not_.is_("campaign_id", "null")
+        .not_.is_("influencer_id", "null"),
+        ("campaign_id", "influencer_id", "id"),
+        page_size,
+    )
+    current: Optional[Key] = None
+    group: Dict[str, Any] = {}
+    for key, row in _keyed(rows):
+        if key != current:
+            if current is not None:
+                yield current, group
+            current = key
+            group = {"paid_total": 0.0, "pending_total": 0.0, "count": 0, "pending": []}
+        amount = float(row.get("amount") or 0)
+        group["count"] += 1
+        if row.get("status") == "Paid":
+            group["paid_total"] += amount
+        elif row.get("status") == "Pending":
+            group["pending_total"] += amount
+            group["pending"].append(row)
+    if current is not None:
+        yield current, group
+
+
+def _merge(*streams: Iterator[Tuple[Key, Dict[str, Any]]]) -> Iterator[Tuple[Key, List[Optional[Dict[str, Any]]]]]:
+    """
+    Full outer merge-join of streams sorted by key; yields (key, [item or None per stream]).
+    """
+    heads = [next(s, None) for s in streams]
+    while any(h is not None for h in heads):
+        key = min(h[0] for h in heads if h is not None)
+        items: List[Optional[Dict[str, Any]]] = []
+        for i, head in enumerate(heads):
+            if head is not None and head[0] == key:
+                items.append(head[1])
+                heads[i] = next(streams[i], None)
+            else:
+                items.append(None)
+        yield key, items
+
+
+def _check_pair(
+    key: Key,
+    payments: Optional[Dict[str, Any]],
+    link: Optional[Dict[str, Any]],
+    ledger: Optional[Dict[str, Any]],
+    stale_before: datetime,
+) -> Iterator[Dict[str, Any]]:
+    campaign_id, influencer_id = key
+    paid = payments["paid_total"] if payments else 0.0
+    pending = payments["pending_total"] if payments else 0.0
+    base = {"campaign_id": campaign_id, "influencer_id": influencer_id}
+
+    if link is None:
+        if payments:
+            yield {**base, "type": "orphan_payment", "paid_total": paid, "pending_total": pending}
+    else:
+        agreed = link.get("rate_per_post")
+        flag = bool(link.get("payment_status"))
+        totals = {**base, "agreed_total": agreed, "paid_total": paid, "pending_total": pending}
+        if agreed is not None and paid > float(agreed) + AMOUNT_TOLERANCE:
+            yield {**totals, "type": "overpaid", "excess": round(paid - float(agreed), 2)}
+        if agreed and paid >= float(agreed) - AMOUNT_TOLERANCE and not flag:
+            yield {**totals, "type": "paid_flag_false"}
+        if flag and (not agreed or paid < float(agreed) - AMOUNT_TOLERANCE):
+            yield {**totals, "type": "flag_true_unpaid"}
+
+    for row in (payments or {}).get("pending", []):
+        created_at = _parse_time(row.get("created_at"))
+        if created_at is not None and created_at < stale_before:
+            yield {
+                **base,
+                "type": "stale_pending",
+                "payment_id": row["id"],
+                "amount": row.get("amount"),
+                "created_at": row.get("created_at"),
+            }
+
+    if ledger is not None or payments:
+        ledger_paid = float((ledger or {}).get("paid_total") or 0)
+        ledger_pending = float((ledger or {}).get("pending_total") or 0)
+        if abs(ledger_paid - paid) > AMOUNT_TOLERANCE or abs(ledger_pending - pending) > AMOUNT_TOLERANCE:
+            yield {
+                **base,
+                "type": "ledger_mismatch",
+                "paid_total": paid,
+                "pending_total": pending,
+                "ledger_paid_total": ledger_paid,
+                "ledger_pending_total": ledger_pending,
+            }
+
+
+def expire_pending_payments(ttl_hours: float = PENDING_PAYMENT_TTL_HOURS) -> int:
+    """
+    Marks every Pending payment older than `ttl_hours` as Expired, releasing
+    the balance it reserved (expire_pending_payments() in
+    006_payment_ledger.sql). Returns the number of payments expired.
+    """
+    resp = supabase.rpc("expire_pending_payments", {"p_ttl_hours": ttl_hours}).execute()
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("Failed to expire pending payments")
+    return int(resp.data or 0)
+
+
+def reconcile_payments(
+    page_size: int = RECON_PAGE_SIZE,
+    stale_pending_hours: float = STALE_PENDING_HOURS,
+    report_path: Optional[str] = None,
+    expire_pending: bool = True,
+) -> Dict[str, Any]:
+    """
+    Runs a full reconciliation and writes every issue as one JSON line to
+    `report_path` (default RECON_REPORT_DIR/<report_id>.jsonl). Unless
+    `expire_pending` is False, abandoned Pending payments (older than
+    PENDING_PAYMENT_TTL_HOURS) are expired first.
+    Returns { report_id, report_path, pairs_checked, payments_scanned,
+              expired_pending, issues: {type: count}, started_at, finished_at }.
+    """
+    report_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "_" + uuid.uuid4().hex[:8]
+    if report_path is None:
+        os.makedirs(RECON_REPORT_DIR, exist_ok=True)
+        report_path = os.path.join(RECON_REPORT_DIR, f"{report_id}.jsonl")
+
+    started_at = datetime.now(timezone.utc)
+    expired = expire_pending_payments() if expire_pending else 0
+    stale_before = started_at - timedelta(hours=stale_pending_hours)
+    counts = {t: 0 for t in ISSUE_TYPES}
+    pairs = 0
+    scanned = 0
+
+    links = _keyed(iter_keyset(
+        lambda: supabase.table("campaign_influencer")
+        .select("campaign_id, influencer_id, rate_per_post, payment_status"),
+        ("campaign_id", "influencer_id"),
+        page_size,
+    ))
+    ledgers = _keyed(iter_keyset(
+        lambda: supabase.table("payment_ledger")
+        .select("campaign_id, influencer_id, paid_total, pending_total"),
+        ("campaign_id", "influencer_id"),
+        page_size,
+    ))
+
+    with open(report_path, "w") as report:
+        for key, (payments, link, ledger) in _merge(_payment_groups(page_size), links, ledgers):
+            pairs += 1
+            scanned += payments["count"] if payments else 0
+            for issue in _check_pair(key, payments, link, ledger, stale_before):
+                counts[issue["type"]] += 1
+                report.write(json.dumps(issue, default=str) + "\n")
+
+    return {
+        "report_id": report_id,
+        "report_path": os.path.abspath(report_path),
+        "pairs_checked": pairs,
+        "payments_scanned": scanned,
+        "expired_pending": expired,
+        "issues": counts,
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def reconciliation_report_path(report_id: str) -> Optional[str]:
+    """
+    Path of a report written to RECON_REPORT_DIR, or None if it does not exist.
+    """
+    if not report_id or os.path.basename(report_id) != report_id:
+        return None
+    path = os.path.join(RECON_REPORT_DIR, f"{report_id}.jsonl")
+    return path if os.path.exists(path) else None
@@ -0,0 +1,375 @@
+# backend/app/services/repository.py
+#
+# Storage backends for the hot request paths: key lookups (everything the
+# request DataLoader in dataloader.py fetches) and the compare-and-set
+# updates of campaign_state_service.py.
+#
+# A Repository only knows two operations on plain dict rows:
+#
+#     await repository().select("influencer", {"id": ["a", "b"]})
+#     await repository().update("campaign_influencer", {"status": "Signed"},
+#                               {"campaign_id": c, "influencer_id": i, "status": ["Ready to Sign Contract"]})
+#
+# where a list value means "column is one of" and a scalar means equality.
+# DB_BACKEND picks the implementation:
+#
+#   supabase  (default) PostgREST over HTTP through the pooled client in db.py
+#   postgres  asyncpg pool straight to DATABASE_URL; statements are written with
+#             `= ANY($n)` so their text does not depend on how many keys are
+#             asked for, and asyncpg's per-connection statement cache keeps
+#             them prepared (binary protocol)
+#   sqlite    a local SQLite file (SQLITE_PATH, default in-memory) for offline
+#             tests and benchmarks; rows are stored as JSON documents
+#
+# Everything else still talks to PostgREST through db(); with the postgres
+# backend both reach the same database.
+
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+PG_POOL_MIN_SIZE = int(os.getenv("PG_POOL_MIN_SIZE", "2"))
+PG_POOL_MAX_SIZE = int(os.getenv("PG_POOL_MAX_SIZE", "10"))
+PG_STATEMENT_CACHE_SIZE = int(os.getenv("PG_STATEMENT_CACHE_SIZE", "256"))
+SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")
+
+Where = Dict[str, Any]
+
+
+class Repository:
+    name = "base"
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def select(self, table: str, where: Where, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rows of `table` matching `where` (all columns).
+        """
+        raise NotImplementedError
+
+    async def update(self, table: str, changes: Dict[str, Any], where: Where) -> List[Dict[str, Any]]:
+        """
+        Applies `changes` to the rows matching `where` in one statement and
+        returns the updated rows.
+        """
+        raise NotImplementedError
+
+
+def _is_list(value: Any) -> bool:
+    return isinstance(value, (list, tuple, set, frozenset))
+
+
+# ----- Supabase (PostgREST) -----
+
+
+def _db():
+    # Imported on use: the supabase client module needs SUPABASE_URL at
+    # import time, which the sqlite and postgres backends do not
+    from app.services.db import db
+
+    return db()
+
+
+class SupabaseRepository(Repository):
+    name = "supabase"
+
+    @staticmethod
+    def _filter(query, where: Where):
+        for column, value in where.items():
+            if _is_list(value):
+                query = query.in_(column, list(value))
+            else:
+                query = query.eq(column, value)
+        return query
+
+    async def select(self, table: str, where: Where, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query = self._filter(_db().table(table).select("*"), where)
+        if limit is not None:
+            query = query.limit(limit)
+        resp = await query.execute()
+        if resp is None or getattr(resp, "error", None):
+            raise RuntimeError(f"DB error when selecting from {table}")
+        return resp.data or []
+
+    async def update(self, table: str, changes: Dict[str, Any], where: Where) -> List[Dict[str, Any]]:
+        resp = await self._filter(_db().table(table).update(changes), where).execute()
+        if resp is None or getattr(resp, "error", None):
+            raise RuntimeError(f"DB error when updating {table}")
+        return resp.data or []
+
+
+# ----- Postgres (asyncpg) -----
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _where_sql(where: Where, first_param: int) -> Tuple[str, List[Any]]:
+    clauses, args = [], []
+    for n, (column, value) in enumerate(where.items(), start=first_param):
+        if _is_list(value):
+            clauses.append(f"{_ident(column)} = ANY(${n})")
+            args.append(list(value))
+        else:
+            clauses.append(f"{_ident(column)} = ${n}")
+            args.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+def _jsonable(value: Any) -> Any:
+    # Same shapes PostgREST would have sent back as JSON
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if asyncpg is not None and isinstance(value, asyncpg.Range):
+        lower = "[" if value.lower_inc else "("
+        upper = "]" if value.upper_inc else ")"
+        return f"{lower}{value.lower or ''},{value.upper or ''}{upper}"
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+async def _init_connection(conn) -> None:
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+    # ids travel as strings, as they do through PostgREST
+    await conn.set_type_codec("uuid", encoder=str, decoder=str, schema="pg_catalog", format="text")
+
+
+class PostgresRepository(Repository):
+    name = "postgres"
+
+    def __init__(self, dsn: str = DATABASE_URL, min_size: int = PG_POOL_MIN_SIZE, max_size: int = PG_POOL_MAX_SIZE):
+        if asyncpg is None:
+            raise RuntimeError("DB_BACKEND=postgres needs the asyncpg package")
+        if not dsn:
+            raise RuntimeError("DB_BACKEND=postgres needs DATABASE_URL")
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+
+    async def open(self) -> None:
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                statement_cache_size=PG_STATEMENT_CACHE_SIZE,
+                init=_init_connection,
+            )
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+
+    async def _fetch(self, sql: str, args: List[Any]) -> List[Dict[str, Any]]:
+        if self._pool is None:
+            await self.open()
+        records = await self._pool.fetch(sql, *args)
+        return [{k: _jsonable(v) for k, v in record.items()} for record in records]
+
+    async def select(self, table: str, where: Where, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        where_sql, args = _where_sql(where, 1)
+        sql = f"SELECT * FROM {_ident(table)}{where_sql}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return await self._fetch(sql, args)
+
+    async def update(self, table: str, changes: Dict[str, Any], where: Where) -> List[Dict[str, Any]]:
+        columns = list(changes)
+        assignments = ", ".join(f"{_ident(c)} = ${n}" for n, c in enumerate(columns, start=1))
+        where_sql, args = _where_sql(where, len(columns) + 1)
+        sql = f"UPDATE {_ident(table)} SET {assignments}{where_sql} RETURNING *"
+        return await self._fetch(sql, [changes[c] for c in columns] + args)
+
+
+# ----- SQLite -----
+
+# Composite primary keys; every other table is keyed on "id"
+SQLITE_KEYS: Dict[str, Tuple[str, ...]] = {
+    "campaign_influencer": ("campaign_id", "influencer_id"),
+    "payment_ledger": ("campaign_id", "influencer_id"),
+    "idempotency_keys": ("scope", "key"),
+    "campaign_summary": ("campaign_id",),
+}
+
+
+class SqliteRepository(Repository):
+    """
+    One table per entity: the primary key columns plus the row as a JSON
+    document, so any row shape can be stored without a schema. Filters on
+    other columns use json_extract(). Queries run on the event loop thread:
+    a key lookup in a local file takes microseconds, less than handing it to
+    a worker thread would.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._tables: set = set()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+
+    def _table(self, table: str) -> Tuple[str, ...]:
+        keys = SQLITE_KEYS.get(table, ("id",))
+        if table not in self._tables:
+            columns = ", ".join(f"{_ident(k)} TEXT NOT NULL" for k in keys)
+            primary = ", ".join(_ident(k) for k in keys)
+            self._connection().execute(
+                f"CREATE TABLE IF NOT EXISTS {_ident(table)} ({columns}, doc TEXT NOT NULL, PRIMARY KEY ({primary}))"
+            )
+            self._tables.add(table)
+        return keys
+
+    @staticmethod
+    def _param(value: Any) -> Any:
+        return value if value is None or isinstance(value, (int, float)) else str(value)
+
+    def _where_sql(self, keys: Tuple[str, ...], where: Where) -> Tuple[str, List[Any]]:
+        clauses, args = [], []
+        for column, value in where.items():
+            target = _ident(column) if column in keys else f"json_extract(doc, '$.\"{column}\"')"
+            if _is_list(value):
+                values = [self._param(v) for v in value]
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{target} IN ({', '.join('?' * len(values))})")
+                args.extend(values)
+            else:
+                clauses.append(f"{target} = ?")
+                args.append(self._param(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def seed(self, table: str, rows: Sequence[Dict[str, Any]]) -> None:
+        """
+        Inserts (or replaces) rows; offline tests and benchmarks only.
+        """
+        keys = self._table(table)
+        placeholders = ", ".join("?" * (len(keys) + 1))
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {_ident(table)} VALUES ({placeholders})",
+                [[str(row[k]) for k in keys] + [json.dumps(row, default=str)] for row in rows],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            conn.close()
+            self._tables.clear()
+
+    async def select(self, table: str, where: Where, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        keys = self._table(table)
+        where_sql, args = self._where_sql(keys, where)
+        sql = f"SELECT doc FROM {_ident(table)}{where_sql}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [json.loads(doc) for (doc,) in self._connection().execute(sql, args)]
+
+    async def update(self, table: str, changes: Dict[str, Any], where: Where) -> List[Dict[str, Any]]:
+        keys = self._table(table)
+        where_sql, args = self._where_sql(keys, where)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            updated = []
+            for rowid, doc in conn.execute(f"SELECT rowid, doc FROM {_ident(table)}{where_sql}", args).fetchall():
+                row = {**json.loads(doc), **changes}
+                conn.execute(
+                    f"UPDATE {_ident(table)} SET doc = ? WHERE rowid = ?",
+                    (json.dumps(row, default=str), rowid),
+                )
+                updated.append(row)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return updated
+
+
+# ----- Selection -----
+
+BACKENDS = {
+    "supabase": SupabaseRepository,
+    "postgres": PostgresRepository,
+    "sqlite": SqliteRepository,
+}
+
+_repository: Optional[Repository] = None
+
+
+def create_repository(backend: str = DB_BACKEND) -> Repository:
+    try:
+        return BACKENDS[backend]()
+    except KeyError:
+        raise ValueError(f"Unknown DB_BACKEND '{backend}'; expected one of {', '.join(BACKENDS)}")
+
+
+async def open_repository() -> Repository:
+    """
+    Creates the configured backend; called once from the FastAPI lifespan.
+    """
+    global _repository
+    if _repository is None:
+        _repository = create_repository()
+    await _repository.open()
+    return _repository
+
+
+async def close_repository() -> None:
+    global _repository
+    if _repository is not None:
+        repo, _repository = _repository, None
+        await repo.close()
+
+
+def repository() -> Repository:
+    """
+    The worker's Repository; created on first use outside the app (the
+    postgres backend opens its pool on the first query).
+    """
+    global _repository
+    if _repository is None:
+        _repository = create_repository()
+    return _repository
+
+
+def use_repository(repo: Optional[Repository]) -> None:
+    """
+    Installs `repo` as the worker's Repository (scripts and benchmarks).
+    """
+    global _repository
+    _repository = repo
@@ -0,0 +1,63 @@
+# backend/app/utils/blob_store.py
+#
+# Minimal content-addressed blob storage for generated artifacts (contract PDFs).
+# DiskBlobStore is the default; MemoryBlobStore stands in for an object store
+# (S3 / Supabase Storage) in scripts and benchmarks.
+
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+
+class DiskBlobStore:
+    """
+    Stores blobs as <root>/<key[:2]>/<key><suffix>. Writes are atomic
+    (temp file + rename), so concurrent readers never see partial files.
+    """
+
+    def __init__(self, root: str, suffix: str = ""):
+        self.root = root
+        self.suffix = suffix
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+
+class MemoryBlobStore:
+    def __init__(self):
+        self._blobs: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._blobs.get(key)
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._blobs[key] = data
+
+    def exists(self, key: str) -> bool:
+        return key in self._blobs
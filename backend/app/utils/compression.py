@@ -0,0 +1,189 @@
+# backend/app/utils/compression.py
+#
+# Response compression (brotli or gzip, whichever the client prefers).
+#
+# - Bodies under COMPRESSION_MIN_SIZE bytes go out as they are: for a small
+#   JSON object the headers cost more than compression saves.
+# - Only text-like content types are compressed; PDFs, zips and images are
+#   compressed already.
+# - Streamed responses (NDJSON progress, report downloads) are compressed
+#   chunk by chunk with a sync flush after each one, so clients still see
+#   every event as soon as it is sent.
+# - A strong ETag becomes weak on a compressed response, since the bytes on
+#   the wire no longer match the entity it was computed for.
+#
+# brotli is optional; without it only gzip is offered.
+
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+# 4 is brotli's sweet spot for dynamic content: better than gzip -6, about as fast
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/jsonl", "text/")
+_NO_BODY_STATUSES = (204, 304)
+
+
+class _Gzip:
+    def __init__(self):
+        # wbits=31: gzip container rather than raw zlib
+        self._z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Brotli:
+    def __init__(self):
+        self._b = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._b.process(data)
+        return out + (self._b.finish() if final else self._b.flush())
+
+
+ENCODERS = {"gzip": _Gzip}
+if brotli is not None:
+    ENCODERS["br"] = _Brotli
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    The encoding from ENCODERS the client ranks highest in Accept-Encoding
+    (brotli wins ties), or None.
+    """
+    ranked: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name == "*":
+            for known in ENCODERS:
+                ranked.setdefault(known, q)
+        elif name in ENCODERS:
+            ranked[name] = q
+    candidates = [(q, name == "br", name) for name, q in ranked.items() if q > 0]
+    return max(candidates)[2] if candidates else None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    return ENCODERS[encoding]().compress(data, final=True)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope.get("headers") or []:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[dict] = None
+        self.encoder = None
+        self.passthrough = False
+
+    @staticmethod
+    def _compressible(start: dict, headers: List[Tuple[bytes, bytes]]) -> bool:
+        if start["status"] in _NO_BODY_STATUSES:
+            return False
+        content_type = b""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        return content_type.decode("latin-1").startswith(COMPRESSIBLE_TYPES)
+
+    def _encoded_headers(self, headers: List[Tuple[bytes, bytes]], length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+        out = []
+        vary = None
+        for name, value in headers:
+            if name == b"content-length":
+                continue
+            if name == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            if name == b"vary":
+                vary = value
+                continue
+            out.append((name, value))
+        out.append((b"content-encoding", self.encoding.encode("latin-1")))
+        out.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+        if length is not None:
+            out.append((b"content-length", str(length).encode("latin-1")))
+        return out
+
+    async def __call__(self, message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            return
+
+        if self.encoder is not None:
+            # Streaming: headers are out, compress chunk by chunk
+            if kind == "http.response.body":
+                more_body = message.get("more_body", False)
+                message = {
+                    "type": kind,
+                    "body": self.encoder.compress(message.get("body", b""), final=not more_body),
+                    "more_body": more_body,
+                }
+            await self.send(message)
+            return
+
+        # First message after the response start decides
+        start, self.start = self.start, None
+        headers = list(start.get("headers") or []) if start else []
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if (
+            start is None
+            or kind != "http.response.body"
+            or not self._compressible(start, headers)
+            or (not more_body and len(body) < self.minimum_size)
+        ):
+            if start is not None:
+                await self.send(start)
+            self.passthrough = True
+            await self.send(message)
+            return
+
+        self.encoder = ENCODERS[self.encoding]()
+        data = self.encoder.compress(body, final=not more_body)
+        length = None if more_body else len(data)
+        await self.send({**start, "headers": self._encoded_headers(headers, length)})
+        await self.send({"type": kind, "body": data, "more_body": more_body})
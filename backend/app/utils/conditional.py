@@ -0,0 +1,210 @@
+# backend/app/utils/conditional.py
+#
+# Conditional GET (RFC 9110 validators) for JSON reads.
+#
+# A row's version is its updated_at (kept current by the triggers in
+# app/db/010_updated_at_triggers.sql), so a client's If-None-Match /
+# If-Modified-Since can be checked against a narrow `select id, updated_at`
+# probe: a 304 costs neither the full row nor its serialization. ETags are
+# weak (W/"..."): they name the row version, not the exact bytes, which may
+# differ with projection-free rendering or compression.
+#
+# updated_at is normalized before it is hashed: PostgREST trims trailing zeros
+# of fractional seconds ("...:54.12+00:00") while the asyncpg backend renders
+# all six digits, and the probe and the full row may come from either.
+#
+# Rows without an updated_at fall back to a hash of their content; that still
+# saves the bandwidth, just not the row fetch.
+#
+# A page's ETag covers the (id, updated_at) of every row on it and whether a
+# next page exists, so edits, inserts and deletes within the page all change
+# it. Pages carry no Last-Modified: their newest updated_at does not move
+# when a row leaves the page.
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from starlette.responses import Response
+
+from app.utils.responses import ORJSONResponse
+
+Validators = Tuple[str, Optional[datetime]]   # (ETag, Last-Modified)
+
+CACHE_CONTROL = "private, no-cache"   # always revalidate; dashboards poll
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison: "*" matches anything, and W/ prefixes are ignored.
+    """
+    if not if_none_match:
+        return False
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def weak_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    A PostgREST timestamptz (ISO-8601) as an aware datetime, or None.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def version_text(value: Any) -> str:
+    """
+    A timestamp version in one canonical form (UTC, isoformat()), so the same
+    instant rendered by different backends compares and hashes equal.
+    """
+    parsed = parse_timestamp(value)
+    return parsed.astimezone(timezone.utc).isoformat() if parsed else str(value)
+
+
+def is_conditional(headers: Mapping[str, str]) -> bool:
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    If-None-Match wins when present; If-Modified-Since is only consulted
+    without it, at the one-second precision of HTTP dates.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(validators: Validators) -> Dict[str, str]:
+    etag, last_modified = validators
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def row_validators(kind: str, row: Dict[str, Any]) -> Optional[Validators]:
+    """
+    Validators from a row's id + updated_at, or None when it has no updated_at.
+    """
+    updated_at = row.get("updated_at")
+    if not updated_at:
+        return None
+    return weak_etag(kind, row.get("id"), version_text(updated_at)), parse_timestamp(updated_at)
+
+
+def page_validators(kind: str, fields: Optional[str], page: Dict[str, Any]) -> Optional[Validators]:
+    """
+    Validators of one page ({ items, next_cursor }) from its rows' ids and
+    updated_at, or None when a row lacks updated_at.
+    """
+    versions: List[Tuple[Any, Any]] = []
+    for row in page["items"]:
+        if not row.get("updated_at"):
+            return None
+        versions.append((row.get("id"), version_text(row["updated_at"])))
+    return weak_etag(kind, fields or "*", versions, page["next_cursor"] is not None), None
+
+
+def _not_modified(validators: Validators) -> Response:
+    return Response(status_code=304, headers=cache_headers(validators))
+
+
+async def conditional_row(
+    headers: Mapping[str, str],
+    kind: str,
+    probe: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    load: Callable[[Optional[str]], Awaitable[Optional[Dict[str, Any]]]],
+    envelope: str,
+) -> Optional[Response]:
+    """
+    GET of one row: 304 when the client's validators still match, otherwise
+    200 with { envelope: row } and fresh validators. Returns None when the row
+    does not exist.
+
+    probe() returns { id, updated_at } only; load(updated_at) returns the full
+    row, reloading a cached copy older than the probed version.
+    """
+    updated_at = None
+    if is_conditional(headers):
+        version = await probe()
+        if version is None:
+            return None
+        validators = row_validators(kind, version)
+        if validators is not None and is_not_modified(headers, *validators):
+            return _not_modified(validators)
+        updated_at = version.get("updated_at")
+
+    row = await load(updated_at)
+    if row is None:
+        return None
+    validators = row_validators(kind, row) or (weak_etag(kind, row), None)
+    if is_conditional(headers) and is_not_modified(headers, *validators):
+        return _not_modified(validators)
+    return ORJSONResponse({envelope: row}, headers=cache_headers(validators))
+
+
+async def conditional_page(
+    headers: Mapping[str, str],
+    kind: str,
+    fields: Optional[str],
+    probe: Callable[[], Awaitable[Dict[str, Any]]],
+    load: Callable[[], Awaitable[Dict[str, Any]]],
+    render: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> Response:
+    """
+    GET of one list page. probe() returns the same page with only id and
+    updated_at selected; it runs when the client sent validators, or when
+    `fields` leaves updated_at out of the full page. render(page) builds the
+    response body.
+    """
+    validators = None
+    if is_conditional(headers) or not _selects_updated_at(fields):
+        validators = page_validators(kind, fields, await probe())
+        if validators is not None and is_not_modified(headers, *validators):
+            return _not_modified(validators)
+
+    page = await load()
+    body = render(page)
+    if validators is None:
+        validators = page_validators(kind, fields, page) or (weak_etag(kind, body), None)
+        if is_conditional(headers) and is_not_modified(headers, *validators):
+            return _not_modified(validators)
+    return ORJSONResponse(body, headers=cache_headers(validators))
+
+
+def _selects_updated_at(fields: Optional[str]) -> bool:
+    if not fields or fields.strip() == "*":
+        return True
+    return "updated_at" in {f.strip() for f in fields.split(",")}
@@ -0,0 +1,249 @@
+# backend/app/utils/contract_renderer.py
+#
+# Process-wide caches for contract rendering.
+#
+# - Jinja templates are compiled once per (name, CONTRACT_TEMPLATE_VERSION,
+#   file mtime), so neither a version bump nor an edited template file can
+#   serve a stale compiled template.
+# - TTF fonts are registered with ReportLab once per process.
+# - Text is wrapped by measured width (cached per font/size/word) instead of
+#   a fixed character count, and the static parts of the terms contract are
+#   laid out once per version and reused for every document.
+
+import io
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, Template
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+# Bump whenever a template or render_contract_pdf's layout changes; it is part
+# of the template cache key and of the contract fingerprint (PDF cache key).
+CONTRACT_TEMPLATE_VERSION = 2
+
+TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), "templates")
+
+# Optional TTF overrides; the PDF standard Times fonts need no registration
+FONT_REGULAR = os.getenv("CONTRACT_FONT", "Times-Roman")
+FONT_BOLD = os.getenv("CONTRACT_FONT_BOLD", "Times-Bold")
+FONT_REGULAR_TTF = os.getenv("CONTRACT_FONT_TTF")
+FONT_BOLD_TTF = os.getenv("CONTRACT_FONT_BOLD_TTF")
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+X_MARGIN = 40
+MAX_LINE_WIDTH = PAGE_WIDTH - 2 * X_MARGIN
+
+TERMS_AND_CONDITIONS = (
+    "1. Influencer agrees to deliver the above content by the agreed dates.",
+    "2. Brand will pay the agreed rate within 30 days of submission.",
+    "3. Usage rights remain with the Brand for marketing purposes.",
+    "4. This contract is governed by applicable local laws.",
+)
+
+_env = Environment(loader=FileSystemLoader(TEMPLATES_PATH), auto_reload=False)
+_templates: Dict[Tuple[str, int, int], Template] = {}
+_registered_fonts = set()
+_lock = threading.Lock()
+
+
+# ——— Templates ———
+
+def get_template(name: str) -> Template:
+    """
+    Returns the compiled template, compiling it only when the version or the
+    file on disk changed.
+    """
+    mtime = os.stat(os.path.join(TEMPLATES_PATH, name)).st_mtime_ns
+    key = (name, CONTRACT_TEMPLATE_VERSION, mtime)
+    template = _templates.get(key)
+    if template is None:
+        with _lock:
+            template = _templates.get(key)
+            if template is None:
+                for stale in [k for k in _templates if k[0] == name]:
+                    del _templates[stale]
+                _env.cache.clear()
+                template = _env.get_template(name)
+                _templates[key] = template
+    return template
+
+
+def clear_caches() -> None:
+    """
+    Drops compiled templates and cached layouts (text metrics stay valid).
+    """
+    with _lock:
+        _templates.clear()
+        _env.cache.clear()
+    _static_layout.cache_clear()
+
+
+# ——— Fonts and metrics ———
+
+def register_font(name: str, ttf_path: Optional[str] = None) -> str:
+    """
+    Registers a TTF font with ReportLab once per process. Built-in PDF fonts
+    (no ttf_path) are returned as-is.
+    """
+    if ttf_path and name not in _registered_fonts:
+        with _lock:
+            if name not in _registered_fonts:
+                pdfmetrics.registerFont(TTFont(name, ttf_path))
+                _registered_fonts.add(name)
+    return name
+
+
+def fonts() -> Tuple[str, str]:
+    """(regular, bold) font names, registered on first use."""
+    return register_font(FONT_REGULAR, FONT_REGULAR_TTF), register_font(FONT_BOLD, FONT_BOLD_TTF)
+
+
+@lru_cache(maxsize=65536)
+def text_width(text: str, font: str, size: float) -> float:
+    return pdfmetrics.stringWidth(text, font, size)
+
+
+def wrap_text(text: str, font: str, size: float, max_width: float = MAX_LINE_WIDTH) -> List[str]:
+    """
+    Greedy word wrap by rendered width. Words wider than a whole line are
+    split by character.
+    """
+    space = text_width(" ", font, size)
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        current: List[str] = []
+        current_width = 0.0
+        for word in paragraph.split(" "):
+            w = text_width(word, font, size)
+            if w > max_width:
+                if current:
+                    lines.append(" ".join(current))
+                    current, current_width = [], 0.0
+                piece = ""
+                for ch in word:
+                    if text_width(piece + ch, font, size) > max_width and piece:
+                        lines.append(piece)
+                        piece = ""
+                    piece += ch
+                word, w = piece, text_width(piece, font, size)
+            needed = w if not current else current_width + space + w
+            if current and needed > max_width:
+                lines.append(" ".join(current))
+                current, current_width = [word], w
+            else:
+                current.append(word)
+                current_width = needed
+        lines.append(" ".join(current))
+    return lines
+
+
+# ——— Terms contract ———
+
+@lru_cache(maxsize=8)
+def _static_layout(version: int, regular: str) -> Tuple[List[str], ...]:
+    """
+    Wrapped T&C lines; identical for every contract of a given version.
+    """
+    return tuple(
+        wrap_text(f"- {tc}", regular, 12, MAX_LINE_WIDTH - 20) for tc in TERMS_AND_CONDITIONS
+    )
+
+
+def render_contract_pdf(terms: Dict[str, Any]) -> bytes:
+    """
+    Build a simple one‑page PDF via ReportLab from load_contract_terms() output.
+    Pure function of `terms` (no DB access), safe to run in a worker process.
+    """
+    regular, bold = fonts()
+    agreed_rate = float(terms["agreed_rate_per_post"] or 0.0)
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    y = PAGE_HEIGHT - 50
+
+    # Title
+    pdf.setFont(bold, 16)
+    pdf.drawString(X_MARGIN, y, f"Contract: {terms['campaign_title']}")
+    y -= 30
+
+    pdf.setFont(regular, 12)
+    pdf.drawString(X_MARGIN, y, f"Brand: {terms['brand_name']}")
+    y -= 18
+    pdf.drawString(X_MARGIN, y, f"Influencer: {terms['influencer_name']}")
+    y -= 18
+    pdf.drawString(X_MARGIN, y, f"Campaign Dates: {terms['start_date']} to {terms['end_date']}")
+    y -= 18
+    pdf.drawString(X_MARGIN, y, f"Agreed Rate (per post): ₹{agreed_rate:.2f}")
+    y -= 24
+
+    pdf.setFont(bold, 12)
+    pdf.drawString(X_MARGIN, y, "Deliverable Details:")
+    y -= 18
+
+    text_obj = pdf.beginText(X_MARGIN, y)
+    text_obj.setFont(regular, 12)
+    text_obj.setLeading(14)
+    details = terms["final_deliverable_details"]
+    for line in wrap_text(details, regular, 12) if details else []:
+        text_obj.textLine(line)
+        y -= 14
+    pdf.drawText(text_obj)
+
+    # Move down a bit
+    y -= 30
+
+    # Terms & Conditions stub
+    pdf.setFont(bold, 12)
+    pdf.drawString(X_MARGIN, y, "Terms & Conditions:")
+    y -= 18
+
+    pdf.setFont(regular, 12)
+    for tc_lines in _static_layout(CONTRACT_TEMPLATE_VERSION, regular):
+        for line in tc_lines:
+            pdf.drawString(X_MARGIN + 20, y, line)
+            y -= 16
+
+    # Signature lines at bottom
+    y = 100
+    pdf.setFont(regular, 12)
+    pdf.drawString(X_MARGIN, y, "Brand Signature: ____________________________")
+    pdf.drawString(X_MARGIN + 300, y, "Date: ____________")
+    y -= 40
+    pdf.drawString(X_MARGIN, y, "Influencer Signature: _______________________")
+    pdf.drawString(X_MARGIN + 300, y, "Date: ____________")
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+# ——— Markdown template contract ———
+
+def render_markdown_pdf(markdown: str) -> bytes:
+    """
+    Lays out rendered Markdown line by line, wrapping by measured width and
+    starting a new page when the current one is full.
+    """
+    regular, _ = fonts()
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+
+    pdf.setFont(regular, 12)
+    y_position = PAGE_HEIGHT - 50  # start near top
+
+    for line in wrap_text(markdown, regular, 12):
+        pdf.drawString(X_MARGIN, y_position, line)
+        y_position -= 16
+        if y_position < 50:
+            pdf.showPage()         # new page
+            pdf.setFont(regular, 12)
+            y_position = PAGE_HEIGHT - 50
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
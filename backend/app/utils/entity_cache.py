@@ -0,0 +1,187 @@
+# backend/app/utils/entity_cache.py
+#
+# Read-through cache for single-entity lookups (influencer, campaign, business
+# rows by id) on top of TTLCache.
+#
+# - A hit is served from memory; a miss calls the loader once, even when many
+#   requests ask for the same id at the same moment (single flight).
+# - Ids that do not exist are cached too, for a shorter TTL, so repeated
+#   404 checks do not reach the database.
+# - get_many() serves a batch of ids from memory and loads the rest with one
+#   batch loader call (e.g. chunked `in_()` queries).
+# - The owning service calls invalidate() from its write paths; other workers
+#   see a change once their TTL runs out.
+# Cached rows are shared between callers and must not be mutated.
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+from app.utils.conditional import version_text
+from app.utils.ttl_cache import TTLCache
+
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "60"))
+ENTITY_CACHE_NEGATIVE_TTL = float(os.getenv("ENTITY_CACHE_NEGATIVE_TTL", "5"))
+
+_ABSENT = object()    # not in the cache
+_MISSING = object()   # cached "no such row"
+
+_registry: List["EntityCache"] = []
+
+
+class EntityCache:
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = ENTITY_CACHE_SIZE,
+        ttl: float = ENTITY_CACHE_TTL,
+        negative_ttl: float = ENTITY_CACHE_NEGATIVE_TTL,
+    ):
+        self.name = name
+        self.negative_ttl = negative_ttl
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+        # Bumped by every write from outside a load; get_many() compares it
+        self._generation = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        _registry.append(self)
+
+    async def get(self, key: Hashable, loader: Callable[[Hashable], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """
+        Returns the cached entity for `key`, or awaits loader(key) (which
+        returns the row or None) and caches the result.
+        """
+        entry = self._entries.get(key, _ABSENT)
+        if entry is _MISSING:
+            self.negative_hits += 1
+            return None
+        if entry is not _ABSENT:
+            self.hits += 1
+            return entry
+
+        task = self._loading.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._loading[key] = task
+        else:
+            self.coalesced += 1
+        # shield: one caller being cancelled must not cancel the shared load
+        return await asyncio.shield(task)
+
+    async def get_current(
+        self,
+        key: Hashable,
+        loader: Callable[[Hashable], Awaitable[Optional[Any]]],
+        version_field: str,
+        version: Any,
+    ) -> Optional[Any]:
+        """
+        get(), but a cached entry whose `version_field` is not `version` (just
+        read from the database) is dropped and loaded again. Versions are
+        compared as timestamps (version_text()), not as raw strings.
+        """
+        value = await self.get(key, loader)
+        if version is None or (value is not None and version_text(value.get(version_field)) == version_text(version)):
+            return value
+        self.invalidate(key)
+        return await self.get(key, loader)
+
+    async def get_many(
+        self,
+        keys: Iterable[Hashable],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """
+        {key: entity} for every key that exists. Cached keys cost nothing; the
+        rest go to one loader(missing_keys) call, which returns {key: row} for
+        the rows it found. Keys it does not return are not cached, since a
+        failed chunk looks the same as a missing row.
+        """
+        found: Dict[Hashable, Any] = {}
+        missing: List[Hashable] = []
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key, _ABSENT)
+            if entry is _MISSING:
+                self.negative_hits += 1
+            elif entry is not _ABSENT:
+                self.hits += 1
+                found[key] = entry
+            else:
+                missing.append(key)
+        if not missing:
+            return found
+
+        self.misses += len(missing)
+        generation = self._generation
+        loaded = await loader(missing)
+        # Skip the writes if anything was invalidated while loading
+        cache = self._generation == generation
+        for key in missing:
+            value = loaded.get(key)
+            if value is None:
+                continue
+            if cache and key not in self._loading:
+                self._entries.set(key, value)
+            found[key] = value
+        return found
+
+    async def _load(self, key: Hashable, loader: Callable[[Hashable], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        try:
+            value = await loader(key)
+            # Skip the write if the key was invalidated while loading
+            if self._loading.get(key) is asyncio.current_task():
+                if value is None:
+                    self._entries.set(key, _MISSING, ttl=self.negative_ttl)
+                else:
+                    self._entries.set(key, value)
+            return value
+        finally:
+            if self._loading.get(key) is asyncio.current_task():
+                del self._loading[key]
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a row the caller just wrote (e.g. the result of an insert).
+        """
+        self._generation += 1
+        self._loading.pop(key, None)
+        if value is not None:
+            self._entries.set(key, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        self.invalidations += 1
+        self._generation += 1
+        self._loading.pop(key, None)
+        self._entries.delete(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._loading.clear()
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "lookups": lookups,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            # share of lookups answered without a database read of their own
+            "hit_rate": round(1 - self.misses / lookups, 4) if lookups else None,
+        }
+
+
+def entity_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Hit-rate counters of every EntityCache in this process, by name.
+    """
+    return {cache.name: cache.stats() for cache in _registry}
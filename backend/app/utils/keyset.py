@@ -0,0 +1,109 @@
+# backend/app/utils/keyset.py
+#
+# Keyset (seek) pagination over PostgREST. Each page asks for rows strictly
+# after the last row seen, in the order of a unique column tuple, so page N
+# costs the same as page 1 (no OFFSET scan) and rows inserted meanwhile are
+# neither skipped nor repeated.
+
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Sequence
+
+
+def _quote(value: Any) -> str:
+    # Double quotes keep ",.:()" in timestamps/text from breaking the or=() syntax
+    return '"' + str(value).replace('"', '\\"') + '"'
+
+
+def keyset_condition(columns: Sequence[str], values: Sequence[Any], descending: bool = False) -> str:
+    """
+    PostgREST `or` filter body selecting rows after `values` in (columns) order:
+      (a > va) OR (a = va AND b > vb) OR (a = va AND b = vb AND c > vc)
+    Pass the result to .or_().
+    """
+    op = "lt" if descending else "gt"
+    terms = []
+    for i, column in enumerate(columns):
+        parts = [f"{c}.eq.{_quote(v)}" for c, v in zip(columns[:i], values[:i])]
+        parts.append(f"{column}.{op}.{_quote(values[i])}")
+        terms.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+    return ",".join(terms)
+
+
+def _page_query(build_query, columns, page_size, after, descending):
+    query = build_query()
+    if after is not None:
+        query = query.or_(keyset_condition(columns, [after[c] for c in columns], descending))
+    for column in columns:
+        query = query.order(column, desc=descending)
+    return query.limit(page_size)
+
+
+def fetch_page(
+    build_query: Callable[[], Any],
+    columns: Sequence[str],
+    page_size: int,
+    after: Optional[Dict[str, Any]] = None,
+    descending: bool = False,
+) -> list:
+    """
+    One page of up to `page_size` rows following the row `after` (a dict
+    holding at least `columns`). build_query() returns a fresh filtered
+    select that includes `columns`.
+    """
+    resp = _page_query(build_query, columns, page_size, after, descending).execute()
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("Keyset page query failed")
+    return resp.data or []
+
+
+def iter_keyset(
+    build_query: Callable[[], Any],
+    columns: Sequence[str],
+    page_size: int = 1000,
+    descending: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every row of the query in (columns) order, one page in memory at a time.
+    `columns` must be unique and non-null for the rows selected.
+    """
+    after = None
+    while True:
+        rows = fetch_page(build_query, columns, page_size, after, descending)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after = rows[-1]
+
+
+async def fetch_page_async(
+    build_query: Callable[[], Any],
+    columns: Sequence[str],
+    page_size: int,
+    after: Optional[Dict[str, Any]] = None,
+    descending: bool = False,
+) -> list:
+    """
+    fetch_page() for queries built on the async client (app/services/db.py).
+    """
+    resp = await _page_query(build_query, columns, page_size, after, descending).execute()
+    if resp is None or getattr(resp, "error", None):
+        raise RuntimeError("Keyset page query failed")
+    return resp.data or []
+
+
+async def iter_keyset_async(
+    build_query: Callable[[], Any],
+    columns: Sequence[str],
+    page_size: int = 1000,
+    descending: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    iter_keyset() for queries built on the async client.
+    """
+    after = None
+    while True:
+        rows = await fetch_page_async(build_query, columns, page_size, after, descending)
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        after = rows[-1]
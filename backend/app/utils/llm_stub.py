@@ -0,0 +1,70 @@
+# backend/app/utils/llm_stub.py
+#
+# Stand-in for the OpenAI chat-completions endpoint (/v1/chat/completions).
+# Replies after a configurable latency (+/- jitter) with a canned message, so the
+# real `openai` client can be pointed at it via OPENAI_BASE_URL.
+
+import asyncio
+import random
+import time
+import uuid
+from typing import Callable, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+DEFAULT_REPLY = (
+    "Thank you for your proposal. We are happy to move forward at the discussed rate "
+    "and will share a contract draft shortly."
+)
+
+
+class LLMStub:
+    """
+    latency_ms / jitter_ms: each completion sleeps latency_ms ± jitter_ms (uniform).
+    reply: fixed text, or a callable(messages) -> text for prompt-dependent output.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        reply: Optional[Callable[[list], str]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.reply = reply or (lambda messages: DEFAULT_REPLY)
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def _delay(self) -> float:
+        jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000.0
+
+    def create_app(self) -> Starlette:
+        async def chat_completions(request: Request) -> JSONResponse:
+            self.calls += 1
+            body = await request.json()
+            await asyncio.sleep(self._delay())
+            content = self.reply(body.get("messages", []))
+            return JSONResponse(
+                {
+                    "id": f"chatcmpl-stub-{uuid.uuid4().hex[:12]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                }
+            )
+
+        return Starlette(routes=[Route("/v1/chat/completions", chat_completions, methods=["POST"])])
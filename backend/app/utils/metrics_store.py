@@ -0,0 +1,643 @@
+# backend/app/utils/metrics_store.py
+#
+# Append-only columnar store for performance metric time series.
+#
+# Raw points land in immutable segment files: a small JSON header (the series
+# keys used by the segment) followed by three packed columns - int64 epoch
+# seconds, float64 values and uint32 series indexes - written with the stdlib
+# `array` module, so a segment of 100k points is ~2 MB and loads with three
+# frombytes() calls.
+#
+# Every point is also folded into minute / hour / day rollups held in memory
+# as parallel sorted arrays per series (bucket start, sum, count, min, max,
+# last value). A range query bisects the arrays of one rollup level only, so
+# charting months of data touches a few hundred buckets, never raw points.
+# With `minute_retention` set, minute buckets older than that are dropped
+# (hour and day buckets are kept for all time), so memory stays bounded.
+#
+# Several processes may share one directory: refresh() picks up segments
+# written by others, and compact() merges segments.
+#
+# Compaction is size-tiered: a segment's tier is log_fanin(points), and only
+# the segments of a tier that holds `fanin` of them are merged (into one
+# segment of the next tier). Every point is rewritten about log_fanin(total)
+# times over its life, and one compaction never touches more than one tier;
+# segments of `max_segment_points` or more are never merged again.
+#
+# A merged segment gets a snapshot of its own rollups next to it
+# (<segment>.rollup: the packed bucket arrays of every series), so a fresh
+# process loads bucket arrays instead of re-folding every raw point. Its
+# header lists the segments it replaces; a reader that sees it skips those,
+# so points are never counted twice while compaction deletes them.
+
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:   # not on Windows; compaction then relies on one compactor per directory
+    fcntl = None
+
+SeriesKey = Tuple[str, str, str]   # (campaign_id, influencer_id, metric)
+Point = Tuple[str, str, str, int, float]
+
+RESOLUTIONS: Dict[str, int] = {"minute": 60, "hour": 3600, "day": 86400}
+
+_MAGIC = b"MSEG1\n"
+_SUFFIX = ".seg"
+_SNAPSHOT_MAGIC = b"MROL1\n"
+_SNAPSHOT_SUFFIX = ".rollup"
+_PENDING_SUFFIX = ".pending"
+_COMPACT_LOCK = ".compact.lock"
+
+
+class _Rollup:
+    """
+    Buckets of one series at one resolution, as parallel arrays sorted by
+    bucket start.
+    """
+
+    __slots__ = ("starts", "sums", "counts", "mins", "maxs", "lasts", "last_ts")
+    TYPECODES = ("q", "d", "q", "d", "d", "d", "q")
+
+    def __init__(self):
+        self.starts = array("q")
+        self.sums = array("d")
+        self.counts = array("q")
+        self.mins = array("d")
+        self.maxs = array("d")
+        self.lasts = array("d")
+        self.last_ts = array("q")
+
+    def add(self, bucket: int, ts: int, value: float) -> None:
+        n = len(self.starts)
+        # Points mostly arrive in time order: the last bucket or a new one at the end
+        if n and self.starts[-1] == bucket:
+            i = n - 1
+        elif not n or self.starts[-1] < bucket:
+            i = n
+        else:
+            i = bisect_left(self.starts, bucket)
+        if i == n or self.starts[i] != bucket:
+            self.starts.insert(i, bucket)
+            self.sums.insert(i, value)
+            self.counts.insert(i, 1)
+            self.mins.insert(i, value)
+            self.maxs.insert(i, value)
+            self.lasts.insert(i, value)
+            self.last_ts.insert(i, ts)
+            return
+        self.sums[i] += value
+        self.counts[i] += 1
+        if value < self.mins[i]:
+            self.mins[i] = value
+        if value > self.maxs[i]:
+            self.maxs[i] = value
+        if ts >= self.last_ts[i]:
+            self.lasts[i] = value
+            self.last_ts[i] = ts
+
+    def columns(self) -> List[array]:
+        return [getattr(self, name) for name in self.__slots__]
+
+    def merge(self, other: "_Rollup") -> None:
+        """
+        Adds the buckets of `other` (e.g. loaded from a snapshot) to this rollup.
+        """
+        # Buckets after our last one (the usual case: newer data) are appended in bulk
+        tail = bisect_right(other.starts, self.starts[-1]) if self.starts else 0
+        for j in range(tail):
+            bucket = other.starts[j]
+            i = bisect_left(self.starts, bucket)
+            if i == len(self.starts) or self.starts[i] != bucket:
+                for column, source in zip(self.columns(), other.columns()):
+                    column.insert(i, source[j])
+                continue
+            self.sums[i] += other.sums[j]
+            self.counts[i] += other.counts[j]
+            if other.mins[j] < self.mins[i]:
+                self.mins[i] = other.mins[j]
+            if other.maxs[j] > self.maxs[i]:
+                self.maxs[i] = other.maxs[j]
+            if other.last_ts[j] >= self.last_ts[i]:
+                self.lasts[i] = other.lasts[j]
+                self.last_ts[i] = other.last_ts[j]
+        if tail < len(other.starts):
+            for column, source in zip(self.columns(), other.columns()):
+                column.extend(source[tail:])
+
+    def drop_before(self, bucket: int) -> None:
+        i = bisect_left(self.starts, bucket)
+        if i:
+            for column in self.columns():
+                del column[:i]
+
+    def bounds(self, start: int, end: int) -> Tuple[int, int]:
+        return bisect_left(self.starts, start), bisect_left(self.starts, end)
+
+
+Rollups = Dict[str, Dict[SeriesKey, _Rollup]]
+
+
+def _empty_rollups() -> Rollups:
+    return {name: {} for name in RESOLUTIONS}
+
+
+def _merge_into(target: Rollups, source: Rollups) -> None:
+    for name in RESOLUTIONS:
+        levels = target[name]
+        for key, rollup in source[name].items():
+            existing = levels.get(key)
+            if existing is None:
+                levels[key] = rollup
+            else:
+                existing.merge(rollup)
+
+
+def _fold_columns(
+    rollups: Rollups,
+    keys: List[SeriesKey],
+    ts_col: array,
+    value_col: array,
+    series_col: array,
+    minute_horizon: int,
+) -> None:
+    """
+    Folds the points of one segment into `rollups`; minute buckets before
+    `minute_horizon` are skipped.
+    """
+    targets = []
+    for key in keys:
+        levels = []
+        for name in RESOLUTIONS:
+            rollup = rollups[name].get(key)
+            if rollup is None:
+                rollup = rollups[name][key] = _Rollup()
+            levels.append(rollup)
+        targets.append(levels)
+    minute_step, hour_step, day_step = RESOLUTIONS["minute"], RESOLUTIONS["hour"], RESOLUTIONS["day"]
+    for ts, value, series in zip(ts_col, value_col, series_col):
+        minute, hour, day = targets[series]
+        if ts >= minute_horizon:
+            minute.add(ts - ts % minute_step, ts, value)
+        hour.add(ts - ts % hour_step, ts, value)
+        day.add(ts - ts % day_step, ts, value)
+
+
+class MetricsStore:
+    """
+    MetricsStore(root) persists segments under `root`; MetricsStore(None)
+    keeps everything in memory (scripts, benchmarks).
+
+    minute_retention: seconds of minute buckets kept in memory (None: all).
+    fanin: segments of one tier merged at a time.
+    max_segment_points: segments this large are left out of compaction.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        minute_retention: Optional[int] = None,
+        fanin: int = 8,
+        max_segment_points: int = 20_000_000,
+    ):
+        self.root = root
+        self.minute_retention = minute_retention
+        self.fanin = max(2, fanin)
+        self.max_segment_points = max_segment_points
+        self._lock = threading.RLock()
+        # One compaction per process at a time; the flock covers other processes
+        self._compacting = threading.Lock()
+        self._seq = 0
+        self._reset()
+        if root:
+            os.makedirs(root, exist_ok=True)
+            self.refresh()
+
+    def _reset(self) -> None:
+        self._rollups: Rollups = _empty_rollups()
+        # (campaign_id, metric) -> influencer ids, for campaign-wide queries
+        self._by_campaign: Dict[Tuple[str, str], set] = {}
+        # Loaded segment -> its point count
+        self._loaded: Dict[str, int] = {}
+        # Segments merged into a loaded segment but not deleted yet
+        self._replaced: set = set()
+        self._pruned_at = 0
+        self.points = 0
+
+    # ----- Rollups -----
+
+    def minute_horizon(self) -> int:
+        """
+        Start of the oldest minute bucket kept (0 without minute_retention).
+        """
+        if self.minute_retention is None:
+            return 0
+        horizon = int(time.time()) - self.minute_retention
+        return horizon - horizon % RESOLUTIONS["minute"]
+
+    def _register(self, keys: Iterable[SeriesKey]) -> None:
+        for campaign_id, influencer_id, metric in keys:
+            self._by_campaign.setdefault((campaign_id, metric), set()).add(influencer_id)
+
+    def _merge_rollups(self, rollups: Rollups) -> None:
+        _merge_into(self._rollups, rollups)
+        self._register(rollups["minute"])
+
+    def _prune_minutes(self, force: bool = False) -> None:
+        horizon = self.minute_horizon()
+        if not horizon or (not force and horizon - self._pruned_at < RESOLUTIONS["minute"]):
+            return
+        for rollup in self._rollups["minute"].values():
+            rollup.drop_before(horizon)
+        self._pruned_at = horizon
+
+    # ----- Ingestion -----
+
+    def append(self, points: Sequence[Point]) -> int:
+        """
+        Stores (campaign_id, influencer_id, metric, epoch_seconds, value)
+        points as one segment and folds them into the rollups.
+        Returns the number of points written.
+        """
+        if not points:
+            return 0
+        series: Dict[SeriesKey, int] = {}
+        ts_col = array("q")
+        value_col = array("d")
+        series_col = array("I")
+        for campaign_id, influencer_id, metric, ts, value in points:
+            key = (str(campaign_id), str(influencer_id), str(metric))
+            ts_col.append(int(ts))
+            value_col.append(float(value))
+            series_col.append(series.setdefault(key, len(series)))
+
+        keys = list(series)
+        with self._lock:
+            if self.root:
+                self._loaded[self._write_segment(keys, ts_col, value_col, series_col)] = len(ts_col)
+            _fold_columns(self._rollups, keys, ts_col, value_col, series_col, self.minute_horizon())
+            self._register(keys)
+            self.points += len(ts_col)
+            self._prune_minutes()
+        return len(ts_col)
+
+    # ----- Segments -----
+
+    def _segment_name(self) -> str:
+        self._seq += 1
+        return f"{time.time_ns():020d}_{os.getpid()}_{self._seq}{_SUFFIX}"
+
+    def _write_file(self, name: str, magic: bytes, header: Dict[str, Any], columns: Iterable[array]) -> None:
+        encoded = json.dumps(header).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(magic)
+                f.write(struct.pack("<I", len(encoded)))
+                f.write(encoded)
+                for column in columns:
+                    f.write(column.tobytes())
+            os.replace(tmp_path, os.path.join(self.root, name))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _write_segment(
+        self,
+        keys: List[SeriesKey],
+        ts_col: array,
+        value_col: array,
+        series_col: array,
+        name: Optional[str] = None,
+        replaces: Sequence[str] = (),
+    ) -> str:
+        name = name or self._segment_name()
+        header = {"series": keys, "count": len(ts_col), "byteorder": sys.byteorder}
+        if replaces:
+            header["replaces"] = sorted(replaces)
+        self._write_file(name, _MAGIC, header, (ts_col, value_col, series_col))
+        return name
+
+    @staticmethod
+    def _parse_header(data: bytes, magic: bytes, name: str) -> Tuple[Dict[str, Any], int]:
+        if not data.startswith(magic):
+            raise ValueError(f"Not a metrics file: {name}")
+        offset = len(magic)
+        (header_len,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        return json.loads(data[offset : offset + header_len]), offset + header_len
+
+    @staticmethod
+    def _read_column(data: bytes, offset: int, typecode: str, count: int, byteorder: str) -> Tuple[array, int]:
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(data[offset : offset + size])
+        if byteorder != sys.byteorder:
+            column.byteswap()
+        return column, offset + size
+
+    def _read_header(self, name: str) -> Dict[str, Any]:
+        with open(os.path.join(self.root, name), "rb") as f:
+            data = f.read(len(_MAGIC) + 4)
+            if len(data) == len(_MAGIC) + 4:
+                data += f.read(struct.unpack_from("<I", data, len(_MAGIC))[0])
+        return self._parse_header(data, _MAGIC, name)[0]
+
+    def _read_segment(self, name: str) -> Tuple[List[SeriesKey], array, array, array]:
+        with open(os.path.join(self.root, name), "rb") as f:
+            data = f.read()
+        header, offset = self._parse_header(data, _MAGIC, name)
+        columns = []
+        for typecode in ("q", "d", "I"):
+            column, offset = self._read_column(data, offset, typecode, header["count"], header["byteorder"])
+            columns.append(column)
+        keys = [tuple(k) for k in header["series"]]
+        return keys, columns[0], columns[1], columns[2]
+
+    def _segments(self) -> List[str]:
+        return sorted(n for n in os.listdir(self.root) if n.endswith(_SUFFIX))
+
+    @staticmethod
+    def _snapshot_name(segment: str) -> str:
+        return segment[: -len(_SUFFIX)] + _SNAPSHOT_SUFFIX
+
+    def _write_snapshot(self, segment: str, rollups: Rollups, points: int) -> None:
+        """
+        Writes `rollups` (which must cover exactly the points of `segment`)
+        as that segment's snapshot.
+        """
+        keys = sorted(rollups["minute"])
+        header = {
+            "series": keys,
+            "points": points,
+            "byteorder": sys.byteorder,
+            "buckets": {name: [len(rollups[name][k].starts) for k in keys] for name in RESOLUTIONS},
+        }
+        columns = (
+            column
+            for name in RESOLUTIONS
+            for key in keys
+            for column in rollups[name][key].columns()
+        )
+        self._write_file(self._snapshot_name(segment), _SNAPSHOT_MAGIC, header, columns)
+
+    def _read_snapshot(self, segment: str) -> Optional[Rollups]:
+        """
+        The rollups snapshotted for `segment`, or None if it has none.
+        """
+        try:
+            with open(os.path.join(self.root, self._snapshot_name(segment)), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        header, offset = self._parse_header(data, _SNAPSHOT_MAGIC, segment)
+        keys = [tuple(k) for k in header["series"]]
+        rollups = _empty_rollups()
+        for name in RESOLUTIONS:
+            for key, count in zip(keys, header["buckets"][name]):
+                rollup = _Rollup()
+                for slot, typecode in zip(_Rollup.__slots__, _Rollup.TYPECODES):
+                    column, offset = self._read_column(data, offset, typecode, count, header["byteorder"])
+                    setattr(rollup, slot, column)
+                rollups[name][key] = rollup
+        return rollups
+
+    def _load_segment(self, name: str, count: int) -> None:
+        rollups = self._read_snapshot(name)
+        if rollups is not None:
+            self._merge_rollups(rollups)
+        else:
+            keys, ts_col, value_col, series_col = self._read_segment(name)
+            _fold_columns(self._rollups, keys, ts_col, value_col, series_col, self.minute_horizon())
+            self._register(keys)
+        self.points += count
+
+    def segment_count(self) -> int:
+        with self._lock:
+            return len(self._loaded)
+
+    def refresh(self) -> int:
+        """
+        Loads segments written since the last refresh (e.g. by another worker).
+        A merged segment that replaces only segments already loaded is adopted
+        without reading it; any other disappearance rebuilds the rollups.
+        Returns the number of segments loaded.
+        """
+        if not self.root:
+            return 0
+        with self._lock:
+            names = self._segments()
+            pending = [n for n in names if n not in self._loaded and n not in self._replaced]
+            headers = {}
+            for name in pending:
+                try:
+                    headers[name] = self._read_header(name)
+                except FileNotFoundError:
+                    continue   # compacted away meanwhile
+            for name in sorted(headers):
+                merged_from = set(headers[name].get("replaces", ()))
+                covered = merged_from.intersection(self._loaded)
+                if not covered:
+                    continue
+                if covered != merged_from:
+                    # Merged with points not folded here: start over
+                    self._reset()
+                    return self.refresh()
+                # The rollups already cover these points
+                for replaced in merged_from:
+                    del self._loaded[replaced]
+                self._loaded[name] = headers[name]["count"]
+                self._replaced |= merged_from
+            if not set(self._loaded).issubset(names):
+                self._reset()
+                return self.refresh()
+            replaces = {r for header in headers.values() for r in header.get("replaces", ())}
+            self._replaced = (self._replaced | replaces) & set(names)
+            loaded = 0
+            for name in pending:
+                if name not in headers or name in replaces or name in self._loaded:
+                    continue
+                try:
+                    self._load_segment(name, headers[name]["count"])
+                except FileNotFoundError:
+                    continue
+                self._loaded[name] = headers[name]["count"]
+                loaded += 1
+            self._prune_minutes(force=bool(loaded))
+            return loaded
+
+    # ----- Compaction -----
+
+    def _tier(self, count: int) -> int:
+        tier = 0
+        while count >= self.fanin:
+            count //= self.fanin
+            tier += 1
+        return tier
+
+    def _compaction_candidates(self) -> List[str]:
+        """
+        The segments of the lowest tier that holds `fanin` segments, oldest
+        first; empty when no tier is full.
+        """
+        tiers: Dict[int, List[str]] = {}
+        for name, count in self._loaded.items():
+            if count < self.max_segment_points:
+                tiers.setdefault(self._tier(count), []).append(name)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= self.fanin:
+                return sorted(tiers[tier])
+        return []
+
+    def compaction_due(self) -> bool:
+        with self._lock:
+            return bool(self._compaction_candidates())
+
+    def _remove(self, *names: str) -> None:
+        for name in names:
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+
+    def _remove_leftovers(self) -> None:
+        # Files of a compaction that died before publishing its segment
+        present = set(self._segments())
+        for name in os.listdir(self.root):
+            if name.endswith(_PENDING_SUFFIX):
+                self._remove(name)
+            elif name.endswith(_SNAPSHOT_SUFFIX) and name[: -len(_SNAPSHOT_SUFFIX)] + _SUFFIX not in present:
+                self._remove(name)
+
+    def _merge_tier(self) -> int:
+        with self._lock:
+            self.refresh()
+            names = self._compaction_candidates()
+        if not names:
+            return 0
+
+        # Segments are immutable: read and merge them without holding the store lock
+        series: Dict[SeriesKey, int] = {}
+        ts_col, value_col, series_col = array("q"), array("d"), array("I")
+        rollups = _empty_rollups()
+        for name in names:
+            keys, ts, values, idx = self._read_segment(name)
+            remap = [series.setdefault(k, len(series)) for k in keys]
+            ts_col.extend(ts)
+            value_col.extend(values)
+            series_col.extend(remap[i] for i in idx)
+            snapshot = self._read_snapshot(name)
+            if snapshot is None:
+                _fold_columns(rollups, keys, ts, values, idx, self.minute_horizon())
+            else:
+                _merge_into(rollups, snapshot)
+        merged = self._segment_name()
+        pending = merged + _PENDING_SUFFIX
+        # Snapshot first: a reader that sees the segment also finds its snapshot
+        self._write_snapshot(merged, rollups, len(ts_col))
+        self._write_segment(list(series), ts_col, value_col, series_col, name=pending, replaces=names)
+
+        with self._lock:
+            if not all(name in self._loaded for name in names):
+                # The store was rebuilt meanwhile; leave the segments as they are
+                self._remove(pending, self._snapshot_name(merged))
+                return 0
+            os.replace(os.path.join(self.root, pending), os.path.join(self.root, merged))
+            # The rollups already cover these points: only the bookkeeping changes
+            for name in names:
+                del self._loaded[name]
+            self._loaded[merged] = len(ts_col)
+            self._replaced.update(names)
+        for name in names:
+            self._remove(name, self._snapshot_name(name))
+        return len(names)
+
+    def compact(self) -> int:
+        """
+        Merges full tiers of segments (see the module docstring) until none is
+        left, snapshotting each merged segment's rollups. Returns how many
+        segments were replaced (0 if another compaction is running).
+        """
+        if not self.root or not self._compacting.acquire(blocking=False):
+            return 0
+        try:
+            with open(os.path.join(self.root, _COMPACT_LOCK), "a") as lock_file:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        return 0
+                self._remove_leftovers()
+                replaced = 0
+                while True:
+                    merged = self._merge_tier()
+                    if not merged:
+                        return replaced
+                    replaced += merged
+        finally:
+            self._compacting.release()
+
+    # ----- Queries -----
+
+    def metrics(self, campaign_id: str) -> List[str]:
+        with self._lock:
+            return sorted(m for (c, m) in self._by_campaign if c == str(campaign_id))
+
+    def query(
+        self,
+        campaign_id: str,
+        metric: str,
+        start: int,
+        end: int,
+        resolution: str,
+        influencer_ids: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Buckets of `resolution` in [start, end) for one metric of a campaign,
+        summed across `influencer_ids` (default: every influencer with data).
+        Each bucket: { t, sum, count, min, max, last } where `last` is the sum
+        of each influencer's latest value in the bucket (the campaign total
+        for cumulative counters).
+        """
+        step = RESOLUTIONS[resolution]
+        start -= start % step
+        campaign_id = str(campaign_id)
+        with self._lock:
+            if influencer_ids is None:
+                influencer_ids = self._by_campaign.get((campaign_id, metric), ())
+            rollups = self._rollups[resolution]
+            merged: Dict[int, List[float]] = {}
+            for influencer_id in influencer_ids:
+                rollup = rollups.get((campaign_id, str(influencer_id), metric))
+                if rollup is None:
+                    continue
+                lo, hi = rollup.bounds(start, end)
+                for t, total, count, low, high, last in zip(
+                    rollup.starts[lo:hi], rollup.sums[lo:hi], rollup.counts[lo:hi],
+                    rollup.mins[lo:hi], rollup.maxs[lo:hi], rollup.lasts[lo:hi],
+                ):
+                    bucket = merged.get(t)
+                    if bucket is None:
+                        merged[t] = [total, count, low, high, last]
+                    else:
+                        bucket[0] += total
+                        bucket[1] += count
+                        if low < bucket[2]:
+                            bucket[2] = low
+                        if high > bucket[3]:
+                            bucket[3] = high
+                        bucket[4] += last
+        return [
+            {"t": t, "sum": b[0], "count": int(b[1]), "min": b[2], "max": b[3], "last": b[4]}
+            for t, b in sorted(merged.items())
+        ]
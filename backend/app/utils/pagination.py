@@ -0,0 +1,97 @@
+# backend/app/utils/pagination.py
+#
+# Cursor pagination and column projection for list endpoints.
+#
+# Pages are keyset pages (app/utils/keyset.py) ordered by a unique column
+# tuple; the cursor handed to clients is the key of the last row of the page,
+# JSON-encoded and base64url'd so it stays opaque. `fields` maps straight to a
+# PostgREST select list, so a client asking for "id,name" transfers only those
+# columns.
+
+import base64
+import binascii
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from postgrest.exceptions import APIError
+
+from app.utils.keyset import fetch_page_async
+
+DEFAULT_PAGE_LIMIT = int(os.getenv("DEFAULT_PAGE_LIMIT", "50"))
+MAX_PAGE_LIMIT = int(os.getenv("MAX_PAGE_LIMIT", "500"))
+
+_COLUMN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def encode_cursor(row: Dict[str, Any], columns: Sequence[str]) -> str:
+    payload = json.dumps([row[c] for c in columns], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[str]) -> Dict[str, Any]:
+    """
+    Inverse of encode_cursor. Raises ValueError for a cursor that was not
+    produced for these columns.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+    return dict(zip(columns, values))
+
+
+def select_list(fields: Optional[str], required: Sequence[str] = ("id",)) -> str:
+    """
+    PostgREST select list for a comma-separated `fields` parameter ("*" when
+    empty). The `required` columns (the pagination key) are always included.
+    Raises ValueError for anything that is not a plain column name; unknown
+    columns are rejected by paginate().
+    """
+    if not fields or fields.strip() == "*":
+        return "*"
+    columns: List[str] = []
+    for name in fields.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if not _COLUMN.match(name):
+            raise ValueError(f"Invalid field name '{name}'")
+        columns.append(name)
+    for name in required:
+        if name not in columns:
+            columns.append(name)
+    return ", ".join(dict.fromkeys(columns))
+
+
+async def paginate(
+    build_query: Callable[[], Any],
+    columns: Sequence[str] = ("id",),
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    One page of build_query() rows (a query on the async client) in (columns) order:
+      { items: [rows], next_cursor: str or None }
+    next_cursor is None on the last page. One row past `limit` is fetched to
+    tell whether another page exists, so the last page never costs an extra
+    empty request.
+    Raises ValueError for a bad cursor or a projection naming unknown columns.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_LIMIT))
+    after = decode_cursor(cursor, columns) if cursor else None
+    try:
+        rows = await fetch_page_async(build_query, columns, limit + 1, after)
+    except APIError as e:
+        # 42703 undefined_column: a `fields` entry that is not a column
+        if e.code == "42703":
+            raise ValueError(e.message or "Unknown field")
+        raise
+    if len(rows) <= limit:
+        return {"items": rows, "next_cursor": None}
+    items = rows[:limit]
+    return {"items": items, "next_cursor": encode_cursor(items[-1], columns)}
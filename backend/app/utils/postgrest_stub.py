@@ -0,0 +1,762 @@
+# backend/app/utils/postgrest_stub.py
+#
+# In-memory stand-in for Supabase's PostgREST endpoint (/rest/v1).
+# It speaks enough of the PostgREST wire protocol for the queries our services
+# issue (select/insert/upsert/update/delete, eq/in/range filters, order/limit,
+# single-object responses, embedded resources and RPC), so the real `supabase`
+# client can be pointed at it for offline benchmarks and scripts.
+
+import copy
+import fnmatch
+import json
+import re
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# Composite primary keys; every other table is keyed on "id"
+PRIMARY_KEYS: Dict[str, Tuple[str, ...]] = {
+    "campaign_influencer": ("campaign_id", "influencer_id"),
+    "payment_ledger": ("campaign_id", "influencer_id"),
+    "idempotency_keys": ("scope", "key"),
+    "campaign_summary": ("campaign_id",),
+}
+
+# Column defaults the real schema fills in on insert
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "campaign_influencer": {
+        "status": "Pending",
+        "deliverables_submitted": {},
+        "payment_status": False,
+        "performance": None,
+    },
+    "payments": {"status": "Pending"},
+    "payment_ledger": {"paid_total": 0, "pending_total": 0},
+    "campaign_summary": {
+        "influencer_count": 0,
+        "status_counts": {},
+        "agreed_total": 0,
+        "paid_total": 0,
+        "pending_total": 0,
+        "performance": {},
+    },
+    "outbox": {"status": "Queued", "attempts": 0, "locked_until": None, "last_error": None},
+}
+
+# Tables whose updated_at a BEFORE UPDATE trigger keeps current (010_updated_at_triggers.sql)
+UPDATED_AT_TABLES = {"business", "influencer", "campaign"}
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class PostgrestStore:
+    """
+    Tables are plain lists of dicts. Every HTTP request is counted per
+    (method, table) so benchmarks can report upstream calls.
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.rpcs: Dict[str, Callable[["PostgrestStore", Dict[str, Any]], Any]] = dict(SQL_FUNCTIONS)
+        self.calls: Counter = Counter()
+
+    # ----- Seeding / inspection -----
+
+    def table(self, name: str) -> List[Dict[str, Any]]:
+        return self.tables.setdefault(name, [])
+
+    def seed(self, name: str, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.insert_row(name, row)
+
+    def register_rpc(self, name: str, fn: Callable[["PostgrestStore", Dict[str, Any]], Any]) -> None:
+        self.rpcs[name] = fn
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+
+    # ----- Row operations -----
+
+    def insert_row(self, name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        new_row = {**copy.deepcopy(DEFAULTS.get(name, {})), **row}
+        if PRIMARY_KEYS.get(name, ("id",)) == ("id",):
+            new_row.setdefault("id", str(uuid.uuid4()))
+        new_row.setdefault("created_at", _now())
+        if name in UPDATED_AT_TABLES:
+            new_row.setdefault("updated_at", new_row["created_at"])
+        if name == "outbox":
+            new_row.setdefault("next_attempt_at", new_row["created_at"])
+        self.table(name).append(new_row)
+        self._fire(name, None, new_row)
+        return new_row
+
+    def update_row(self, name: str, row: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+        old = dict(row)
+        row.update(changes)
+        if name in UPDATED_AT_TABLES:
+            row["updated_at"] = _now()
+        self._fire(name, old, row)
+        return row
+
+    def delete_rows(self, name: str, rows: List[Dict[str, Any]]) -> None:
+        doomed = {id(r) for r in rows}
+        self.tables[name] = [r for r in self.table(name) if id(r) not in doomed]
+        for row in rows:
+            self._fire(name, row, None)
+
+    def _fire(self, name: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        for trigger in TRIGGERS.get(name, ()):
+            trigger(self, old, new)
+
+    def find_by_key(self, name: str, row: Dict[str, Any], key: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        for existing in self.table(name):
+            if all(_text(existing.get(k)) == _text(row.get(k)) for k in key):
+                return existing
+        return None
+
+    def select(self, name: str, filters: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        compiled = _compile_filters(filters)
+        return [r for r in self.table(name) if _row_matches(r, compiled)]
+
+
+# ----- Filter evaluation -----
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _timestamp(value: str) -> datetime:
+    """Parse a timestamptz string; naive values (datetime.utcnow().isoformat()) are UTC."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return str(value)
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _equal(stored: Any, raw: str) -> bool:
+    if _text(stored) == raw:
+        return True
+    a, b = _number(stored), _number(raw)
+    return a is not None and b is not None and not isinstance(stored, bool) and a == b
+
+
+def _compare(stored: Any, raw: str) -> Optional[int]:
+    if stored is None:
+        return None
+    a, b = _number(stored), _number(raw)
+    if a is not None and b is not None and not isinstance(stored, bool):
+        return (a > b) - (a < b)
+    s = _text(stored)
+    return (s > raw) - (s < raw)
+
+
+def _split_list(raw: str) -> List[str]:
+    """Parse the `(a,b,"c,d")` operand of in./cs./cd. filters."""
+    inner = raw.strip()
+    if inner[:1] in "({" and inner[-1:] in ")}":
+        inner = inner[1:-1]
+    values, current, quoted = [], "", False
+    for ch in inner:
+        if ch == '"':
+            quoted = not quoted
+        elif ch == "," and not quoted:
+            values.append(current)
+            current = ""
+        else:
+            current += ch
+    if current or values:
+        values.append(current)
+    return values
+
+
+def _like(stored: Any, pattern: str, insensitive: bool) -> bool:
+    if stored is None:
+        return False
+    value = _text(stored)
+    pattern = pattern.replace("%", "*")
+    if insensitive:
+        value, pattern = value.lower(), pattern.lower()
+    return fnmatch.fnmatchcase(value, pattern)
+
+
+def _eval(op: str, stored: Any, raw: str) -> bool:
+    if op == "eq":
+        return _equal(stored, raw)
+    if op == "neq":
+        return not _equal(stored, raw)
+    if op in ("gt", "gte", "lt", "lte"):
+        cmp = _compare(stored, raw)
+        if cmp is None:
+            return False
+        return {"gt": cmp > 0, "gte": cmp >= 0, "lt": cmp < 0, "lte": cmp <= 0}[op]
+    if op == "is":
+        if raw == "null":
+            return stored is None
+        return _text(stored) == raw
+    if op == "like":
+        return _like(stored, raw, insensitive=False)
+    if op == "ilike":
+        return _like(stored, raw, insensitive=True)
+    if op == "cs":
+        return isinstance(stored, list) and all(v in map(_text, stored) for v in _split_list(raw))
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def _compile_filters(filters: List[Tuple[str, str]]) -> List[Tuple[str, bool, str, Any]]:
+    """Parse `col=[not.]op.value` params once per request instead of once per row."""
+    compiled = []
+    for column, expr in filters:
+        if column in ("or", "and", "not.or", "not.and"):
+            negate = column.startswith("not.")
+            compiled.append((column, negate, column.split(".")[-1], _compile_logic(expr)))
+            continue
+        negate = expr.startswith("not.")
+        if negate:
+            expr = expr[4:]
+        op, _, raw = expr.partition(".")
+        if op == "in":
+            values = _split_list(raw)
+            raw = (set(values), {_number(v) for v in values} - {None})
+        compiled.append((column, negate, op, raw))
+    return compiled
+
+
+def _compile_logic(expr: str) -> List[Tuple[str, bool, str, Any]]:
+    """`(a.gt.1,and(a.eq.1,b.gt."x,y"))` -> compiled filters combined by the enclosing or/and."""
+    terms = []
+    for term in _split_top_level(expr.strip()[1:-1]):
+        for logic in ("or", "and", "not.or", "not.and"):
+            if term.startswith(logic + "("):
+                terms.append((logic, logic.startswith("not."), logic.split(".")[-1], _compile_logic(term[len(logic):])))
+                break
+        else:
+            column, _, expr = term.partition(".")
+            prefix = ""
+            if expr.startswith("not."):
+                prefix, expr = "not.", expr[4:]
+            op, _, value = expr.partition(".")
+            if op != "in":
+                value = value.strip('"')
+            terms.extend(_compile_filters([(column, f"{prefix}{op}.{value}")]))
+    return terms
+
+
+def _in(stored: Any, operand: Tuple[set, set]) -> bool:
+    texts, numbers = operand
+    if _text(stored) in texts:
+        return True
+    return not isinstance(stored, bool) and _number(stored) in numbers
+
+
+def _row_matches(row: Dict[str, Any], filters: List[Tuple[str, bool, str, Any]]) -> bool:
+    for column, negate, op, raw in filters:
+        if op == "or":
+            matched = any(_row_matches(row, [term]) for term in raw)
+        elif op == "and":
+            matched = _row_matches(row, raw)
+        elif op == "in":
+            matched = _in(row.get(column), raw)
+        else:
+            matched = _eval(op, row.get(column), raw)
+        if matched == negate:
+            return False
+    return True
+
+
+# ----- Projection / ordering -----
+
+
+def _split_top_level(select: str) -> List[str]:
+    parts, current, depth, quoted = [], "", 0, False
+    for ch in select:
+        if ch == '"':
+            quoted = not quoted
+        elif ch == "(" and not quoted:
+            depth += 1
+        elif ch == ")" and not quoted:
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _project(
+    row: Dict[str, Any],
+    select: str,
+    store: Optional["PostgrestStore"] = None,
+    table: str = "",
+    embedded: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+    path: str = "",
+) -> Dict[str, Any]:
+    if not select or select == "*":
+        return dict(row)
+    out: Dict[str, Any] = {}
+    for part in _split_top_level(select):
+        if part == "*":
+            out.update(row)
+            continue
+        if part.endswith(")") and "(" in part and store is not None:
+            head, _, inner = part[:-1].partition("(")
+            alias, _, resource = head.rpartition(":")
+            resource = resource.split("!")[0]
+            out[alias or resource] = _embed(
+                store, table, row, resource, inner, embedded or {}, path + resource
+            )
+            continue
+        alias, _, column = part.rpartition(":")
+        column = column.strip('"')
+        out[alias or column] = row.get(column)
+    return out
+
+
+def _embed(
+    store: "PostgrestStore",
+    parent: str,
+    row: Dict[str, Any],
+    resource: str,
+    select: str,
+    embedded: Dict[str, List[Tuple[str, str]]],
+    path: str,
+) -> Any:
+    """
+    Resolve `resource(cols)` by naming convention: a `<resource>_id` column on
+    the parent is a many-to-one (object or null); otherwise `<parent>_id` on
+    the resource is a one-to-many (list). `resource.col=op.val` params filter it.
+    """
+    compiled = _compile_filters(embedded.get(path, []))
+    fk = f"{resource}_id"
+    if fk in row:
+        target = _text(row[fk])
+        for candidate in store.table(resource):
+            if _text(candidate.get("id")) == target and _row_matches(candidate, compiled):
+                return _project(candidate, select, store, resource, embedded, path + ".")
+        return None
+    parent_id = _text(row.get("id"))
+    return [
+        _project(child, select, store, resource, embedded, path + ".")
+        for child in store.table(resource)
+        if _text(child.get(f"{parent}_id")) == parent_id and _row_matches(child, compiled)
+    ]
+
+
+def _order(rows: List[Dict[str, Any]], order: str) -> List[Dict[str, Any]]:
+    for term in reversed(order.split(",")):
+        column, *mods = term.split(".")
+        desc = "desc" in mods
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+        present.sort(key=lambda r: r[column], reverse=desc)
+        nulls_first = "nullsfirst" in mods or (desc and "nullslast" not in mods)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+# ----- Stand-ins for the SQL functions in app/db -----
+
+
+def _claim_outbox_batch(store: PostgrestStore, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Mirror of claim_outbox_batch() in 005_mail_outbox.sql."""
+    now = datetime.now(timezone.utc)
+    lease = timedelta(seconds=int(args.get("lease_seconds", 300)))
+    max_attempts = int(args.get("max_attempts", 5))
+
+    for row in store.table("outbox"):
+        if (
+            row["status"] == "Sending"
+            and row.get("locked_until")
+            and _timestamp(row["locked_until"]) < now
+            and row.get("attempts", 0) >= max_attempts
+        ):
+            row["status"] = "Failed"
+            row["locked_until"] = None
+            row["last_error"] = f"Delivery did not finish within its lease after {row.get('attempts', 0)} attempts"
+
+    def due(row: Dict[str, Any]) -> bool:
+        if row["status"] == "Queued":
+            return _timestamp(row["next_attempt_at"]) <= now
+        if row["status"] == "Sending" and row.get("locked_until"):
+            return _timestamp(row["locked_until"]) < now and row.get("attempts", 0) < max_attempts
+        return False
+
+    batch = sorted((r for r in store.table("outbox") if due(r)), key=lambda r: _timestamp(r["next_attempt_at"]))
+    batch = batch[: int(args.get("batch_size", 100))]
+    for row in batch:
+        row["status"] = "Sending"
+        row["attempts"] = row.get("attempts", 0) + 1
+        row["locked_until"] = (now + lease).isoformat()
+    return [dict(r) for r in batch]
+
+
+def _ledger_row(store: PostgrestStore, campaign_id: Any, influencer_id: Any) -> Dict[str, Any]:
+    key = {"campaign_id": campaign_id, "influencer_id": influencer_id}
+    row = store.find_by_key("payment_ledger", key, ("campaign_id", "influencer_id"))
+    if row is None:
+        row = store.insert_row("payment_ledger", key)
+    return row
+
+
+def _payments_ledger_sync(store: PostgrestStore, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+    """Mirror of the payments_ledger_sync trigger in 006_payment_ledger.sql."""
+    for row, sign in ((old, -1), (new, 1)):
+        if row is None:
+            continue
+        ledger = _ledger_row(store, row["campaign_id"], row["influencer_id"])
+        amount = sign * (_number(row.get("amount")) or 0)
+        if row.get("status") == "Paid":
+            ledger["paid_total"] += amount
+        elif row.get("status") == "Pending":
+            ledger["pending_total"] += amount
+        ledger["updated_at"] = _now()
+
+
+def _expire_pending_payments(store: PostgrestStore, args: Dict[str, Any]) -> int:
+    """Mirror of expire_pending_payments() in 006_payment_ledger.sql."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=float(args.get("p_ttl_hours", 24)))
+    campaign_id = args.get("p_campaign_id")
+    influencer_ids = args.get("p_influencer_ids")   # stub-only: the payout batch's lines
+    if influencer_ids is None and args.get("p_influencer_id") is not None:
+        influencer_ids = [args["p_influencer_id"]]
+    expired = 0
+    for row in list(store.table("payments")):
+        if row.get("status") != "Pending":
+            continue
+        if campaign_id is not None and row.get("campaign_id") != campaign_id:
+            continue
+        if influencer_ids is not None and row.get("influencer_id") not in influencer_ids:
+            continue
+        created_at = datetime.fromisoformat(str(row.get("created_at")).replace("Z", "+00:00"))
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if created_at < cutoff:
+            store.update_row("payments", row, {"status": "Expired", "updated_at": _now()})
+            expired += 1
+    return expired
+
+
+def _create_payment_order(store: PostgrestStore, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Mirror of create_payment_order() in 006_payment_ledger.sql."""
+    key = {"campaign_id": args["p_campaign_id"], "influencer_id": args["p_influencer_id"]}
+    link = store.find_by_key("campaign_influencer", key, ("campaign_id", "influencer_id"))
+    if link is None:
+        raise ValueError("campaign_influencer link not found")
+    agreed = _number(link.get("rate_per_post"))
+    if agreed is None or agreed <= 0:
+        raise ValueError("Invalid agreed total for payment")
+
+    ledger = _ledger_row(store, key["campaign_id"], key["influencer_id"])
+    _expire_pending_payments(store, {
+        "p_ttl_hours": args.get("p_pending_ttl_hours", 24),
+        "p_campaign_id": key["campaign_id"],
+        "p_influencer_id": key["influencer_id"],
+    })
+    remaining = agreed - ledger["paid_total"] - ledger["pending_total"]
+    amount = _number(args["p_amount"]) or 0
+    if amount <= 0 or amount > remaining:
+        raise ValueError(f"Invalid payment amount. Remaining: {remaining}")
+
+    return store.insert_row("payments", {
+        **key,
+        "amount": amount,
+        "status": "Pending",
+        "razorpay_order_id": args["p_order_id"],
+    })
+
+
+_UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+
+
+def _create_payout_batch(store: PostgrestStore, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Mirror of create_payout_batch() in 008_bulk_payout.sql."""
+    campaign_id = args["p_campaign_id"]
+    _expire_pending_payments(store, {
+        "p_ttl_hours": args.get("p_pending_ttl_hours", 24),
+        "p_campaign_id": campaign_id,
+        "p_influencer_ids": [str(item.get("influencer_id")).lower() for item in args.get("p_lines") or []],
+    })
+    seen = set()
+    results = []
+    for line, item in enumerate(args.get("p_lines") or []):
+        influencer_id = item.get("influencer_id")
+        if isinstance(influencer_id, str):
+            influencer_id = influencer_id.lower()   # the ::uuid cast ignores case
+        amount = _number(item.get("amount"))
+        key = {"campaign_id": campaign_id, "influencer_id": influencer_id}
+        link = store.find_by_key("campaign_influencer", key, ("campaign_id", "influencer_id"))
+        agreed = _number(link.get("rate_per_post")) if link else None
+        error = None
+        if not isinstance(influencer_id, str) or not _UUID.match(influencer_id):
+            influencer_id = None
+            error = "Invalid influencer_id"
+        elif influencer_id in seen:
+            error = "Duplicate influencer in payout batch"
+        elif link is None:
+            error = "campaign_influencer link not found"
+        elif agreed is None or agreed <= 0:
+            error = "Invalid agreed total for payment"
+        else:
+            ledger = _ledger_row(store, campaign_id, influencer_id)
+            remaining = agreed - ledger["paid_total"] - ledger["pending_total"]
+            if amount is None or amount <= 0 or amount > remaining:
+                error = f"Invalid payment amount. Remaining: {remaining}"
+        if influencer_id is not None:
+            seen.add(influencer_id)
+        results.append({
+            "line": line,
+            "influencer_id": influencer_id,
+            "amount": amount,
+            "ok": error is None,
+            "error": error,
+            "payment_id": None,
+            "razorpay_order_id": None,
+        })
+
+    for result in results:
+        if result["ok"]:
+            payment = store.insert_row("payments", {
+                "campaign_id": campaign_id,
+                "influencer_id": result["influencer_id"],
+                "amount": result["amount"],
+                "status": "Paid",
+                "razorpay_order_id": f"payout_mock_{uuid.uuid4().hex}",
+                "updated_at": _now(),
+            })
+            result["payment_id"] = payment["id"]
+            result["razorpay_order_id"] = payment["razorpay_order_id"]
+
+    for influencer_id in seen:
+        key = {"campaign_id": campaign_id, "influencer_id": influencer_id}
+        link = store.find_by_key("campaign_influencer", key, ("campaign_id", "influencer_id"))
+        ledger = store.find_by_key("payment_ledger", key, ("campaign_id", "influencer_id"))
+        agreed = _number(link.get("rate_per_post")) if link else None
+        if link and ledger and agreed is not None and ledger["paid_total"] >= agreed:
+            link["payment_status"] = True
+    return results
+
+
+def _summary_row(store: PostgrestStore, campaign_id: Any, create: bool) -> Optional[Dict[str, Any]]:
+    row = store.find_by_key("campaign_summary", {"campaign_id": campaign_id}, ("campaign_id",))
+    if row is None and create:
+        row = store.insert_row("campaign_summary", {"campaign_id": campaign_id})
+    return row
+
+
+def _sum_numbers(acc: Dict[str, Any], delta: Any, sign: int) -> None:
+    """Mirror of jsonb_sum_numbers() in 009_campaign_summary.sql (in place)."""
+    if not isinstance(delta, dict):
+        return
+    for key, value in delta.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            acc[key] = acc.get(key, 0) + sign * value
+
+
+def _campaign_summary_link_sync(store: PostgrestStore, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+    """Mirror of the campaign_summary_link_sync trigger in 009_campaign_summary.sql."""
+    for row, sign in ((old, -1), (new, 1)):
+        if row is None:
+            continue
+        summary = _summary_row(store, row["campaign_id"], create=sign > 0)
+        if summary is None:
+            continue
+        summary["influencer_count"] += sign
+        _sum_numbers(summary["status_counts"], {row.get("status") or "Pending": 1}, sign)
+        summary["agreed_total"] += sign * (_number(row.get("rate_per_post")) or 0)
+        _sum_numbers(summary["performance"], row.get("performance"), sign)
+        summary["updated_at"] = _now()
+
+
+def _campaign_summary_payments_sync(store: PostgrestStore, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+    """Mirror of the campaign_summary_payments_sync trigger in 009_campaign_summary.sql."""
+    for row, sign in ((old, -1), (new, 1)):
+        if row is None or row.get("campaign_id") is None:
+            continue
+        summary = _summary_row(store, row["campaign_id"], create=sign > 0)
+        if summary is None:
+            continue
+        amount = sign * (_number(row.get("amount")) or 0)
+        if row.get("status") == "Paid":
+            summary["paid_total"] += amount
+        elif row.get("status") == "Pending":
+            summary["pending_total"] += amount
+        summary["updated_at"] = _now()
+
+
+SQL_FUNCTIONS: Dict[str, Callable[[PostgrestStore, Dict[str, Any]], Any]] = {
+    "claim_outbox_batch": _claim_outbox_batch,
+    "create_payment_order": _create_payment_order,
+    "expire_pending_payments": _expire_pending_payments,
+    "create_payout_batch": _create_payout_batch,
+}
+
+TRIGGERS: Dict[str, Tuple[Callable[[PostgrestStore, Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None], ...]] = {
+    "payments": (_payments_ledger_sync, _campaign_summary_payments_sync),
+    "campaign_influencer": (_campaign_summary_link_sync,),
+}
+
+
+# ----- HTTP layer -----
+
+
+def _pgrst_error(status: int, code: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        {"code": code, "message": message, "details": None, "hint": None},
+        status_code=status,
+    )
+
+
+def _prefer(request: Request) -> Dict[str, str]:
+    prefs: Dict[str, str] = {}
+    for item in request.headers.get("prefer", "").split(","):
+        key, _, value = item.strip().partition("=")
+        if key:
+            prefs[key] = value
+    return prefs
+
+
+def _filters(request: Request) -> List[Tuple[str, str]]:
+    return [
+        (k, v) for k, v in request.query_params.multi_items()
+        if k not in RESERVED_PARAMS and "." not in k
+    ]
+
+
+def _embedded_filters(request: Request) -> Dict[str, List[Tuple[str, str]]]:
+    """`campaign_influencer.status=eq.Signed` -> {"campaign_influencer": [("status", "eq.Signed")]}"""
+    grouped: Dict[str, List[Tuple[str, str]]] = {}
+    for key, value in request.query_params.multi_items():
+        if "." in key and key not in RESERVED_PARAMS:
+            resource, _, column = key.rpartition(".")
+            grouped.setdefault(resource, []).append((column, value))
+    return grouped
+
+
+def _respond(
+    request: Request,
+    rows: List[Dict[str, Any]],
+    status: int,
+    minimal: bool = False,
+    store: Optional[PostgrestStore] = None,
+    table: str = "",
+) -> Response:
+    if minimal:
+        return Response(status_code=204 if status == 200 else status)
+    select = request.query_params.get("select", "*")
+    embedded = _embedded_filters(request)
+    body = [_project(r, select, store, table, embedded) for r in rows]
+    headers = {"Content-Range": f"0-{max(len(body) - 1, 0)}/{len(body)}"}
+    if request.headers.get("accept", "").startswith("application/vnd.pgrst.object"):
+        if len(body) != 1:
+            return _pgrst_error(
+                406,
+                "PGRST116",
+                f"JSON object requested, multiple (or no) rows returned ({len(body)} rows)",
+            )
+        return JSONResponse(body[0], status_code=status, headers=headers)
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+def create_app(store: PostgrestStore) -> Starlette:
+    async def table_endpoint(request: Request) -> Response:
+        name = request.path_params["table"]
+        store.calls[(request.method, name)] += 1
+        params = request.query_params
+        prefs = _prefer(request)
+        minimal = prefs.get("return") == "minimal"
+
+        try:
+            if request.method in ("GET", "HEAD"):
+                rows = store.select(name, _filters(request))
+                if "order" in params:
+                    rows = _order(rows, params["order"])
+                offset = int(params.get("offset", 0))
+                if "limit" in params:
+                    rows = rows[offset : offset + int(params["limit"])]
+                elif offset:
+                    rows = rows[offset:]
+                return _respond(request, rows, 200, store=store, table=name)
+
+            if request.method == "POST":
+                payload = await request.json()
+                incoming = payload if isinstance(payload, list) else [payload]
+                resolution = prefs.get("resolution")
+                key = tuple(params["on_conflict"].split(",")) if "on_conflict" in params else PRIMARY_KEYS.get(name, ("id",))
+                written = []
+                for row in incoming:
+                    existing = store.find_by_key(name, row, key) if all(k in row for k in key) else None
+                    if existing is not None:
+                        if resolution == "ignore-duplicates":
+                            continue
+                        if resolution == "merge-duplicates":
+                            store.update_row(name, existing, row)
+                            written.append(existing)
+                            continue
+                        return _pgrst_error(409, "23505", f"duplicate key value violates unique constraint on {name}")
+                    written.append(store.insert_row(name, row))
+                return _respond(request, written, 201, minimal)
+
+            if request.method == "PATCH":
+                changes = await request.json()
+                rows = store.select(name, _filters(request))
+                for row in rows:
+                    store.update_row(name, row, changes)
+                return _respond(request, rows, 200, minimal)
+
+            if request.method == "DELETE":
+                rows = store.select(name, _filters(request))
+                store.delete_rows(name, rows)
+                return _respond(request, rows, 200, minimal)
+        except ValueError as e:
+            return _pgrst_error(400, "PGRST100", str(e))
+
+        return _pgrst_error(405, "PGRST105", f"Method {request.method} not allowed")
+
+    async def rpc_endpoint(request: Request) -> Response:
+        name = request.path_params["fn"]
+        store.calls[("RPC", name)] += 1
+        fn = store.rpcs.get(name)
+        if fn is None:
+            return _pgrst_error(404, "PGRST202", f"Could not find the function public.{name}")
+        args = await request.json() if request.method == "POST" else dict(request.query_params)
+        try:
+            result = fn(store, args or {})
+        except ValueError as e:
+            return _pgrst_error(400, "P0001", str(e))
+        if isinstance(result, list):
+            return _respond(request, result, 200)
+        return JSONResponse(result)
+
+    return Starlette(
+        routes=[
+            Route("/rest/v1/rpc/{fn}", rpc_endpoint, methods=["GET", "POST"]),
+            Route("/rest/v1/{table}", table_endpoint, methods=["GET", "HEAD", "POST", "PATCH", "DELETE"]),
+        ]
+    )
@@ -0,0 +1,86 @@
+# backend/app/utils/responses.py
+#
+# JSON rendering for API responses.
+#
+# By default FastAPI runs an endpoint's returned dict through jsonable_encoder
+# (a recursive copy of the whole payload) and then json.dumps(). Our
+# endpoints return rows exactly as PostgREST sent them, so both steps are
+# redundant work on big list pages. ORJSONRoute hands such results straight
+# to ORJSONResponse, which serializes them in one orjson call.
+
+import functools
+import inspect
+from decimal import Decimal
+from typing import Any, Callable
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Types orjson does not handle natively (it does datetimes, UUIDs, dataclasses)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return jsonable_encoder(value)
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(jsonable_encoder(content))
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONRoute(APIRoute):
+    """
+    Route class for our routers: when an endpoint has no response model and
+    returns plain data (dicts, lists, scalars), that data is rendered with
+    ORJSONResponse using the route's status code, without the
+    jsonable_encoder pass. Responses, generators and endpoints with a
+    response model or return annotation keep FastAPI's default handling.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        response_model = kwargs.get("response_model")
+        validated = (response_model is not None and not isinstance(response_model, DefaultPlaceholder)) or (
+            inspect.signature(endpoint).return_annotation is not inspect.Signature.empty
+        )
+        streaming = inspect.isasyncgenfunction(endpoint) or inspect.isgeneratorfunction(endpoint)
+        # include_router() re-creates routes from the already wrapped endpoint
+        wrapped = getattr(endpoint, "renders_orjson", False)
+        if not validated and not streaming and not wrapped:
+            endpoint = self._render_directly(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _render_directly(endpoint: Callable[..., Any], status_code: Any) -> Callable[..., Any]:
+        status_code = status_code if isinstance(status_code, int) else 200
+
+        def wrap(result: Any) -> Any:
+            if isinstance(result, Response):
+                return result
+            return ORJSONResponse(result, status_code=status_code)
+
+        # functools.wraps keeps the signature FastAPI reads parameters from
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def render(*args: Any, **kwargs: Any) -> Any:
+                return wrap(await endpoint(*args, **kwargs))
+        else:
+            @functools.wraps(endpoint)
+            def render(*args: Any, **kwargs: Any) -> Any:
+                return wrap(endpoint(*args, **kwargs))
+        render.renders_orjson = True
+        return render
+
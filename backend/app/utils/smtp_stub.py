@@ -0,0 +1,70 @@
+# backend/app/utils/smtp_stub.py
+#
+# Local SMTP stand-in (aiosmtpd) for exercising the outbox delivery worker.
+# Accepts and counts messages and connections, with optional latency and
+# injected transient (4xx) failures.
+
+import asyncio
+import random
+from typing import List, Optional
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP
+
+
+class _Handler:
+    def __init__(self, stub: "SMTPStub"):
+        self.stub = stub
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.stub.latency_ms:
+            await asyncio.sleep(self.stub.latency_ms / 1000.0)
+        if self.stub.transient_failure_rate and self.stub._rng.random() < self.stub.transient_failure_rate:
+            self.stub.rejected += 1
+            return "451 4.3.0 Temporary failure, try again later"
+        self.stub.messages.append((envelope.mail_from, list(envelope.rcpt_tos)))
+        return "250 Message accepted for delivery"
+
+
+class _CountingSMTP(SMTP):
+    def __init__(self, *args, stub: "SMTPStub", **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stub = stub
+
+    def connection_made(self, transport):
+        self._stub.connections += 1
+        super().connection_made(transport)
+
+
+class SMTPStub(Controller):
+    """
+    Usage:
+        with SMTPStub(port=8025) as smtp:
+            pool = SMTPConnectionPool(host=smtp.hostname, port=smtp.port, starttls=False)
+    """
+
+    def __init__(
+        self,
+        hostname: str = "127.0.0.1",
+        port: int = 8025,
+        latency_ms: float = 0.0,
+        transient_failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(_Handler(self), hostname=hostname, port=port)
+        self.latency_ms = latency_ms
+        self.transient_failure_rate = transient_failure_rate
+        self.messages: List[tuple] = []
+        self.connections = 0
+        self.rejected = 0
+        self._rng = random.Random(seed)
+
+    def factory(self):
+        return _CountingSMTP(self.handler, stub=self, **self.SMTP_kwargs)
+
+    def __enter__(self) -> "SMTPStub":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,203 @@
+# backend/app/utils/sqlite_ledger.py
+#
+# SQLite stand-in for the payment ledger in app/db/006_payment_ledger.sql.
+# Same tables, same trigger-maintained paid_total/pending_total and the same
+# create_payment_order() checks, so ledger behaviour (including concurrent
+# order creation) can be exercised without Postgres. BEGIN IMMEDIATE takes the
+# database write lock up front, which plays the role of SELECT ... FOR UPDATE.
+
+import os
+import sqlite3
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaign_influencer (
+  campaign_id text NOT NULL,
+  influencer_id text NOT NULL,
+  rate_per_post numeric,
+  PRIMARY KEY (campaign_id, influencer_id)
+);
+
+CREATE TABLE IF NOT EXISTS payments (
+  id text PRIMARY KEY,
+  campaign_id text NOT NULL,
+  influencer_id text NOT NULL,
+  amount numeric NOT NULL,
+  status text NOT NULL DEFAULT 'Pending',
+  razorpay_order_id text UNIQUE,
+  razorpay_payment_id text,
+  razorpay_signature text,
+  created_at text,
+  updated_at text
+);
+
+CREATE TABLE IF NOT EXISTS payment_ledger (
+  campaign_id text NOT NULL,
+  influencer_id text NOT NULL,
+  paid_total numeric NOT NULL DEFAULT 0,
+  pending_total numeric NOT NULL DEFAULT 0,
+  PRIMARY KEY (campaign_id, influencer_id)
+);
+
+CREATE TRIGGER IF NOT EXISTS payments_ledger_insert AFTER INSERT ON payments
+BEGIN
+  INSERT INTO payment_ledger (campaign_id, influencer_id, paid_total, pending_total)
+  VALUES (
+    NEW.campaign_id,
+    NEW.influencer_id,
+    CASE WHEN NEW.status = 'Paid' THEN NEW.amount ELSE 0 END,
+    CASE WHEN NEW.status = 'Pending' THEN NEW.amount ELSE 0 END
+  )
+  ON CONFLICT (campaign_id, influencer_id) DO UPDATE
+  SET paid_total = paid_total + excluded.paid_total,
+      pending_total = pending_total + excluded.pending_total;
+END;
+
+CREATE TRIGGER IF NOT EXISTS payments_ledger_update AFTER UPDATE OF status, amount ON payments
+BEGIN
+  UPDATE payment_ledger
+  SET paid_total = paid_total
+        - CASE WHEN OLD.status = 'Paid' THEN OLD.amount ELSE 0 END
+        + CASE WHEN NEW.status = 'Paid' THEN NEW.amount ELSE 0 END,
+      pending_total = pending_total
+        - CASE WHEN OLD.status = 'Pending' THEN OLD.amount ELSE 0 END
+        + CASE WHEN NEW.status = 'Pending' THEN NEW.amount ELSE 0 END
+  WHERE campaign_id = NEW.campaign_id AND influencer_id = NEW.influencer_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS payments_ledger_delete AFTER DELETE ON payments
+BEGIN
+  UPDATE payment_ledger
+  SET paid_total = paid_total - CASE WHEN OLD.status = 'Paid' THEN OLD.amount ELSE 0 END,
+      pending_total = pending_total - CASE WHEN OLD.status = 'Pending' THEN OLD.amount ELSE 0 END
+  WHERE campaign_id = OLD.campaign_id AND influencer_id = OLD.influencer_id;
+END;
+"""
+
+
+class SQLiteLedger:
+    """
+    File-backed (temp file by default) so every thread gets its own
+    connection and SQLite's locking is exercised for real.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(fd)
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def add_link(self, campaign_id: str, influencer_id: str, rate_per_post: Optional[float]) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO campaign_influencer VALUES (?, ?, ?)",
+            (campaign_id, influencer_id, rate_per_post),
+        )
+
+    def expire_pending_payments(
+        self,
+        ttl_hours: float = 24,
+        campaign_id: Optional[str] = None,
+        influencer_id: Optional[str] = None,
+    ) -> int:
+        """Mirror of expire_pending_payments(); returns the number of rows expired."""
+        return self._expire(self._conn(), ttl_hours, campaign_id, influencer_id)
+
+    @staticmethod
+    def _expire(conn: sqlite3.Connection, ttl_hours: float, campaign_id: Optional[str], influencer_id: Optional[str]) -> int:
+        cutoff = (datetime.utcnow() - timedelta(hours=ttl_hours)).isoformat()
+        cur = conn.execute(
+            "UPDATE payments SET status = 'Expired', updated_at = ? "
+            "WHERE status = 'Pending' AND created_at < ? "
+            "AND (? IS NULL OR campaign_id = ?) AND (? IS NULL OR influencer_id = ?)",
+            (datetime.utcnow().isoformat(), cutoff, campaign_id, campaign_id, influencer_id, influencer_id),
+        )
+        return cur.rowcount
+
+    def create_payment_order(
+        self,
+        campaign_id: str,
+        influencer_id: str,
+        amount: float,
+        order_id: str,
+        pending_ttl_hours: float = 24,
+    ) -> Dict[str, Any]:
+        """Mirror of create_payment_order(); raises ValueError with the same messages."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            link = conn.execute(
+                "SELECT rate_per_post FROM campaign_influencer WHERE campaign_id = ? AND influencer_id = ?",
+                (campaign_id, influencer_id),
+            ).fetchone()
+            if link is None:
+                raise ValueError("campaign_influencer link not found")
+            agreed = link["rate_per_post"]
+            if agreed is None or agreed <= 0:
+                raise ValueError("Invalid agreed total for payment")
+
+            self._expire(conn, pending_ttl_hours, campaign_id, influencer_id)
+            balance = self._balance(conn, campaign_id, influencer_id)
+            remaining = agreed - balance["paid_total"] - balance["pending_total"]
+            if amount <= 0 or amount > remaining:
+                raise ValueError(f"Invalid payment amount. Remaining: {remaining}")
+
+            row = {
+                "id": str(uuid.uuid4()),
+                "campaign_id": campaign_id,
+                "influencer_id": influencer_id,
+                "amount": amount,
+                "status": "Pending",
+                "razorpay_order_id": order_id,
+                "created_at": datetime.utcnow().isoformat(),
+            }
+            conn.execute(
+                "INSERT INTO payments (id, campaign_id, influencer_id, amount, status, razorpay_order_id, created_at) "
+                "VALUES (:id, :campaign_id, :influencer_id, :amount, :status, :razorpay_order_id, :created_at)",
+                row,
+            )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def set_payment_status(self, order_id: str, status: str, expected: str = "Pending") -> bool:
+        """Conditional status change; True if the payment was still `expected`."""
+        cur = self._conn().execute(
+            "UPDATE payments SET status = ?, updated_at = ? WHERE razorpay_order_id = ? AND status = ?",
+            (status, datetime.utcnow().isoformat(), order_id, expected),
+        )
+        return cur.rowcount == 1
+
+    def balance(self, campaign_id: str, influencer_id: str) -> Dict[str, float]:
+        return self._balance(self._conn(), campaign_id, influencer_id)
+
+    @staticmethod
+    def _balance(conn: sqlite3.Connection, campaign_id: str, influencer_id: str) -> Dict[str, float]:
+        row = conn.execute(
+            "SELECT paid_total, pending_total FROM payment_ledger WHERE campaign_id = ? AND influencer_id = ?",
+            (campaign_id, influencer_id),
+        ).fetchone()
+        if row is None:
+            return {"paid_total": 0, "pending_total": 0}
+        return {"paid_total": row["paid_total"], "pending_total": row["pending_total"]}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -34,7 +34,7 @@ interface CreateOrderResponse {
 interface PaymentRecord {
   id: string;
   amount: number;               // in rupees
-  status: "Pending" | "Paid" | "Failed";
+  status: "Pending" | "Paid" | "Failed" | "Expired";
   razorpay_order_id: string;
   razorpay_payment_id: string | null;
   razorpay_signature: string | null;
@@ -9,6 +9,7 @@ import { Badge } from "@/components/ui/badge";
 import Link from "next/link";
 import { useQuery } from "@tanstack/react-query";
 import { supabase } from "@/lib/supabase_client";
+import { fetchAllPages } from "@/lib/fetchAllPages";
 
 // If you have a ShadCN Alert component, import it here:
 import { Alert, AlertTitle, AlertDescription } from "@/components/ui/alert";
@@ -67,13 +68,9 @@ function useBusinessId() {
 }
 
 function fetchCampaigns(businessId: string): Promise<Campaign[]> {
-  return fetch(`/api/business/${businessId}/campaigns`)
-    .then(res => {
-      if (!res.ok) throw new Error("Failed to fetch campaigns");
-      return res.json();
-    })
-    .then((data: { campaigns: ApiCampaign[] }) => {
-      return data.campaigns.map((c) => {
+  return fetchAllPages<ApiCampaign>(`/api/business/${businessId}/campaigns`, "campaigns")
+    .then((campaigns) => {
+      return campaigns.map((c) => {
         const { startDate, endDate } = parsePostgresRange(c.proposed_dates);
         return {
           id: c.id,
@@ -7,6 +7,7 @@ import { Card, CardHeader, CardTitle, CardContent } from "@/components/ui/card";
 import { Table, TableHeader, TableBody, TableRow, TableCell } from "@/components/ui/table";
 import { Button } from "@/components/ui/button";
 import { supabase } from "@/lib/supabase_client";
+import { fetchAllPages } from "@/lib/fetchAllPages";
 
 interface Business {
   id: string;
@@ -55,15 +56,12 @@ export default function BusinessDashboardPage() {
       }
       setBusiness(json1.business);
 
-      // 3) Fetch that business’s campaigns
-      const res2 = await fetch(`/api/business/${businessId}/campaigns`);
-      const json2 = await res2.json();
-      if (!res2.ok) {
-        console.error(json2.error);
-        setLoading(false);
-        return;
+      // 3) Fetch that business’s campaigns (every page)
+      try {
+        setCampaigns(await fetchAllPages<Campaign>(`/api/business/${businessId}/campaigns`, "campaigns"));
+      } catch (e) {
+        console.error(e);
       }
-      setCampaigns(json2.campaigns);
       setLoading(false);
     }
     fetchData();
@@ -13,6 +13,7 @@ import {
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
 import { supabase } from "@/lib/supabase_client";
+import { fetchAllPages } from "@/lib/fetchAllPages";
 
 interface Influencer {
   id: string;
@@ -72,15 +73,12 @@ export default function InfluencerDashboardPage() {
       }
       setInfluencer(json1.influencer);
 
-      // 2) Fetch all campaigns (both accepted + pending invitations)
-      const res2 = await fetch(`/api/influencer/${influencerId}/campaigns`);
-      const json2 = await res2.json();
-      if (!res2.ok) {
-        console.error(json2.error);
-        setLoading(false);
-        return;
+      // 2) Fetch all campaigns (both accepted + pending invitations, every page)
+      try {
+        setAllCampaigns(await fetchAllPages<Campaign>(`/api/influencer/${influencerId}/campaigns`, "campaigns"));
+      } catch (e) {
+        console.error(e);
       }
-      setAllCampaigns(json2.campaigns);
       setLoading(false);
     }
 
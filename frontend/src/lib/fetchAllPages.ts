@@ -0,0 +1,23 @@
+// frontend/src/lib/fetchAllPages.ts
+// List endpoints return one page at a time: { <key>: [...], next_cursor }.
+// Follows next_cursor until the last page and returns every item.
+
+// Largest page the backend serves (MAX_PAGE_LIMIT in app/utils/pagination.py)
+const PAGE_LIMIT = 500;
+
+export async function fetchAllPages<T>(url: string, key: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_LIMIT) });
+    if (cursor) params.set("cursor", cursor);
+    const res = await fetch(`${url}${url.includes("?") ? "&" : "?"}${params}`);
+    const json = await res.json();
+    if (!res.ok) {
+      throw new Error(json.detail || json.error || `Failed to fetch ${url}`);
+    }
+    items.push(...(json[key] as T[]));
+    cursor = json.next_cursor ?? null;
+  } while (cursor);
+  return items;
+}